@@ -3,9 +3,8 @@ Adapters - Implementações concretas dos Ports
 Real Adapters: Implementações reais (Supabase, ML real)
 Fake Adapters: Implementações para testes
 """
-import pickle
 import os
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from .ports import DatabasePort, MLPort, FileStoragePort
 
 
@@ -54,55 +53,89 @@ class SupabaseAdapter(DatabasePort):
 
 
 class SklearnMLAdapter(MLPort):
-    """Adapter real para modelos ML scikit-learn"""
-    
-    def __init__(self):
-        self._load_models()
-    
-    def _load_models(self):
-        """Carrega modelos ML"""
-        BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-        MODELS_DIR = os.path.join(BASE_DIR, "models")
-        
-        try:
-            with open(os.path.join(MODELS_DIR, "price_model.pkl"), "rb") as f:
-                self.price_model = pickle.load(f)
-            with open(os.path.join(MODELS_DIR, "price_vectorizer.pkl"), "rb") as f:
-                self.price_vectorizer = pickle.load(f)
-            with open(os.path.join(MODELS_DIR, "category_model.pkl"), "rb") as f:
-                self.category_model = pickle.load(f)
-            with open(os.path.join(MODELS_DIR, "category_vectorizer.pkl"), "rb") as f:
-                self.category_vectorizer = pickle.load(f)
-            self.models_loaded = True
-        except Exception as e:
-            print(f"⚠️ Aviso: Modelos ML não carregados: {e}")
-            self.models_loaded = False
+    """Adapter real para modelos ML scikit-learn (modelos do registro compartilhado).
+
+    No modo "process" (ml_workers) as predições do registro compartilhado vão
+    aos processos de inferência e os modelos não são carregados aqui; só as
+    propriedades price_model, price_vectorizer, ... carregam neste processo.
+    """
+    
+    def __init__(self, registry=None):
+        from ..services.ml_registry import model_registry
+        self.registry = registry or model_registry
+        self._shared_registry = registry is None
+    
+    def _process_inference(self):
+        """Pool do modo "process"; None roda neste processo (sempre, com um registro próprio)"""
+        if not self._shared_registry:
+            return None
+        from ..services import ml_workers
+        return ml_workers.process_inference
+    
+    @property
+    def models_loaded(self) -> bool:
+        pool = self._process_inference()
+        if pool is not None:
+            # Os modelos estão nos processos de inferência: basta que os arquivos existam
+            return pool.models_version() is not None
+        return self.registry.load()
+    
+    @property
+    def price_model(self):
+        return self.registry.get("price_model")
+    
+    @property
+    def price_vectorizer(self):
+        return self.registry.get("price_vectorizer")
+    
+    @property
+    def category_model(self):
+        return self.registry.get("category_model")
+    
+    @property
+    def category_vectorizer(self):
+        return self.registry.get("category_vectorizer")
+    
+    def _predict(self, vectorizer: str, model: str, descriptions: List[str]) -> List[Any]:
+        """transform + predict do lote, nos processos de inferência ou neste processo"""
+        pool = self._process_inference()
+        if pool is not None:
+            return pool.predict(vectorizer, model, descriptions)
+        return list(self.registry.get(model).predict(self.registry.get(vectorizer).transform(descriptions)))
     
     def predict_price(self, description: str) -> float:
         """Prediz preço usando modelo real"""
+        return self.predict_prices([description])[0]
+    
+    def predict_category(self, description: str) -> str:
+        """Prediz categoria usando modelo real"""
+        return self.predict_categories([description])[0]
+    
+    def predict_prices(self, descriptions: List[str]) -> List[float]:
+        """Prediz preços em lote: um transform e um predict para todas as descrições"""
         if not self.models_loaded:
-            return 500.0
+            return [500.0] * len(descriptions)
+        if not descriptions:
+            return []
         
         try:
-            X = self.price_vectorizer.transform([description])
-            preco = self.price_model.predict(X)[0]
-            return float(preco)
+            return [float(preco) for preco in self._predict("price_vectorizer", "price_model", descriptions)]
         except Exception as e:
-            print(f"Erro ao predizer preço: {e}")
-            return 500.0
+            print(f"Erro ao predizer preços: {e}")
+            return [500.0] * len(descriptions)
     
-    def predict_category(self, description: str) -> str:
-        """Prediz categoria usando modelo real"""
+    def predict_categories(self, descriptions: List[str]) -> List[str]:
+        """Prediz categorias em lote: um transform e um predict para todas as descrições"""
         if not self.models_loaded:
-            return "Serviços Gerais"
+            return ["Serviços Gerais"] * len(descriptions)
+        if not descriptions:
+            return []
         
         try:
-            X = self.category_vectorizer.transform([description])
-            categoria = self.category_model.predict(X)[0]
-            return str(categoria)
+            return [str(categoria) for categoria in self._predict("category_vectorizer", "category_model", descriptions)]
         except Exception as e:
-            print(f"Erro ao predizer categoria: {e}")
-            return "Serviços Gerais"
+            print(f"Erro ao predizer categorias: {e}")
+            return ["Serviços Gerais"] * len(descriptions)
     
     def calculate_price_limits(
         self,
@@ -218,6 +251,14 @@ class FakeMLAdapter(MLPort):
         """Retorna categoria fixa para testes"""
         return "Serviços Gerais"
     
+    def predict_prices(self, descriptions: List[str]) -> List[float]:
+        """Retorna preços fixos para testes"""
+        return [500.0] * len(descriptions)
+    
+    def predict_categories(self, descriptions: List[str]) -> List[str]:
+        """Retorna categorias fixas para testes"""
+        return ["Serviços Gerais"] * len(descriptions)
+    
     def calculate_price_limits(
         self,
         categoria: str,
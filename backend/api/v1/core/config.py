@@ -14,9 +14,51 @@ if env_path.exists():
     load_dotenv(env_path)
 EXCEL_FILE = "quotes_data.xlsx"
 
+# Motor de armazenamento da base legada de orçamentos: "xlsx" (padrão) ou "sqlite"
+QUOTES_STORE_ENGINE = os.getenv("QUOTES_STORE_ENGINE", "xlsx")
+QUOTES_SQLITE_FILE = os.getenv("QUOTES_SQLITE_FILE", "quotes_data.sqlite3")
+
+# Journal append-only da base .xlsx: as gravações viram linhas em <arquivo>.journal
+# e são incorporadas ao .xlsx em segundo plano (a cada intervalo ou ao passar do limite)
+QUOTES_JOURNAL_ENABLED = os.getenv("QUOTES_JOURNAL_ENABLED", "true").lower() == "true"
+QUOTES_JOURNAL_MAX_BYTES = int(os.getenv("QUOTES_JOURNAL_MAX_BYTES", str(1024 * 1024)))
+QUOTES_JOURNAL_COMPACT_INTERVAL = float(os.getenv("QUOTES_JOURNAL_COMPACT_INTERVAL", "60"))
+
+# Threads que executam as chamadas à base legada fora do event loop (rotas async)
+EXCEL_IO_WORKERS = int(os.getenv("EXCEL_IO_WORKERS", "4"))
+
+# Modelos de ML (.pkl): carregados uma vez por processo, na primeira predição
+# ou em segundo plano logo após o startup (ML_WARMUP_ON_STARTUP)
+ML_MODELS_DIR = os.getenv("ML_MODELS_DIR", str(BASE_DIR / "models"))
+ML_WARMUP_ON_STARTUP = os.getenv("ML_WARMUP_ON_STARTUP", "true").lower() == "true"
+# As florestas carregadas são avaliadas por arrays NumPy planos (ml_forest), com o mesmo
+# resultado do sklearn; "false" volta ao predict do scikit-learn
+ML_COMPILED_FORESTS = os.getenv("ML_COMPILED_FORESTS", "true").lower() == "true"
+# Cache LRU das predições por texto normalizado (0 desliga); entradas expiram após o TTL em segundos
+ML_PREDICTION_CACHE_SIZE = int(os.getenv("ML_PREDICTION_CACHE_SIZE", "4096"))
+ML_PREDICTION_CACHE_TTL = float(os.getenv("ML_PREDICTION_CACHE_TTL", "3600"))
+# Limite de itens por chamada a /ml/predict-batch
+ML_PREDICT_BATCH_MAX = int(os.getenv("ML_PREDICT_BATCH_MAX", "1024"))
+# Micro-batching das predições das rotas: espera máxima na fila (ms) e tamanho máximo do lote
+ML_BATCH_MAX_WAIT_MS = float(os.getenv("ML_BATCH_MAX_WAIT_MS", "2"))
+ML_BATCH_MAX_SIZE = int(os.getenv("ML_BATCH_MAX_SIZE", "64"))
+# Onde as florestas são avaliadas: "thread" (neste processo) ou "process" (pool de
+# ML_INFERENCE_WORKERS processos, cada um com os modelos carregados uma vez, fora do GIL da API)
+ML_INFERENCE_MODES = ("thread", "process")
+ML_INFERENCE_MODE = os.getenv("ML_INFERENCE_MODE", "thread").lower()
+if ML_INFERENCE_MODE not in ML_INFERENCE_MODES:
+    # Valor inválido não derruba a aplicação: a inferência continua neste processo
+    print(f"⚠️ Aviso: ML_INFERENCE_MODE={ML_INFERENCE_MODE!r} inválido (use {ML_INFERENCE_MODES}); usando 'thread'")
+    ML_INFERENCE_MODE = "thread"
+ML_INFERENCE_WORKERS = int(os.getenv("ML_INFERENCE_WORKERS", str(os.cpu_count() or 2)))
+
 # Configurações do Banco de Dados
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+# Origem dos analytics do marketplace: "supabase" (função RPC no Postgres)
+# ou "sql" (consultas SQLAlchemy no DATABASE_URL / SQLite local)
+MARKETPLACE_ANALYTICS_SOURCE = os.getenv("MARKETPLACE_ANALYTICS_SOURCE", "supabase")
+
 # Configurações do Supabase
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_ANON_KEY = os.getenv("SUPABASE_ANON_KEY")
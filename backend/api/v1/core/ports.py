@@ -72,6 +72,14 @@ class MLPort(ABC):
     ) -> Dict[str, float]:
         """Calcula limites de preço (mínimo, sugerido, máximo)"""
         pass
+    
+    def predict_prices(self, descriptions: List[str]) -> List[float]:
+        """Prediz preços de várias descrições (padrão: uma a uma; adapters reais fazem em lote)"""
+        return [self.predict_price(description) for description in descriptions]
+    
+    def predict_categories(self, descriptions: List[str]) -> List[str]:
+        """Prediz categorias de várias descrições (padrão: uma a uma; adapters reais fazem em lote)"""
+        return [self.predict_category(description) for description in descriptions]
 
 
 class FileStoragePort(ABC):
@@ -120,6 +120,8 @@ class Orcamento(Base):
     # Janela de agendamento do serviço (para agenda do prestador)
     datetime_inicio = Column(DateTime(timezone=True), nullable=True)
     datetime_fim = Column(DateTime(timezone=True), nullable=True)
+    # Momento do aceite pelo cliente (tempo até o aceite nos analytics)
+    aceito_em = Column(DateTime(timezone=True), nullable=True)
     observacoes = Column(Text, nullable=True)
     condicoes = Column(Text, nullable=True)
     status = Column(
@@ -6,12 +6,14 @@ from .services import router as services_router
 from .quotes import router as quotes_router
 from .ml import router as ml_router
 from .analytics import router as analytics_router
+from .imports import router as imports_router
 
 # Novas rotas do marketplace
 from .usuarios import router as usuarios_router
 from .solicitacoes import router as solicitacoes_router
 from .orcamentos import router as orcamentos_router
 from .avaliacoes import router as avaliacoes_router
+from .marketplace_analytics import router as marketplace_analytics_router
 
 # Router principal que combina todas as rotas
 router = APIRouter()
@@ -23,11 +25,13 @@ router.include_router(services_router, tags=["services"])
 router.include_router(quotes_router, tags=["quotes"])
 router.include_router(ml_router, tags=["ml"])
 router.include_router(analytics_router, tags=["analytics"])
+router.include_router(imports_router, tags=["imports"])
 
 # Novas rotas do marketplace
 router.include_router(usuarios_router, tags=["usuarios"])
 router.include_router(solicitacoes_router, tags=["solicitacoes"])
 router.include_router(orcamentos_router, tags=["orcamentos"])
 router.include_router(avaliacoes_router)
+router.include_router(marketplace_analytics_router, tags=["marketplace-analytics"])
 
 __all__ = ["router"]
\ No newline at end of file
@@ -0,0 +1,110 @@
+import io
+import json
+import os
+import time
+import pandas as pd
+from fastapi import APIRouter, File, HTTPException, UploadFile
+from pydantic import TypeAdapter, ValidationError
+from typing import Any, Dict, List, Literal, Tuple
+from ..models import ClientCreate, QuoteCreate, ServiceCreate
+from ..services.excel_async import excel_io
+
+router = APIRouter()
+
+IMPORT_MODELS = {
+    'services': ServiceCreate,
+    'clients': ClientCreate,
+    'quotes': QuoteCreate,
+}
+
+
+def _read_records(filename: str, content: bytes) -> List[Any]:
+    """Lê o arquivo enviado (CSV, XLSX ou JSON lines) como uma lista de registros"""
+    extension = os.path.splitext(filename or '')[1].lower()
+    if extension in ('.jsonl', '.ndjson'):
+        records = []
+        for line in content.decode('utf-8-sig').splitlines():
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                # Linha inválida vira registro recusado na validação
+                records.append(line)
+        return records
+    if extension == '.csv':
+        df = pd.read_csv(io.BytesIO(content))
+    elif extension == '.xlsx':
+        df = pd.read_excel(io.BytesIO(content))
+    else:
+        raise ValueError("Formato não suportado: envie .csv, .xlsx ou .jsonl")
+
+    # Célula vazia equivale a campo ausente, para valerem os padrões do modelo
+    records = [
+        {column: value for column, value in record.items() if pd.notna(value)}
+        for record in df.to_dict('records')
+    ]
+    # Em CSV/XLSX os itens de um orçamento vêm como JSON na coluna items
+    for record in records:
+        if isinstance(record.get('items'), str):
+            try:
+                record['items'] = json.loads(record['items'])
+            except json.JSONDecodeError:
+                pass
+    return records
+
+
+def _validate_records(model, records: List[Any]) -> Tuple[List[Tuple[int, Any]], Dict[int, List[str]]]:
+    """Valida todos os registros de uma vez; devolve os válidos e os erros por posição"""
+    try:
+        return list(enumerate(TypeAdapter(List[model]).validate_python(records))), {}
+    except ValidationError as e:
+        errors: Dict[int, List[str]] = {}
+        for error in e.errors():
+            field = '.'.join(str(part) for part in error['loc'][1:])
+            errors.setdefault(error['loc'][0], []).append(f"{field}: {error['msg']}" if field else error['msg'])
+    valid = [(index, model.model_validate(record)) for index, record in enumerate(records) if index not in errors]
+    return valid, errors
+
+
+@router.post("/import/{entity}")
+async def import_records(
+    entity: Literal['services', 'clients', 'quotes'],
+    file: UploadFile = File(..., description="Arquivo .csv, .xlsx ou .jsonl (em orçamentos, items é uma lista JSON)")
+):
+    """Importa serviços, clientes ou orçamentos em lote.
+
+    Os registros são validados de uma vez com os modelos de criação; os
+    válidos recebem um bloco de ids e cada aba é gravada uma única vez.
+    """
+    start = time.perf_counter()
+    try:
+        records = await excel_io.run(_read_records, file.filename, await file.read())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Erro ao ler o arquivo: {str(e)}")
+
+    valid, errors = await excel_io.run(_validate_records, IMPORT_MODELS[entity], records)
+    positions = [index for index, _ in valid]
+    models = [model for _, model in valid]
+
+    if entity == 'services':
+        created = await excel_io.create_services(models)
+    elif entity == 'clients':
+        created = await excel_io.create_clients(models)
+    else:
+        created, refused = await excel_io.create_quotes(models)
+        for index, reason in refused:
+            errors.setdefault(positions[index], []).append(reason)
+
+    elapsed = time.perf_counter() - start
+    return {
+        "entity": entity,
+        "received": len(records),
+        "imported": len(created),
+        "ids": [item.id for item in created],
+        "rejected": [{"row": index + 1, "errors": errors[index]} for index in sorted(errors)],
+        "elapsed_seconds": round(elapsed, 4),
+        "rows_per_second": round(len(created) / elapsed, 1) if elapsed > 0 else None
+    }
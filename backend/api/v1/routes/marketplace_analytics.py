@@ -0,0 +1,56 @@
+"""
+Rotas de Analytics do Marketplace
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Optional
+from ..core.config import MARKETPLACE_ANALYTICS_SOURCE
+from ..core.database import get_db
+from ..services import marketplace_analytics_service, marketplace_analytics_service_supabase
+
+router = APIRouter(prefix="/marketplace")
+
+
+def _sessao_modo_sql():
+    """Sessão do banco só no modo "sql"; no modo supabase nenhuma conexão é aberta"""
+    if MARKETPLACE_ANALYTICS_SOURCE != "sql":
+        yield None
+        return
+    yield from get_db()
+
+
+@router.get("/analytics")
+def obter_analytics_marketplace_endpoint(
+    inicio: Optional[datetime] = Query(None, description="Solicitações criadas a partir de (inclusive)"),
+    fim: Optional[datetime] = Query(None, description="Solicitações criadas até (inclusive)"),
+    db: Optional[Session] = Depends(_sessao_modo_sql),
+):
+    """
+    Conversão de solicitação em orçamento aceito, orçamentos por categoria,
+    mediana do valor proposto vs. sugerido pelo ML e tempo até o aceite.
+    Calculados no banco (RPC no Supabase ou SQL agregado no modo "sql").
+    """
+    if inicio and fim and inicio > fim:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'inicio' deve ser anterior ou igual a 'fim'"
+        )
+
+    if MARKETPLACE_ANALYTICS_SOURCE == "sql":
+        analytics = marketplace_analytics_service.obter_analytics_marketplace(db, inicio, fim)
+    else:
+        analytics = marketplace_analytics_service_supabase.obter_analytics_marketplace(inicio, fim)
+    if analytics is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Analytics do marketplace indisponíveis"
+        )
+
+    return {
+        "periodo": {
+            "inicio": inicio.isoformat() if inicio else None,
+            "fim": fim.isoformat() if fim else None,
+        },
+        **analytics
+    }
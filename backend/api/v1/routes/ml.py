@@ -1,8 +1,13 @@
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from typing import Optional
 import pandas as pd
-from ..services.ml_service import ml_service
-from ..services.excel_service import excel_service
+from ..services.ml_service import ml_service, batcher_categorias, batcher_precos
+from ..services.ml_registry import model_registry
+from ..services.ml_cache import prediction_cache
+from ..services.ml_workers import inference_status
+from ..schemas.ml import PredictBatchRequest, PredictBatchResponse
+from ..services.excel_async import excel_io
 from ..models.service import ServiceCreate
 from ..models.client import ClientCreate
 from ..models.quote import QuoteCreate, QuoteItemCreate
@@ -17,10 +22,10 @@ async def smart_create_item(
     """Cria serviço inteligentemente usando ML e salva no Excel"""
     try:
         # Prediz categoria
-        category = ml_service.predict_category(name)
+        category = await ml_service.predict_category_async(name)
         
         # Prediz preço
-        price_prediction = ml_service.predict_price(name, category)
+        price_prediction = await ml_service.predict_price_async(name, category)
         
         # Gera descrição profissional
         professional_description = ml_service.generate_professional_description(name, category)
@@ -41,41 +46,48 @@ async def smart_create_item(
             }
         }
         
-        # Cria o serviço no Excel
-        ml_data = suggestions.get("ml_predictions", {})
-        service_create = ServiceCreate(
-            name=ml_data.get("name", name),
-            unit_price=ml_data.get("price_suggestion", {}).get("suggested_price", 100.0),
-            unit="unidade"
-        )
-        
-        created_service = excel_service.create_service(service_create)
-        
-        # Cria um cliente padrão se não existir
-        clients = excel_service.get_all_clients()
-        if not clients:
-            client_create = ClientCreate(name="Cliente Padrão")
-            created_client = excel_service.create_client(client_create)
-        else:
-            created_client = clients[0]
-        
-        # Cria um orçamento com o serviço
-        quote_item = QuoteItemCreate(
-            service_id=created_service.id,
-            quantity=1.0,
-            unit_price=created_service.unit_price
-        )
-        
-        quote_create = QuoteCreate(
-            client_id=created_client.id,
-            title=f"Orçamento - {created_service.name}",
-            description=ml_data.get("description", ""),
-            status="pendente",
-            items=[quote_item]
-        )
-        
-        created_quote = excel_service.create_quote(quote_create)
-        
+        # Serviço, cliente e orçamento são gravados numa única escrita do Excel,
+        # num bloco executado fora do event loop
+        def save():
+            with excel_io.service.transaction():
+                # Cria o serviço no Excel
+                ml_data = suggestions.get("ml_predictions", {})
+                service_create = ServiceCreate(
+                    name=ml_data.get("name", name),
+                    unit_price=ml_data.get("price_suggestion", {}).get("suggested_price", 100.0),
+                    unit="unidade"
+                )
+            
+                created_service = excel_io.service.create_service(service_create)
+            
+                # Cria um cliente padrão se não existir
+                clients = excel_io.service.get_all_clients()
+                if not clients:
+                    client_create = ClientCreate(name="Cliente Padrão")
+                    created_client = excel_io.service.create_client(client_create)
+                else:
+                    created_client = clients[0]
+            
+                # Cria um orçamento com o serviço
+                quote_item = QuoteItemCreate(
+                    service_id=created_service.id,
+                    quantity=1.0,
+                    unit_price=created_service.unit_price
+                )
+            
+                quote_create = QuoteCreate(
+                    client_id=created_client.id,
+                    title=f"Orçamento - {created_service.name}",
+                    description=ml_data.get("description", ""),
+                    status="pendente",
+                    items=[quote_item]
+                )
+            
+                created_quote = excel_io.service.create_quote(quote_create)
+                return created_service, created_quote
+
+        created_service, created_quote = await excel_io.run(save)
+            
         # Retorna as predições do ML + dados salvos
         return {
             **suggestions,
@@ -89,6 +101,16 @@ async def smart_create_item(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erro ao criar serviço com ML: {str(e)}")
 
+@router.get("/ml/status")
+async def ml_status():
+    """Prontidão e tempo de carga dos modelos de ML deste processo, cache, micro-batching e modo de inferência"""
+    return {
+        **model_registry.status(),
+        "inference": inference_status(),
+        "cache": prediction_cache.stats(),
+        "batching": {"price": batcher_precos.stats(), "category": batcher_categorias.stats()},
+    }
+
 @router.post("/ml/retrain")
 async def retrain_ml_models():
     """Retreina os modelos de ML com novos dados do Excel"""
@@ -108,7 +130,7 @@ async def predict_service_category(
 ):
     """Prediz a categoria de um serviço"""
     try:
-        category = ml_service.predict_category(name)
+        category = await ml_service.predict_category_async(name)
         return {
             "service_name": name,
             "predicted_category": category,
@@ -124,15 +146,30 @@ async def predict_service_price(
 ):
     """Prediz o preço de um serviço"""
     try:
-        price_prediction = ml_service.predict_price(name, category)
+        price_prediction = await ml_service.predict_price_async(name, category)
         return {
             "service_name": name,
-            "category": category or ml_service.predict_category(name),
+            "category": category or await ml_service.predict_category_async(name),
             **price_prediction
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erro na predição: {str(e)}")
 
+@router.post("/ml/predict-batch", response_model=PredictBatchResponse)
+async def predict_batch(request: PredictBatchRequest):
+    """Prediz categoria e preço de vários serviços com uma passada por modelo.
+
+    Cada item tem o mesmo resultado de /ml/predict-price; a predição roda
+    numa thread para não bloquear o event loop em lotes grandes.
+    """
+    try:
+        results = await run_in_threadpool(
+            ml_service.predict_batch, [(item.name, item.category) for item in request.items]
+        )
+        return {"results": results, "count": len(results)}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erro na predição: {str(e)}")
+
 @router.post("/ml/populate-training-data")
 async def populate_training_data():
     """Popula o Excel com dados de treinamento para ML"""
@@ -140,25 +177,12 @@ async def populate_training_data():
         # Adiciona dados de treinamento ao Excel
         training_data = ml_service.training_data
         
-        # Cria serviços de treinamento
-        services_created = 0
-        for i, (name, category, price, description) in enumerate(zip(
-            training_data['service_names'],
-            training_data['categories'], 
-            training_data['prices'],
-            training_data['descriptions']
-        )):
-            try:
-                service_create = ServiceCreate(
-                    name=name,
-                    unit_price=price,
-                    unit="unidade"
-                )
-                excel_service.create_service(service_create)
-                services_created += 1
-            except Exception as e:
-                print(f"Erro ao criar serviço {name}: {e}")
-                continue
+        # Cria os serviços de treinamento numa única gravação
+        services = await excel_io.create_services([
+            ServiceCreate(name=name, unit_price=price, unit="unidade")
+            for name, price in zip(training_data['service_names'], training_data['prices'])
+        ])
+        services_created = len(services)
         
         return {
             "message": f"Dados de treinamento adicionados com sucesso!",
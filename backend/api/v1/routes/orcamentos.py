@@ -14,7 +14,7 @@ from ..services.orcamento_service_supabase import (
     marcar_realizado
 )
 from ..services.solicitacao_service_supabase import buscar_solicitacao_por_id
-from ..services.ml_service import calcular_limites_preco
+from ..services.ml_service import calcular_limites_preco_agrupado
 
 router = APIRouter(prefix="/orcamentos")
 
@@ -35,8 +35,8 @@ def calcular_limites_endpoint(
             detail="Solicitação não encontrada"
         )
     
-    # Calcula limites usando ML
-    limites = calcular_limites_preco(
+    # Calcula limites usando ML (agrupado com as requisições concorrentes)
+    limites = calcular_limites_preco_agrupado(
         categoria=solicitacao['categoria'],
         descricao=solicitacao['descricao'],
         localizacao=solicitacao['localizacao']
@@ -59,7 +59,7 @@ def criar_orcamento_endpoint(
         )
     
     # Calcula limites do ML para validação
-    limites = calcular_limites_preco(
+    limites = calcular_limites_preco_agrupado(
         categoria=solicitacao['categoria'],
         descricao=solicitacao['descricao'],
         localizacao=solicitacao['localizacao']
@@ -1,24 +1,121 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
+import csv
+import io
+import os
+import tempfile
+from datetime import datetime
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Query, Response
+from fastapi.responses import FileResponse, StreamingResponse
+from openpyxl import Workbook
+from typing import List, Literal, Optional
 from ..models import Quote, QuoteCreate, QuoteUpdate
-from ..services.excel_service import excel_service
+from ..services.excel_service import EXPORT_COLUMNS, MAX_PAGE_SIZE
+from ..services.excel_async import excel_io
 
 router = APIRouter()
 
 @router.get("/quotes", response_model=List[Quote])
-async def get_all_quotes():
-    """Lista todos os orçamentos"""
-    return excel_service.get_all_quotes()
+async def get_all_quotes(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Tamanho da página (sem limite: lista tudo)"),
+    cursor: Optional[str] = Query(None, description="Cursor da próxima página (cabeçalho X-Next-Cursor)"),
+    status: Optional[str] = Query(None, description="Filtra pelo status do orçamento"),
+    client_id: Optional[int] = Query(None, description="Filtra pelo cliente"),
+    created_from: Optional[datetime] = Query(None, description="Criados a partir de (ISO 8601)"),
+    created_to: Optional[datetime] = Query(None, description="Criados até (ISO 8601)"),
+    sort: str = Query("id", description="id, quote_number, status, total, created_at ou updated_at"),
+    order: Literal["asc", "desc"] = Query("asc", description="Direção da ordenação")
+):
+    """Lista os orçamentos, com paginação por cursor, filtros e ordenação opcionais"""
+    try:
+        quotes, next_cursor = await excel_io.list_quotes(
+            limit=limit, cursor=cursor, status=status, client_id=client_id,
+            created_from=created_from, created_to=created_to, sort=sort, order=order
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return quotes
+
+@router.get("/quotes/workbook")
+async def export_workbook(background_tasks: BackgroundTasks):
+    """Exporta a base de orçamentos completa em .xlsx, qualquer que seja o motor de armazenamento"""
+    fd, path = tempfile.mkstemp(suffix='.xlsx')
+    os.close(fd)
+    os.remove(path)
+    await excel_io.export_xlsx(path)
+    background_tasks.add_task(os.remove, path)
+    return FileResponse(
+        path,
+        filename="quotes_data.xlsx",
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    )
+
+def _stream_csv(chunks):
+    """Gera o CSV bloco a bloco, com BOM para o Excel reconhecer UTF-8"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write('\ufeff')
+    writer.writerow(EXPORT_COLUMNS)
+    for rows in chunks:
+        writer.writerows(rows)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def _stream_xlsx(chunks, block_size: int = 64 * 1024):
+    """Monta o .xlsx em modo write-only (linhas vão para disco) e envia o arquivo em blocos"""
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('quotes')
+    sheet.append(EXPORT_COLUMNS)
+    for rows in chunks:
+        for row in rows:
+            sheet.append(row)
+    with tempfile.TemporaryFile() as tmp:
+        workbook.save(tmp)
+        tmp.seek(0)
+        while True:
+            block = tmp.read(block_size)
+            if not block:
+                return
+            yield block
+
+
+@router.get("/quotes/export")
+async def export_quotes(
+    format: Literal["csv", "xlsx"] = Query("csv", description="Formato do arquivo"),
+    status: Optional[str] = Query(None, description="Filtra pelo status do orçamento"),
+    client_id: Optional[int] = Query(None, description="Filtra pelo cliente"),
+    created_from: Optional[datetime] = Query(None, description="Criados a partir de (ISO 8601)"),
+    created_to: Optional[datetime] = Query(None, description="Criados até (ISO 8601)")
+):
+    """Exporta orçamentos com seus itens (uma linha por item) em CSV ou .xlsx, via streaming"""
+    # O StreamingResponse consome o gerador fora do event loop (threadpool do Starlette)
+    chunks = excel_io.service.iter_quote_export(
+        status=status, client_id=client_id, created_from=created_from, created_to=created_to
+    )
+    if format == "csv":
+        body, media_type = _stream_csv(chunks), "text/csv; charset=utf-8"
+    else:
+        body, media_type = _stream_xlsx(chunks), "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="quotes_export.{format}"'}
+    )
 
 @router.post("/quotes", response_model=Quote)
 async def create_quote(quote: QuoteCreate):
     """Cria novo orçamento com análise de ML"""
-    return excel_service.create_quote(quote)
+    return await excel_io.create_quote(quote)
 
 @router.put("/quotes/{quote_id}", response_model=Quote)
 async def update_quote(quote_id: int, quote_update: QuoteUpdate):
     """Atualiza um orçamento existente"""
-    updated_quote = excel_service.update_quote(quote_id, quote_update)
+    updated_quote = await excel_io.update_quote(quote_id, quote_update)
     if not updated_quote:
         raise HTTPException(status_code=404, detail="Orçamento não encontrado")
     return updated_quote
@@ -26,7 +123,7 @@ async def update_quote(quote_id: int, quote_update: QuoteUpdate):
 @router.delete("/quotes/{quote_id}")
 async def delete_quote(quote_id: int):
     """Exclui um orçamento"""
-    success = excel_service.delete_quote(quote_id)
+    success = await excel_io.delete_quote(quote_id)
     if not success:
         raise HTTPException(status_code=404, detail="Orçamento não encontrado")
     return {"message": "Orçamento excluído com sucesso"}
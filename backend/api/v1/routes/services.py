@@ -1,16 +1,34 @@
-from fastapi import APIRouter
-from typing import List
+from datetime import datetime
+from fastapi import APIRouter, HTTPException, Query, Response
+from typing import List, Literal, Optional
 from ..models import Service, ServiceCreate
-from ..services.excel_service import excel_service
+from ..services.excel_service import MAX_PAGE_SIZE
+from ..services.excel_async import excel_io
 
 router = APIRouter()
 
 @router.get("/services", response_model=List[Service])
-async def get_all_services():
-    """Lista todos os serviços residenciais"""
-    return excel_service.get_all_services()
+async def get_all_services(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Tamanho da página (sem limite: lista tudo)"),
+    cursor: Optional[str] = Query(None, description="Cursor da próxima página (cabeçalho X-Next-Cursor)"),
+    created_from: Optional[datetime] = Query(None, description="Criados a partir de (ISO 8601)"),
+    created_to: Optional[datetime] = Query(None, description="Criados até (ISO 8601)"),
+    sort: str = Query("id", description="id, name, unit_price, created_at ou updated_at"),
+    order: Literal["asc", "desc"] = Query("asc", description="Direção da ordenação")
+):
+    """Lista os serviços residenciais, com paginação por cursor, filtros e ordenação opcionais"""
+    try:
+        services, next_cursor = await excel_io.list_services(
+            limit=limit, cursor=cursor, created_from=created_from, created_to=created_to, sort=sort, order=order
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return services
 
 @router.post("/services", response_model=Service)
 async def create_service(service: ServiceCreate):
     """Cria novo serviço com categorização automática"""
-    return excel_service.create_service(service)
+    return await excel_io.create_service(service)
@@ -17,6 +17,9 @@ from .orcamentos import (
 from .avaliacoes import (
     AvaliacaoCreate, AvaliacaoResponse, MediaPrestadorResponse
 )
+from .ml import (
+    PredictBatchItem, PredictBatchRequest, PredictBatchResult, PredictBatchResponse
+)
 
 __all__ = [
     # Clientes
@@ -32,6 +35,8 @@ __all__ = [
     "OrcamentoCreate", "OrcamentoUpdate", "OrcamentoResponse",
     "OrcamentoComLimites", "CalcularLimitesRequest", "CalcularLimitesResponse",
     # Avaliações
-    "AvaliacaoCreate", "AvaliacaoResponse", "MediaPrestadorResponse"
+    "AvaliacaoCreate", "AvaliacaoResponse", "MediaPrestadorResponse",
+    # ML
+    "PredictBatchItem", "PredictBatchRequest", "PredictBatchResult", "PredictBatchResponse"
 ]
 
@@ -0,0 +1,26 @@
+"""
+Schemas Pydantic para as rotas de ML
+"""
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from ..core.config import ML_PREDICT_BATCH_MAX
+
+# ============= SCHEMAS PARA PREDIÇÃO EM LOTE =============
+
+class PredictBatchItem(BaseModel):
+    name: str
+    category: Optional[str] = None
+
+class PredictBatchRequest(BaseModel):
+    items: List[PredictBatchItem] = Field(..., min_length=1, max_length=ML_PREDICT_BATCH_MAX)
+
+class PredictBatchResult(BaseModel):
+    service_name: str
+    category: str
+    suggested_price: float
+    min_price: float
+    max_price: float
+
+class PredictBatchResponse(BaseModel):
+    results: List[PredictBatchResult]
+    count: int
@@ -0,0 +1,327 @@
+"""
+Agregados dos orçamentos da base legada, mantidos de forma incremental
+
+Totais, contagem por status, uso por serviço e baldes diários (quantidade e
+receita) são montados uma vez a partir das abas e depois atualizados pelas
+próprias operações de gravação do ExcelService (insert, update e delete).
+Operações que não dá para traduzir em deltas (replace, upsert) fazem o
+ExcelService descartar os agregados, que são refeitos na próxima consulta.
+
+Os analytics por serviço e por cliente são calculados sob demanda, com um
+groupby sobre as abas de itens e de orçamentos; percentis de preço e clientes
+únicos por mês vêm dos sketches de excel_sketches.
+"""
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+import pandas as pd
+
+
+def _day(value: Any) -> str:
+    """Dia (YYYY-MM-DD) de um created_at gravado como texto ISO ou datetime"""
+    return str(value)[:10]
+
+
+GRANULARITIES = ('day', 'week', 'month')
+
+
+def _period(day: str, granularity: str) -> str:
+    """Rótulo do balde de um dia: YYYY-MM-DD, semana ISO (YYYY-Www) ou YYYY-MM"""
+    if granularity == 'day':
+        return day
+    if granularity == 'month':
+        return day[:7]
+    year, week, _ = date.fromisoformat(day).isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def _number(value: Any) -> float:
+    number = pd.to_numeric(value, errors='coerce')
+    return 0.0 if pd.isna(number) else float(number)
+
+
+class QuoteAggregates:
+    """Agregados de orçamentos e itens atualizáveis por deltas"""
+
+    def __init__(self):
+        self.quotes_count = 0
+        self.revenue = 0.0
+        self.status_counts: Dict[str, int] = {}
+        # Itens por service_id (o nome vem da aba de serviços na consulta)
+        self.service_usage: Dict[int, int] = {}
+        # Dia (YYYY-MM-DD) -> [quantidade de orçamentos, receita]
+        self.days: Dict[str, List[float]] = {}
+
+    @classmethod
+    def from_frames(cls, quotes: pd.DataFrame, items: pd.DataFrame) -> 'QuoteAggregates':
+        """Monta os agregados do zero, com uma passada vetorizada por aba"""
+        aggregates = cls()
+        if len(quotes):
+            totals = pd.to_numeric(quotes['total'], errors='coerce').fillna(0.0)
+            aggregates.quotes_count = len(quotes)
+            aggregates.revenue = float(totals.sum())
+            aggregates.status_counts = {
+                str(status): int(count) for status, count in quotes['status'].value_counts(sort=False).items()
+            }
+            by_day = totals.groupby(quotes['created_at'].astype(str).str[:10].to_numpy()).agg(['count', 'sum'])
+            aggregates.days = {
+                day: [int(count), float(revenue)]
+                for day, count, revenue in zip(by_day.index, by_day['count'], by_day['sum'])
+            }
+        if len(items):
+            aggregates.service_usage = {
+                int(service_id): int(count)
+                for service_id, count in items['service_id'].value_counts(sort=False).items()
+            }
+        return aggregates
+
+    # DELTAS
+    def _add_quote(self, row: dict, sign: int):
+        total = _number(row.get('total')) * sign
+        self.quotes_count += sign
+        self.revenue += total
+        status = str(row.get('status'))
+        self.status_counts[status] = self.status_counts.get(status, 0) + sign
+        if not self.status_counts[status]:
+            del self.status_counts[status]
+        day = _day(row.get('created_at'))
+        bucket = self.days.setdefault(day, [0, 0.0])
+        bucket[0] += sign
+        bucket[1] += total
+        if not bucket[0]:
+            del self.days[day]
+
+    def _add_item(self, row: dict, sign: int):
+        service_id = int(row['service_id'])
+        self.service_usage[service_id] = self.service_usage.get(service_id, 0) + sign
+        if not self.service_usage[service_id]:
+            del self.service_usage[service_id]
+
+    def apply(self, sheet_name: str, op: dict, before: pd.DataFrame) -> bool:
+        """Aplica uma operação já feita na aba; False se for preciso refazer tudo.
+
+        `before` é a aba como estava antes da operação.
+        """
+        if sheet_name == 'quotes':
+            add = self._add_quote
+        elif sheet_name == 'quote_items':
+            add = self._add_item
+        else:
+            return True
+        kind = op['op']
+        if kind == 'insert':
+            rows: Iterable[dict] = op['rows']
+            for row in rows:
+                add(row, 1)
+            return True
+        if kind == 'update':
+            matches = (before['id'] == op['id']).to_numpy().nonzero()[0]
+            if len(matches):
+                old = before.iloc[int(matches[0])].to_dict()
+                add(old, -1)
+                add({**old, **op['values']}, 1)
+            return True
+        if kind == 'delete':
+            if op['column'] not in before.columns:
+                return True
+            for row in before[before[op['column']] == op['value']].to_dict('records'):
+                add(row, -1)
+            return True
+        return False
+
+    # CONSULTAS
+    def trends(
+        self,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        granularity: str = 'day'
+    ) -> List[Dict[str, Any]]:
+        """Baldes diários entre `start` e `end` (inclusive) somados na granularidade pedida.
+
+        O custo depende só do número de dias com orçamentos, não do número de orçamentos.
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Granularidade inválida: {granularity!r}")
+        first = start.isoformat() if start else None
+        last = end.isoformat() if end else None
+        periods: Dict[str, List[float]] = {}
+        for day in sorted(self.days):
+            if not day[:1].isdigit() or (first and day < first) or (last and day > last):
+                # Dias inválidos (created_at vazio) não entram em nenhum balde
+                continue
+            count, revenue = self.days[day]
+            bucket = periods.setdefault(_period(day, granularity), [0, 0.0])
+            bucket[0] += count
+            bucket[1] += revenue
+        return [
+            {"period": period, "quotes_count": int(count), "revenue": revenue}
+            for period, (count, revenue) in periods.items()
+        ]
+
+    def monthly(self, last: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Baldes por mês (YYYY-MM), em ordem; `last` limita aos últimos meses"""
+        months = self.trends(granularity='month')
+        if last is not None:
+            months = months[-last:]
+        return [
+            {"month": bucket["period"], "quotes_count": bucket["quotes_count"], "revenue": bucket["revenue"]}
+            for bucket in months
+        ]
+
+    def revenue_since(self, start: datetime) -> float:
+        """Receita dos orçamentos criados a partir do dia de `start`"""
+        first_day = start.strftime("%Y-%m-%d")
+        return sum(revenue for day, (_, revenue) in self.days.items() if day >= first_day)
+
+    def overview(
+        self,
+        services_by_id: Dict[int, dict],
+        total_services: int,
+        total_clients: int,
+        now: Optional[datetime] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        granularity: str = 'month'
+    ) -> Dict[str, Any]:
+        """Resposta de /analytics/overview montada só a partir dos agregados.
+
+        `start`, `end` e `granularity` definem o período de `period` e `trends`;
+        os campos fixos (30 dias, últimos 6 meses) continuam presentes.
+        """
+        now = now or datetime.now()
+        trends = self.trends(start, end, granularity)
+        usage_by_name: Dict[str, int] = {}
+        for service_id, count in self.service_usage.items():
+            service_row = services_by_id.get(service_id)
+            if service_row is not None:
+                usage_by_name[service_row['name']] = usage_by_name.get(service_row['name'], 0) + count
+        return {
+            "overview": {
+                "total_quotes": self.quotes_count,
+                "total_services": total_services,
+                "total_clients": total_clients,
+                "total_revenue": self.revenue,
+                "avg_quote_value": self.revenue / self.quotes_count if self.quotes_count > 0 else 0,
+                "recent_revenue_30d": self.revenue_since(now - timedelta(days=30))
+            },
+            "status_distribution": dict(self.status_counts),
+            "top_services": sorted(usage_by_name.items(), key=lambda x: x[1], reverse=True)[:5],
+            "monthly_trends": self.monthly(last=6),
+            "period": {
+                "from": start.isoformat() if start else None,
+                "to": end.isoformat() if end else None,
+                "granularity": granularity,
+                "quotes_count": sum(bucket["quotes_count"] for bucket in trends),
+                "revenue": sum(bucket["revenue"] for bucket in trends)
+            },
+            "trends": trends
+        }
+
+
+# ANALYTICS POR SERVIÇO E POR CLIENTE
+def _numeric(series: pd.Series) -> pd.Series:
+    return pd.to_numeric(series, errors='coerce')
+
+
+def services_analytics(
+    services: pd.DataFrame,
+    quotes: pd.DataFrame,
+    items: pd.DataFrame,
+    price_quantiles: Optional[Dict[int, List[Optional[float]]]] = None
+) -> Dict[str, Any]:
+    """Preço mínimo/médio/máximo e uso de cada serviço num único groupby sobre os itens.
+
+    Só contam itens de orçamentos existentes; serviços sem uso ficam de fora
+    da lista e a ordem é por número de usos (empates na ordem da aba).
+    `price_quantiles` ({service_id: [p50, p90]}, dos sketches) acrescenta
+    p50_price e p90_price a cada serviço.
+    """
+    items = items[items['quote_id'].isin(quotes['id'])]
+    stats = pd.DataFrame({
+        'service_id': _numeric(items['service_id']),
+        'unit_price': _numeric(items['unit_price']),
+        'quantity': _numeric(items['quantity']),
+    }).groupby('service_id').agg(
+        avg_price_used=('unit_price', 'mean'),
+        min_price=('unit_price', 'min'),
+        max_price=('unit_price', 'max'),
+        total_usage=('quantity', 'sum'),
+        times_used=('unit_price', 'size'),
+    )
+    joined = pd.DataFrame({
+        'service_id': _numeric(services['id']),
+        'service_name': services['name'],
+        'unit': services['unit'],
+        'base_price': _numeric(services['unit_price']),
+    }).join(stats, on='service_id', how='inner')
+    joined = joined.sort_values('times_used', ascending=False, kind='stable')
+    analytics = [
+        {
+            "service_id": int(service_id),
+            "service_name": name,
+            "unit": unit,
+            "base_price": float(base_price),
+            "avg_price_used": float(avg_price),
+            "min_price": float(min_price),
+            "max_price": float(max_price),
+            "total_usage": float(total_usage),
+            "times_used": int(times_used),
+        }
+        for service_id, name, unit, base_price, avg_price, min_price, max_price, total_usage, times_used
+        in joined.to_numpy(dtype=object).tolist()
+    ]
+    if price_quantiles is not None:
+        for service in analytics:
+            service["p50_price"], service["p90_price"] = price_quantiles.get(service["service_id"], [None, None])
+    return {
+        "services": analytics,
+        "total_services": len(services),
+        "active_services": len(analytics),
+    }
+
+
+def clients_analytics(
+    clients: pd.DataFrame,
+    quotes: pd.DataFrame,
+    unique_clients: Optional[Dict[str, int]] = None
+) -> Dict[str, Any]:
+    """Quantidade, total gasto e último orçamento de cada cliente num único groupby.
+
+    Clientes sem orçamentos ficam de fora; a ordem é por total gasto
+    (empates na ordem da aba). `unique_clients` ({YYYY-MM: n}, dos sketches)
+    vira a lista unique_clients_by_month.
+    """
+    stats = pd.DataFrame({
+        'client_id': _numeric(quotes['client_id']),
+        'total': _numeric(quotes['total']),
+        'created_at': pd.to_datetime(quotes['created_at'].astype(str), format='ISO8601'),
+    }).groupby('client_id').agg(
+        quotes_count=('total', 'size'),
+        total_spent=('total', 'sum'),
+        last_quote_date=('created_at', 'max'),
+    )
+    joined = pd.DataFrame({
+        'client_id': _numeric(clients['id']),
+        'client_name': clients['name'],
+    }).join(stats, on='client_id', how='inner')
+    joined = joined.sort_values('total_spent', ascending=False, kind='stable')
+    analytics = [
+        {
+            "client_id": int(client_id),
+            "client_name": name,
+            "quotes_count": int(count),
+            "total_spent": float(total_spent),
+            "avg_quote_value": float(total_spent) / int(count),
+            "last_quote_date": last_quote_date.to_pydatetime().isoformat(),
+        }
+        for client_id, name, count, total_spent, last_quote_date in joined.to_numpy(dtype=object).tolist()
+    ]
+    result = {
+        "clients": analytics,
+        "total_clients": len(clients),
+        "active_clients": len(analytics),
+    }
+    if unique_clients is not None:
+        result["unique_clients_by_month"] = [
+            {"month": month, "unique_clients": count} for month, count in unique_clients.items()
+        ]
+    return result
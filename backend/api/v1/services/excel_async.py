@@ -0,0 +1,62 @@
+"""
+Fachada assíncrona do ExcelService para as rotas async
+
+Leitura e gravação da base legada (openpyxl, SQLite, journal) são bloqueantes;
+chamadas direto de um `async def` travam o event loop do worker e atrasam
+todas as outras requisições, inclusive as do marketplace. Aqui cada chamada
+roda num pool limitado de threads (EXCEL_IO_WORKERS) e é aguardada com await.
+"""
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+from .excel_service import ExcelService, excel_service, EXCEL_IO_WORKERS
+
+
+class AsyncExcelService:
+    """Expõe os métodos do ExcelService como corrotinas executadas no pool de I/O.
+
+    `await excel_io.list_quotes(...)` equivale a `excel_service.list_quotes(...)`
+    sem bloquear o event loop; `run` executa um bloco inteiro (por exemplo, uma
+    transaction() com várias gravações) numa única ida ao pool.
+    """
+
+    def __init__(self, service: ExcelService, max_workers: int = EXCEL_IO_WORKERS):
+        self.service = service
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Criado sob demanda: workers com fork não herdam threads do processo pai
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="excel-io")
+            return self._executor
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Executa `fn(*args, **kwargs)` no pool de I/O e aguarda o resultado"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), functools.partial(fn, *args, **kwargs))
+
+    def __getattr__(self, name: str):
+        attr = getattr(self.service, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def call(*args, **kwargs):
+            return await self.run(attr, *args, **kwargs)
+        return call
+
+    def shutdown(self):
+        """Encerra o pool (as chamadas em andamento terminam antes)"""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+# Fachada da instância global, usada pelas rotas legadas
+excel_io = AsyncExcelService(excel_service)
@@ -0,0 +1,247 @@
+"""
+Journal append-only (write-ahead) da base legada de orçamentos
+
+Cada transação do ExcelService vira uma linha JSON com um número de sequência e a
+lista de operações por linha (insert, update, upsert, delete, replace). As leituras aplicam
+o journal sobre o último snapshot gravado no motor de armazenamento, e a compactação
+incorpora o journal ao arquivo, registrando na aba JOURNAL_SHEET a última sequência
+já incorporada para que uma compactação interrompida nunca reaplique operações.
+"""
+import json
+import math
+import os
+import tempfile
+import threading
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+# Aba de controle com a última sequência do journal já incorporada ao arquivo
+JOURNAL_SHEET = '_journal'
+
+
+def _json_value(value: Any) -> Any:
+    """Converte valores do pandas/NumPy para tipos serializáveis em JSON"""
+    if value is None:
+        return None
+    if isinstance(value, date):
+        return value.isoformat()
+    if hasattr(value, 'item'):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def _json_rows(rows: List[dict]) -> List[dict]:
+    return [{key: _json_value(value) for key, value in row.items()} for row in rows]
+
+
+def serialize_operation(op: dict) -> dict:
+    """Representação JSON de uma operação (replace carrega o DataFrame inteiro)"""
+    if op['op'] == 'replace':
+        frame = op['frame']
+        return {
+            'op': 'replace',
+            'sheet': op['sheet'],
+            'columns': list(frame.columns),
+            'rows': _json_rows(frame.to_dict('records')),
+        }
+    serialized = {key: value for key, value in op.items() if key not in ('rows', 'row', 'values', 'value', 'id')}
+    if 'rows' in op:
+        serialized['rows'] = _json_rows(op['rows'])
+    if 'row' in op:
+        serialized['row'] = _json_rows([op['row']])[0]
+    if 'values' in op:
+        serialized['values'] = {key: _json_value(value) for key, value in op['values'].items()}
+    if 'value' in op:
+        serialized['value'] = _json_value(op['value'])
+    if 'id' in op:
+        serialized['id'] = _json_value(op['id'])
+    return serialized
+
+
+def _set_cell(df: pd.DataFrame, pos: int, column: str, value: Any):
+    """Atribui um valor a uma célula, alargando o dtype da coluna se preciso"""
+    if column not in df.columns:
+        df[column] = pd.Series([None] * len(df), dtype=object, index=df.index)
+    dtype = df[column].dtype
+    if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            df[column] = df[column].astype(object)
+        elif pd.api.types.is_integer_dtype(dtype) and isinstance(value, float):
+            df[column] = df[column].astype(float)
+    elif not pd.api.types.is_object_dtype(dtype) and not pd.api.types.is_string_dtype(dtype):
+        df[column] = df[column].astype(object)
+    elif pd.api.types.is_string_dtype(dtype) and not pd.api.types.is_object_dtype(dtype) \
+            and value is not None and not isinstance(value, str):
+        df[column] = df[column].astype(object)
+    df.iat[pos, df.columns.get_loc(column)] = value
+
+
+def apply_operation(df: pd.DataFrame, op: dict) -> Tuple[pd.DataFrame, Optional[int]]:
+    """Aplica uma operação a uma aba sem alterar o DataFrame recebido.
+
+    Retorna a nova aba e, quando a operação foi um append, a posição a partir
+    da qual as linhas foram acrescentadas.
+    """
+    kind = op['op']
+    if kind == 'insert':
+        start = len(df)
+        new_rows = pd.DataFrame(op['rows'])
+        if df.empty and len(df.columns) == 0:
+            return new_rows, start
+        if df.empty:
+            # Evita que colunas vazias (dtype object) rebaixem os tipos das novas linhas
+            return new_rows.reindex(columns=list(dict.fromkeys([*df.columns, *new_rows.columns]))), start
+        return pd.concat([df, new_rows], ignore_index=True), start
+    if kind == 'update':
+        matches = (df['id'] == op['id']).to_numpy().nonzero()[0]
+        if len(matches) == 0:
+            return df, None
+        df = df.copy()
+        for column, value in op['values'].items():
+            _set_cell(df, int(matches[0]), column, value)
+        return df, None
+    if kind == 'upsert':
+        # Atualiza a linha cuja coluna `key` tem o valor de `row`, ou a acrescenta
+        row = op['row']
+        if op['key'] in df.columns and len(df):
+            matches = (df[op['key']] == row[op['key']]).to_numpy().nonzero()[0]
+            if len(matches):
+                df = df.copy()
+                for column, value in row.items():
+                    _set_cell(df, int(matches[0]), column, value)
+                return df, None
+        return apply_operation(df, {'op': 'insert', 'sheet': op['sheet'], 'rows': [row]})
+    if kind == 'delete':
+        return df[df[op['column']] != op['value']].reset_index(drop=True), None
+    if kind == 'replace':
+        if 'frame' in op:
+            return op['frame'].reset_index(drop=True), None
+        return pd.DataFrame(op['rows'], columns=op['columns']), None
+    raise ValueError(f"Operação de journal desconhecida: {kind!r}")
+
+
+class WriteAheadJournal:
+    """Arquivo JSON lines com as transações ainda não incorporadas ao snapshot"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def stamp(self) -> Optional[Tuple[int, int, int]]:
+        """Identidade do arquivo (inode, mtime em ns, tamanho)"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def size(self) -> int:
+        stamp = self.stamp()
+        return stamp[2] if stamp else 0
+
+    def append(self, seq: int, ops: List[dict]) -> int:
+        """Acrescenta uma transação (operações já serializadas) de forma durável
+        e retorna o novo tamanho do arquivo"""
+        line = json.dumps({'seq': seq, 'ops': ops}, ensure_ascii=False)
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+                return f.tell()
+
+    def read(self, offset: int = 0) -> Tuple[List[Tuple[int, List[dict]]], int]:
+        """Lê as transações a partir de um offset.
+
+        Uma última linha incompleta (escrita interrompida) é ignorada e o
+        offset retornado para antes dela.
+        """
+        transactions: List[Tuple[int, List[dict]]] = []
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            return transactions, 0
+        consumed = 0
+        for raw in data.splitlines(keepends=True):
+            if not raw.endswith(b'\n'):
+                break
+            consumed += len(raw)
+            if not raw.strip():
+                continue
+            record = json.loads(raw)
+            transactions.append((int(record['seq']), record['ops']))
+        return transactions, offset + consumed
+
+    def rewrite(self, transactions: List[Tuple[int, List[dict]]]):
+        """Substitui o journal (atomicamente) pelas transações informadas"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(prefix='.~', suffix='.jsonl', dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                for seq, ops in transactions:
+                    f.write(json.dumps({'seq': seq, 'ops': ops}, ensure_ascii=False) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            with self._lock:
+                os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+class JournalCompactor:
+    """Thread em segundo plano que incorpora o journal ao arquivo periodicamente
+    ou quando ele passa do tamanho limite"""
+
+    def __init__(self, service, max_bytes: int, interval: float):
+        self.service = service
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.last_error: Optional[str] = None
+
+    def ensure_started(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='journal-compactor', daemon=True)
+            self._thread.start()
+
+    def notify(self, journal_size: int):
+        """Chamado após cada append; acorda a thread se o journal passou do limite"""
+        self.ensure_started()
+        if journal_size >= self.max_bytes:
+            self._wake.set()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            try:
+                self.service.compact()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = str(e)
+                print(f"⚠️ Erro ao compactar journal: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'running': bool(self._thread and self._thread.is_alive()),
+            'max_bytes': self.max_bytes,
+            'interval_seconds': self.interval,
+            'last_error': self.last_error,
+        }
@@ -1,13 +1,27 @@
 import pandas as pd
+import numpy as np
+import base64
+import functools
+import json
 import os
-from datetime import datetime
-from typing import List, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
 from ..models import (
     Client, ClientCreate, ClientUpdate,
     Service, ServiceCreate, ServiceUpdate,
     Quote, QuoteCreate, QuoteUpdate,
     QuoteItem, QuoteItemCreate, QuoteItemUpdate
 )
+from .excel_aggregates import QuoteAggregates, clients_analytics, services_analytics
+from .excel_sketches import QuoteSketches
+from .excel_storage import StorageEngine, XlsxStorageEngine, create_storage_engine
+from .excel_journal import (
+    JOURNAL_SHEET, JournalCompactor, WriteAheadJournal, apply_operation, serialize_operation
+)
+from .file_lock import InterProcessLock
 import sys
 from pathlib import Path
 
@@ -18,12 +32,26 @@ if str(backend_dir) not in sys.path:
 
 # Importa config - tenta múltiplas estratégias para garantir compatibilidade
 EXCEL_FILE = None
+QUOTES_STORE_ENGINE = None
+QUOTES_SQLITE_FILE = None
+QUOTES_JOURNAL_ENABLED = None
+QUOTES_JOURNAL_MAX_BYTES = None
+QUOTES_JOURNAL_COMPACT_INTERVAL = None
+EXCEL_IO_WORKERS = None
 
 try:
-    from ..core.config import EXCEL_FILE
+    from ..core.config import (
+        EXCEL_FILE, QUOTES_STORE_ENGINE, QUOTES_SQLITE_FILE,
+        QUOTES_JOURNAL_ENABLED, QUOTES_JOURNAL_MAX_BYTES, QUOTES_JOURNAL_COMPACT_INTERVAL,
+        EXCEL_IO_WORKERS
+    )
 except (ImportError, ModuleNotFoundError):
     try:
-        from api.v1.core.config import EXCEL_FILE
+        from api.v1.core.config import (
+            EXCEL_FILE, QUOTES_STORE_ENGINE, QUOTES_SQLITE_FILE,
+            QUOTES_JOURNAL_ENABLED, QUOTES_JOURNAL_MAX_BYTES, QUOTES_JOURNAL_COMPACT_INTERVAL,
+            EXCEL_IO_WORKERS
+        )
     except (ImportError, ModuleNotFoundError):
         # Fallback: import direto do arquivo usando importlib
         try:
@@ -47,6 +75,12 @@ except (ImportError, ModuleNotFoundError):
                         config_module = importlib.util.module_from_spec(spec)
                         spec.loader.exec_module(config_module)
                         EXCEL_FILE = getattr(config_module, "EXCEL_FILE", None)
+                        QUOTES_STORE_ENGINE = getattr(config_module, "QUOTES_STORE_ENGINE", None)
+                        QUOTES_SQLITE_FILE = getattr(config_module, "QUOTES_SQLITE_FILE", None)
+                        QUOTES_JOURNAL_ENABLED = getattr(config_module, "QUOTES_JOURNAL_ENABLED", None)
+                        QUOTES_JOURNAL_MAX_BYTES = getattr(config_module, "QUOTES_JOURNAL_MAX_BYTES", None)
+                        QUOTES_JOURNAL_COMPACT_INTERVAL = getattr(config_module, "QUOTES_JOURNAL_COMPACT_INTERVAL", None)
+                        EXCEL_IO_WORKERS = getattr(config_module, "EXCEL_IO_WORKERS", None)
                 except Exception:
                     pass  # Se falhar, usa valor padrão abaixo
         except Exception:
@@ -55,93 +89,964 @@ except (ImportError, ModuleNotFoundError):
 # Se ainda não tiver valor, usa valor padrão
 if not EXCEL_FILE:
     EXCEL_FILE = os.getenv("EXCEL_FILE", "quotes_data.xlsx")
+if not QUOTES_STORE_ENGINE:
+    QUOTES_STORE_ENGINE = os.getenv("QUOTES_STORE_ENGINE", "xlsx")
+if not QUOTES_SQLITE_FILE:
+    QUOTES_SQLITE_FILE = os.getenv("QUOTES_SQLITE_FILE", "quotes_data.sqlite3")
+if QUOTES_JOURNAL_ENABLED is None:
+    QUOTES_JOURNAL_ENABLED = os.getenv("QUOTES_JOURNAL_ENABLED", "true").lower() == "true"
+if not QUOTES_JOURNAL_MAX_BYTES:
+    QUOTES_JOURNAL_MAX_BYTES = int(os.getenv("QUOTES_JOURNAL_MAX_BYTES", str(1024 * 1024)))
+if not QUOTES_JOURNAL_COMPACT_INTERVAL:
+    QUOTES_JOURNAL_COMPACT_INTERVAL = float(os.getenv("QUOTES_JOURNAL_COMPACT_INTERVAL", "60"))
+if not EXCEL_IO_WORKERS:
+    EXCEL_IO_WORKERS = int(os.getenv("EXCEL_IO_WORKERS", "4"))
+
+# Colunas de cada aba do arquivo de orçamentos
+SHEET_COLUMNS = {
+    'clients': ['id', 'name', 'created_at', 'updated_at'],
+    'services': ['id', 'name', 'unit_price', 'unit', 'created_at', 'updated_at'],
+    'quotes': [
+        'id', 'quote_number', 'client_id', 'title', 'description',
+        'status', 'total', 'created_at', 'updated_at'
+    ],
+    'quote_items': [
+        'id', 'quote_id', 'service_id', 'quantity', 'unit_price',
+        'total_price', 'service_name', 'service_unit', 'created_at'
+    ],
+    # Contadores persistidos: último id de cada aba e último número ORCyyyymm de cada mês
+    'sequences': ['name', 'value'],
+}
+
+# Colunas aceitas como ordenação na paginação por cursor
+SORTABLE_COLUMNS = {
+    'clients': ('id', 'name', 'created_at', 'updated_at'),
+    'services': ('id', 'name', 'unit_price', 'created_at', 'updated_at'),
+    'quotes': ('id', 'quote_number', 'status', 'total', 'created_at', 'updated_at'),
+}
+
+# Maior página aceita pelas rotas de listagem
+MAX_PAGE_SIZE = 1000
+
+# Colunas da exportação de orçamentos: uma linha por item (orçamento sem itens: uma linha)
+EXPORT_COLUMNS = [
+    'quote_id', 'quote_number', 'client_id', 'client_name', 'title', 'description',
+    'status', 'total', 'created_at', 'updated_at', 'item_id', 'service_id',
+    'service_name', 'service_unit', 'quantity', 'unit_price', 'total_price'
+]
+
+def _sort_keys(series: pd.Series) -> np.ndarray:
+    """Valores de uma coluna prontos para ordenação (texto vazio no lugar de nulos)"""
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return series.to_numpy()
+    return series.fillna('').astype(str).to_numpy()
+
+def _encode_cursor(sort: str, order: str, key: Any, row_id: Any) -> str:
+    """Cursor opaco com a chave de ordenação e o id da última linha da página"""
+    payload = json.dumps([sort, order, key.item() if hasattr(key, 'item') else key, int(row_id)])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+def _decode_cursor(cursor: str, sort: str, order: str) -> Tuple[Any, int]:
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        cursor_sort, cursor_order, key, row_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError):
+        raise ValueError("Cursor inválido")
+    if (cursor_sort, cursor_order) != (sort, order):
+        raise ValueError("Cursor gerado com outra ordenação")
+    return key, int(row_id)
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    """Data no formato gravado nas abas (ISO, sem fuso)"""
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone().replace(tzinfo=None)
+    return value.isoformat()
+
+def _pydatetimes(series: pd.Series) -> List[datetime]:
+    """Coluna de datas ISO convertida de uma vez em datetimes do Python.
+    
+    fromisoformat sobre a lista da coluna sai mais barato que pd.to_datetime,
+    que ainda teria de converter cada Timestamp de volta para datetime.
+    """
+    return list(map(datetime.fromisoformat, series.tolist()))
+
+def _construct_all(model, columns: Dict[str, list]) -> list:
+    """Instancia um modelo por linha a partir de colunas já convertidas, sem validação.
+    
+    Equivale a `model.model_construct(**linha)` para linhas confiáveis (gravadas
+    pelo próprio serviço), mas sem o laço por campo do model_construct, que
+    domina o custo em abas grandes. Modelos com atributos privados ou colunas
+    que não cobrem todos os campos usam o model_construct normal.
+    """
+    names = tuple(model.model_fields)
+    if set(columns) != set(names) or model.__private_attributes__:
+        return [model.model_construct(**dict(zip(columns, row))) for row in zip(*columns.values())]
+    # Todos os campos estão definidos, então atribuições futuras não alteram o conjunto
+    fields_set = set(names)
+    new, set_attr = model.__new__, object.__setattr__
+    instances = []
+    for row in zip(*(columns[name] for name in names)):
+        instance = new(model)
+        set_attr(instance, '__dict__', dict(zip(names, row)))
+        set_attr(instance, '__pydantic_fields_set__', fields_set)
+        set_attr(instance, '__pydantic_extra__', None)
+        set_attr(instance, '__pydantic_private__', None)
+        instances.append(instance)
+    return instances
+
+def _serialized(method):
+    """Executa o método na thread de escrita do serviço (ver ExcelService._mutate)"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        return self._mutate(method, self, *args, **kwargs)
+    return wrapper
 
 class ExcelService:
-    def __init__(self):
-        self.file_path = EXCEL_FILE
+    def __init__(self, file_path: Optional[str] = None, engine: Optional[str] = None, journal: Optional[bool] = None):
+        # O motor de armazenamento vem da configuração (QUOTES_STORE_ENGINE);
+        # o nome "ExcelService" é mantido por compatibilidade com as rotas
+        engine = engine or QUOTES_STORE_ENGINE
+        default_path = EXCEL_FILE if engine == XlsxStorageEngine.name else QUOTES_SQLITE_FILE
+        self.file_path = file_path or default_path
+        self.storage: StorageEngine = create_storage_engine(engine, self.file_path)
+        # Journal append-only ao lado do arquivo: as transações viram linhas JSON
+        # e o .xlsx só é reescrito na compactação. O SQLite já grava appends de
+        # forma incremental, então por padrão o journal só é usado com o .xlsx
+        if journal is None:
+            journal = QUOTES_JOURNAL_ENABLED and self.storage.name == XlsxStorageEngine.name
+        self.journal: Optional[WriteAheadJournal] = (
+            WriteAheadJournal(f"{self.file_path}.journal") if journal else None
+        )
+        self.compactor: Optional[JournalCompactor] = (
+            JournalCompactor(self, QUOTES_JOURNAL_MAX_BYTES, QUOTES_JOURNAL_COMPACT_INTERVAL) if journal else None
+        )
+        # Snapshot em memória das abas já lidas (com o journal aplicado), válido
+        # enquanto o arquivo e o journal mantiverem os mesmos carimbos
+        self._sheets: Dict[str, pd.DataFrame] = {}
+        # Abas do snapshot lidas só com as colunas conhecidas (SHEET_COLUMNS);
+        # antes de uma gravação elas são relidas por inteiro
+        self._projected: Set[str] = set()
+        self._file_stamp: Optional[Tuple[Any, Any]] = None
+        # Transações do journal ainda não incorporadas ao arquivo (None = não lido)
+        self._journal_txs: Optional[List[Tuple[int, List[dict]]]] = None
+        self._journal_offset = 0
+        self._journal_base_seq = 0
+        # Estruturas derivadas do snapshot (índices por id, joins) e as abas de que dependem
+        self._derived_cache: Dict[str, Tuple[frozenset, Any]] = {}
+        # Unidade de trabalho: operações da transação corrente e os valores originais das abas.
+        # O RLock serializa as threads do processo e o lock em arquivo, os workers
+        self._lock = threading.RLock()
+        self._file_lock = InterProcessLock(f"{self.file_path}.lock")
+        self._compact_lock = threading.Lock()
+        self._tx_depth = 0
+        self._tx_owner: Optional[int] = None
+        self._tx_ops: List[dict] = []
+        self._tx_backup: Dict[str, Optional[pd.DataFrame]] = {}
+        self._tx_appended_from: Dict[str, Optional[int]] = {}
+        # Thread única que executa as mutações (create/update/delete), em ordem de chegada
+        self._writer: Optional[ThreadPoolExecutor] = None
+        self._writer_ident: Optional[int] = None
         self._ensure_file_exists()
     
     def _ensure_file_exists(self):
-        """Cria o arquivo Excel se não existir"""
-        if not os.path.exists(self.file_path):
-            with pd.ExcelWriter(self.file_path, engine='openpyxl') as writer:
-                # Aba de Clientes
-                clients_df = pd.DataFrame(columns=[
-                    'id', 'name', 'created_at', 'updated_at'
-                ])
-                clients_df.to_excel(writer, sheet_name='clients', index=False)
-                
-                # Aba de Serviços
-                services_df = pd.DataFrame(columns=[
-                    'id', 'name', 'unit_price', 'unit', 'created_at', 'updated_at'
-                ])
-                services_df.to_excel(writer, sheet_name='services', index=False)
-                
-                # Aba de Orçamentos
-                quotes_df = pd.DataFrame(columns=[
-                    'id', 'quote_number', 'client_id', 'title', 'description', 
-                    'status', 'total', 'created_at', 'updated_at'
-                ])
-                quotes_df.to_excel(writer, sheet_name='quotes', index=False)
-                
-                # Aba de Itens dos Orçamentos
-                quote_items_df = pd.DataFrame(columns=[
-                    'id', 'quote_id', 'service_id', 'quantity', 'unit_price', 
-                    'total_price', 'service_name', 'service_unit', 'created_at'
-                ])
-                quote_items_df.to_excel(writer, sheet_name='quote_items', index=False)
+        """Cria o arquivo da base (com as abas vazias) se não existir"""
+        if not self.storage.exists():
+            self.storage.write_sheets({
+                sheet_name: pd.DataFrame(columns=columns)
+                for sheet_name, columns in SHEET_COLUMNS.items()
+            })
+    
+    def _current_stamp(self) -> Tuple[Any, Any]:
+        """Carimbo da versão em disco: (arquivo, journal)"""
+        return (self.storage.stamp(), self.journal.stamp() if self.journal else None)
+    
+    def _sync_cache(self):
+        """Descarta o snapshot se o arquivo foi alterado fora deste serviço.
+        
+        Se só o journal cresceu, apenas as transações novas são aplicadas.
+        """
+        if self._tx_depth:
+            # Dentro de uma transação a visão do snapshot fica congelada
+            return
+        with self._lock:
+            stamp = self._current_stamp()
+            if stamp == self._file_stamp:
+                return
+            if self._file_stamp is not None and stamp[0] == self._file_stamp[0] \
+                    and self._replay_journal_tail(self._file_stamp[1], stamp[1]):
+                self._file_stamp = stamp
+                return
+            self._reset_snapshot()
+            self._file_stamp = stamp
+    
+    def _reset_snapshot(self):
+        self._sheets.clear()
+        self._projected.clear()
+        self._derived_cache.clear()
+        self._journal_txs = None
+        self._journal_offset = 0
+        self._journal_base_seq = 0
+    
+    def invalidate_cache(self):
+        """Força a releitura do arquivo na próxima consulta"""
+        with self._lock:
+            self._reset_snapshot()
+            self._file_stamp = None
+    
+    # JOURNAL
+    def _load_journal(self, control: Optional[pd.DataFrame] = None):
+        """Lê o journal inteiro, ignorando transações já incorporadas ao arquivo.
+        
+        `control` é a aba de controle já lida junto com outras abas; sem ela,
+        a aba é lida do armazenamento.
+        """
+        if self._journal_txs is not None:
+            return
+        if self.journal is None:
+            self._journal_txs = []
+            return
+        if control is None and JOURNAL_SHEET in self.storage.sheet_names():
+            control = self.storage.read_sheet(JOURNAL_SHEET)
+        base_seq = 0
+        if control is not None and not control.empty:
+            base_seq = int(control['last_seq'].max())
+        transactions, offset = self.journal.read(0)
+        self._journal_base_seq = base_seq
+        self._journal_txs = [(seq, ops) for seq, ops in transactions if seq > base_seq]
+        self._journal_offset = offset
+    
+    def _replay_journal_tail(self, old_stamp, new_stamp) -> bool:
+        """Aplica ao snapshot as transações acrescentadas ao journal por outro processo.
+        
+        Retorna False se o journal foi substituído (compactação) e o snapshot
+        precisa ser relido por inteiro.
+        """
+        if self._journal_txs is None:
+            # Nada lido ainda: o journal será lido junto com a primeira aba
+            return True
+        if new_stamp is None or (old_stamp is not None and (
+                new_stamp[0] != old_stamp[0] or new_stamp[2] < self._journal_offset)):
+            return False
+        transactions, self._journal_offset = self.journal.read(self._journal_offset)
+        last_seq = self._last_seq()
+        for seq, ops in transactions:
+            if seq <= last_seq:
+                continue
+            for op in ops:
+                df = self._sheets.get(op['sheet'])
+                if df is not None:
+                    self._sheets[op['sheet']], appended_from = apply_operation(df, op)
+                    self._refresh_derived(op['sheet'], appended_from, op, df)
+            self._journal_txs.append((seq, ops))
+        return True
+    
+    def _last_seq(self) -> int:
+        """Número de sequência da última transação conhecida"""
+        return self._journal_txs[-1][0] if self._journal_txs else self._journal_base_seq
+    
+    def compact(self) -> bool:
+        """Incorpora o journal ao arquivo e descarta as transações incorporadas.
+
+        O arquivo novo (lento de gerar no .xlsx) é preparado fora dos locks e
+        só a troca de arquivos e a reescrita do journal acontecem sob eles,
+        então leituras e gravações não ficam bloqueadas. A aba de controle
+        registra a última sequência incorporada: se a compactação for
+        interrompida depois de trocar o arquivo, o journal não é reaplicado.
+        Retorna True se o journal foi compactado.
+        """
+        if self.journal is None:
+            return False
+        with self._compact_lock:
+            with self._lock:
+                self._sync_cache()
+                self._load_journal()
+                if not self._journal_txs:
+                    return False
+                last_seq = self._last_seq()
+                sheet_names = {op['sheet'] for _, ops in self._journal_txs for op in ops}
+                frames = self._snapshot(*sheet_names, full=True)
+                frames[JOURNAL_SHEET] = pd.DataFrame({'last_seq': [last_seq]})
+                storage_stamp = self._file_stamp[0]
+
+            staged = self.storage.stage_sheets(frames)
+            try:
+                with self.transaction():
+                    if self._file_stamp[0] != storage_stamp:
+                        # Outro processo compactou enquanto o arquivo era preparado
+                        self.storage.discard(staged)
+                        return False
+                    self.storage.publish(staged)
+                    self._load_journal()
+                    remaining = [(seq, ops) for seq, ops in self._journal_txs if seq > last_seq]
+                    self.journal.rewrite(remaining)
+                    self._journal_txs = remaining
+                    self._journal_base_seq = last_seq
+                    self._journal_offset = self.journal.size()
+                    self._file_stamp = self._current_stamp()
+                    self._save_sketches()
+            except BaseException:
+                self.storage.discard(staged)
+                raise
+        return True
+
+    def journal_stats(self) -> Dict[str, Any]:
+        """Tamanho do journal e estado da compactação"""
+        if self.journal is None:
+            return {'enabled': False}
+        with self._lock:
+            self._sync_cache()
+            self._load_journal()
+            return {
+                'enabled': True,
+                'path': self.journal.path,
+                'bytes': self.journal.size(),
+                'pending_transactions': len(self._journal_txs),
+                'last_seq': self._last_seq(),
+                'compacted_seq': self._journal_base_seq,
+                'compactor': self.compactor.stats(),
+            }
+    
+    def _derived(
+        self,
+        key: str,
+        sheets: Tuple[str, ...],
+        builder: Callable[[], Any],
+        on_append: Optional[Callable[[Any, pd.DataFrame, int], None]] = None,
+        on_change: Optional[Callable[[Any, str, dict, pd.DataFrame], bool]] = None
+    ) -> Any:
+        """Retorna uma estrutura derivada do snapshot, construída uma única vez.
+        
+        A estrutura é descartada quando alguma das abas de origem muda, exceto
+        quando a mudança é um append e há um `on_append` para estendê-la in-place,
+        ou quando há um `on_change(valor, aba, operação, aba_anterior)` que
+        aplica a operação e retorna True.
+        """
+        with self._lock:
+            self._sync_cache()
+            entry = self._derived_cache.get(key)
+            if entry is None:
+                entry = (frozenset(sheets), builder(), on_append, on_change)
+                self._derived_cache[key] = entry
+            return entry[1]
+    
+    def _refresh_derived(
+        self,
+        sheet_name: str,
+        appended_from: Optional[int] = None,
+        op: Optional[dict] = None,
+        before: Optional[pd.DataFrame] = None
+    ):
+        """Atualiza (appends ou a operação `op`) ou descarta as estruturas derivadas de uma aba"""
+        df = self._sheets.get(sheet_name)
+        for key, (deps, value, on_append, on_change) in list(self._derived_cache.items()):
+            if sheet_name not in deps:
+                continue
+            if op is not None and on_change is not None:
+                if not on_change(value, sheet_name, op, before):
+                    del self._derived_cache[key]
+            elif appended_from is not None and on_append is not None and deps == {sheet_name}:
+                on_append(value, df, appended_from)
+            else:
+                del self._derived_cache[key]
+    
+    def _read_sheet(self, sheet_name: str, full: bool = False) -> pd.DataFrame:
+        """Lê uma aba específica do Excel (servida do snapshot em memória).
+        
+        Na primeira leitura, as transações pendentes do journal são aplicadas
+        sobre a aba do arquivo. O DataFrame retornado é compartilhado com o
+        cache: quem precisar alterá-lo in-place deve trabalhar sobre uma cópia.
+        Com `full`, colunas fora de SHEET_COLUMNS também são carregadas.
+        """
+        return self._snapshot(sheet_name, full=full)[sheet_name]
+    
+    def _snapshot(self, *sheet_names: str, full: bool = False) -> Dict[str, pd.DataFrame]:
+        """Retorna várias abas da mesma versão do snapshot.
+        
+        As abas que ainda não estão em memória (e a aba de controle do
+        journal, se preciso) são lidas numa única passada pelo arquivo, então
+        uma leitura a frio custa um parse só. Fora de `full`, as abas
+        conhecidas são lidas apenas com as colunas de SHEET_COLUMNS; só as
+        que tinham colunas extras no arquivo são relidas inteiras na primeira
+        gravação.
+        """
+        with self._lock:
+            while True:
+                self._sync_cache()
+                if self._load_sheets(sheet_names, full):
+                    return {sheet_name: self._sheets[sheet_name] for sheet_name in sheet_names}
+    
+    def _load_sheets(self, sheet_names: Tuple[str, ...], full: bool) -> bool:
+        """Carrega no snapshot as abas que faltam; False se o arquivo mudou durante a leitura"""
+        missing = [
+            sheet_name for sheet_name in dict.fromkeys(sheet_names)
+            if sheet_name not in self._sheets or (full and sheet_name in self._projected)
+        ]
+        if not missing:
+            return True
+        if full:
+            # Um parse completo do arquivo já vai acontecer: completa de uma vez
+            # as outras abas projetadas, que a mesma transação costuma gravar
+            missing += [sheet_name for sheet_name in sorted(self._projected) if sheet_name not in missing]
+        read_control = self._journal_txs is None and self.journal is not None
+        to_read = missing + [JOURNAL_SHEET] if read_control else missing
+        columns = None
+        if not full and all(sheet_name in SHEET_COLUMNS for sheet_name in missing):
+            columns = {column for sheet_name in missing for column in SHEET_COLUMNS[sheet_name]}
+            columns.add('last_seq')
+        frames = self.storage.read_sheets(to_read, columns)
+        if not self._tx_depth and self.storage.stamp() != self._file_stamp[0]:
+            # O arquivo foi trocado durante a leitura (compactação de outro processo)
+            return False
+        self._load_journal(frames.get(JOURNAL_SHEET, pd.DataFrame()) if read_control else None)
+        for sheet_name in missing:
+            df = frames.get(sheet_name)
+            if df is None:
+                if sheet_name not in SHEET_COLUMNS:
+                    raise ValueError(f"Worksheet named '{sheet_name}' not found")
+                # Aba que arquivos antigos ainda não têm (ex.: sequences): começa vazia
+                df = pd.DataFrame(columns=SHEET_COLUMNS[sheet_name])
+            dropped = df.attrs.get('dropped_columns')
+            for _, ops in self._journal_txs:
+                for op in ops:
+                    if op['sheet'] == sheet_name:
+                        df, _ = apply_operation(df, op)
+            self._sheets[sheet_name] = df
+            # Só fica marcada como projetada a aba que de fato tinha colunas extras no arquivo
+            if columns is not None and dropped:
+                self._projected.add(sheet_name)
+            else:
+                self._projected.discard(sheet_name)
+        return True
     
-    def _read_sheet(self, sheet_name: str) -> pd.DataFrame:
-        """Lê uma aba específica do Excel"""
-        return pd.read_excel(self.file_path, sheet_name=sheet_name)
+    @contextmanager
+    def transaction(self):
+        """Agrupa alterações em várias abas numa única escrita.
+        
+        As operações feitas dentro do bloco ficam só em memória e são gravadas
+        de uma vez ao final: como uma linha do journal ou, sem journal, numa
+        escrita atômica do arquivo. Se o bloco falhar, nada é gravado e o
+        snapshot volta ao estado anterior. Transações aninhadas são
+        incorporadas à mais externa.
+
+        A transação mais externa segura o lock em arquivo (exclusão entre
+        processos) e começa relendo o que outros processos gravaram, então
+        ids e números de orçamento calculados dentro dela são únicos. O lock
+        em arquivo é pego antes do lock do serviço: enquanto outro processo
+        grava, as leituras deste continuam sendo servidas do snapshot.
+        """
+        # Só a própria thread grava seu ident em _tx_owner, então a leitura sem lock é segura
+        outermost = self._tx_owner != threading.get_ident()
+        if outermost:
+            self._file_lock.acquire()
+        try:
+            with self._lock:
+                if outermost:
+                    self._sync_cache()
+                    self._tx_owner = threading.get_ident()
+                self._tx_depth += 1
+                try:
+                    yield self
+                except BaseException:
+                    if self._tx_depth == 1:
+                        self._rollback()
+                    raise
+                else:
+                    if self._tx_depth == 1:
+                        self._commit()
+                finally:
+                    self._tx_depth -= 1
+                    if outermost:
+                        self._tx_owner = None
+        finally:
+            if outermost:
+                self._file_lock.release()
+    
+    def _commit(self):
+        """Grava as operações pendentes da transação numa única escrita"""
+        if not self._tx_ops:
+            return
+        journal_size = None
+        try:
+            if self.journal is not None:
+                self._load_journal()
+                seq = self._last_seq() + 1
+                ops = [serialize_operation(op) for op in self._tx_ops]
+                journal_size = self.journal.append(seq, ops)
+                self._journal_txs.append((seq, ops))
+                self._journal_offset = journal_size
+            else:
+                appended_from = {
+                    sheet_name: start for sheet_name, start in self._tx_appended_from.items() if start is not None
+                }
+                pending = {sheet_name: self._sheets[sheet_name] for sheet_name in self._tx_backup}
+                self._write_sheets(pending, appended_from)
+        except BaseException:
+            self._rollback()
+            raise
+        self._tx_ops = []
+        self._tx_backup = {}
+        self._tx_appended_from = {}
+        self._file_stamp = self._current_stamp()
+        if journal_size is not None:
+            self.compactor.notify(journal_size)
+    
+    def _rollback(self):
+        """Descarta as alterações pendentes e restaura o snapshot"""
+        for sheet_name, original in self._tx_backup.items():
+            if original is None:
+                self._sheets.pop(sheet_name, None)
+            else:
+                self._sheets[sheet_name] = original
+            self._refresh_derived(sheet_name)
+        self._tx_ops = []
+        self._tx_backup = {}
+        self._tx_appended_from = {}
+    
+    def _mutate(self, fn: Callable, *args, **kwargs):
+        """Executa uma mutação na thread de escrita e aguarda o resultado.
+
+        Uma única thread por processo faz as gravações, em ordem de chegada;
+        as leituras continuam sendo servidas do snapshot pelas threads das
+        requisições. Quem já está dentro de uma transaction() (ou na própria
+        thread de escrita) executa direto, para não esperar por si mesmo.
+        """
+        if threading.get_ident() in (self._tx_owner, self._writer_ident):
+            return fn(*args, **kwargs)
+        if self._writer is None:
+            with self._lock:
+                if self._writer is None:
+                    self._writer = ThreadPoolExecutor(
+                        max_workers=1, thread_name_prefix='excel-writer', initializer=self._register_writer
+                    )
+        return self._writer.submit(fn, *args, **kwargs).result()
+
+    def _register_writer(self):
+        self._writer_ident = threading.get_ident()
+
+    def _write_sheets(self, sheets: Dict[str, pd.DataFrame], appended_from: Optional[Dict[str, int]] = None):
+        """Grava as abas no motor de armazenamento, de forma atômica"""
+        self.storage.write_sheets(sheets, appended_from)
+    
+    def _apply(self, op: dict) -> pd.DataFrame:
+        """Aplica uma operação (insert, update, delete ou replace) a uma aba.
+        
+        Fora de uma transação a gravação é imediata; dentro dela, a operação
+        fica pendente até o commit. Appends estendem os índices existentes
+        em vez de refazê-los.
+        """
+        with self.transaction():
+            sheet_name = op['sheet']
+            # A aba é gravada inteira: as colunas extras do arquivo precisam estar no snapshot
+            df = self._read_sheet(sheet_name, full=True)
+            new_df, appended_from = apply_operation(df, op)
+            if sheet_name not in self._tx_backup:
+                self._tx_backup[sheet_name] = df
+                self._tx_appended_from[sheet_name] = appended_from
+            elif appended_from is None:
+                # A aba foi reescrita: não dá mais para gravar só as linhas novas
+                self._tx_appended_from[sheet_name] = None
+            self._sheets[sheet_name] = new_df
+            self._tx_ops.append(op)
+            self._refresh_derived(sheet_name, appended_from, op, df)
+            return new_df
     
     def _save_sheet(self, df: pd.DataFrame, sheet_name: str):
-        """Salva dados em uma aba específica do Excel"""
-        with pd.ExcelWriter(self.file_path, engine='openpyxl', mode='a', if_sheet_exists='replace') as writer:
-            df.to_excel(writer, sheet_name=sheet_name, index=False)
-    
-    def _get_next_id(self, sheet_name: str) -> int:
-        """Gera próximo ID para uma aba"""
-        df = self._read_sheet(sheet_name)
-        return df['id'].max() + 1 if not df.empty else 1
-    
-    def _generate_quote_number(self) -> str:
-        """Gera número do orçamento"""
-        year = datetime.now().year
-        month = datetime.now().month
-        quotes_df = self._read_sheet('quotes')
-        count = len(quotes_df[quotes_df['quote_number'].str.startswith(f"ORC{year}{month:02d}")])
-        return f"ORC{year}{month:02d}{count + 1:03d}"
+        """Substitui uma aba inteira"""
+        self._apply({'op': 'replace', 'sheet': sheet_name, 'frame': df})
+    
+    def _append_rows(self, sheet_name: str, rows: List[dict]) -> pd.DataFrame:
+        """Acrescenta linhas ao final de uma aba e salva"""
+        return self._apply({'op': 'insert', 'sheet': sheet_name, 'rows': rows})
+    
+    def _update_row(self, sheet_name: str, row_id: int, values: Dict[str, Any]) -> pd.DataFrame:
+        """Altera campos da linha com o id informado"""
+        return self._apply({'op': 'update', 'sheet': sheet_name, 'id': row_id, 'values': values})
+    
+    def _upsert_row(self, sheet_name: str, key: str, row: Dict[str, Any]) -> pd.DataFrame:
+        """Atualiza a linha em que `key` tem o valor de `row[key]`, ou a acrescenta"""
+        return self._apply({'op': 'upsert', 'sheet': sheet_name, 'key': key, 'row': row})
+
+    def _delete_rows(self, sheet_name: str, column: str, value: Any) -> pd.DataFrame:
+        """Remove as linhas em que a coluna tem o valor informado"""
+        return self._apply({'op': 'delete', 'sheet': sheet_name, 'column': column, 'value': value})
+    
+    # ÍNDICES POR CHAVE PRIMÁRIA
+    def _positions_by_id(self, sheet_name: str) -> Dict[int, int]:
+        """Índice id -> posição da linha na aba (primeira ocorrência de cada id)"""
+        def build():
+            positions: Dict[int, int] = {}
+            for pos, row_id in enumerate(self._read_sheet(sheet_name)['id'].tolist()):
+                positions.setdefault(int(row_id), pos)
+            return positions
+        
+        def on_append(positions, df, start):
+            for pos, row_id in enumerate(df['id'].iloc[start:].tolist(), start=start):
+                positions.setdefault(int(row_id), pos)
+        
+        return self._derived(f'positions:{sheet_name}', (sheet_name,), build, on_append)
+    
+    def _row_by_id(self, sheet_name: str, row_id: int) -> Optional[dict]:
+        """Retorna a linha de uma aba pelo id, em tempo constante"""
+        pos = self._positions_by_id(sheet_name).get(int(row_id))
+        if pos is None:
+            return None
+        return self._read_sheet(sheet_name).iloc[pos].to_dict()
+    
+    def _item_positions_by_quote(self) -> Dict[int, List[int]]:
+        """Índice quote_id -> posições dos itens na aba quote_items"""
+        def build():
+            positions: Dict[int, List[int]] = {}
+            for pos, quote_id in enumerate(self._read_sheet('quote_items')['quote_id'].tolist()):
+                positions.setdefault(int(quote_id), []).append(pos)
+            return positions
+        
+        def on_append(positions, df, start):
+            for pos, quote_id in enumerate(df['quote_id'].iloc[start:].tolist(), start=start):
+                positions.setdefault(int(quote_id), []).append(pos)
+        
+        return self._derived('item_positions_by_quote', ('quote_items',), build, on_append)
+    
+    def _service_row(self, service_id: int) -> dict:
+        """Linha do serviço referenciado por um item de orçamento"""
+        service_row = self._row_by_id('services', service_id)
+        if service_row is None:
+            raise ValueError(f"Serviço {service_id} não encontrado")
+        return service_row
+    
+    # SEQUÊNCIAS (IDS E NÚMEROS DE ORÇAMENTO)
+    def _counters(self) -> Dict[str, int]:
+        """Valores atuais dos contadores da aba sequences"""
+        def build():
+            return {
+                str(row['name']): int(row['value'])
+                for row in self._read_sheet('sequences').to_dict('records')
+            }
+        return self._derived('counters', ('sequences',), build)
+
+    def _max_id(self, sheet_name: str) -> int:
+        """Maior id da aba (0 se vazia), estendido em appends sem reler a aba"""
+        def build():
+            ids = self._read_sheet(sheet_name)['id']
+            return {'max': int(ids.max()) if len(ids.dropna()) else 0}
+
+        def on_append(entry, df, start):
+            new_ids = df['id'].iloc[start:].dropna()
+            if len(new_ids):
+                entry['max'] = max(entry['max'], int(new_ids.max()))
+
+        return self._derived(f'max_id:{sheet_name}', (sheet_name,), build, on_append)['max']
+
+    def _set_counter(self, name: str, value: int):
+        self._upsert_row('sequences', 'name', {'name': name, 'value': int(value)})
+
+    def _get_next_id(self, sheet_name: str, count: int = 1) -> int:
+        """Reserva `count` ids consecutivos para uma aba e retorna o primeiro.
+
+        O contador persistido só avança, então ids de linhas excluídas não são
+        reutilizados; o maior id da aba serve de piso para arquivos antigos
+        sem contador ou linhas gravadas por fora do serviço. Roda sob a
+        transação (lock entre processos), então ids não se repetem entre workers.
+        """
+        with self.transaction():
+            first = max(self._counters().get(sheet_name, 0), self._max_id(sheet_name)) + 1
+            self._set_counter(sheet_name, first + count - 1)
+            return first
+
+    def _generate_quote_number(self, now: Optional[datetime] = None) -> str:
+        """Gera número do orçamento (ORCyyyymmNNN), com sequência própria por mês"""
+        return self._reserve_quote_numbers(1, now)[0]
+
+    def _reserve_quote_numbers(self, count: int, now: Optional[datetime] = None) -> List[str]:
+        """Reserva `count` números de orçamento consecutivos do mês de `now`"""
+        now = now or datetime.now()
+        prefix = f"ORC{now.year}{now.month:02d}"
+        with self.transaction():
+            last = self._counters().get(prefix)
+            if last is None:
+                # Primeiro número do mês neste contador: parte do maior já gravado
+                numbers = self._read_sheet('quotes')['quote_number'].dropna().astype(str)
+                suffixes = pd.to_numeric(numbers[numbers.str.startswith(prefix)].str[len(prefix):], errors='coerce')
+                last = int(suffixes.max()) if suffixes.notna().any() else 0
+            self._set_counter(prefix, last + count)
+            return [f"{prefix}{seq:03d}" for seq in range(last + 1, last + count + 1)]
+
+    # AGREGADOS PARA ANALYTICS
+    def _quote_aggregates(self) -> QuoteAggregates:
+        """Agregados de orçamentos e itens, atualizados a cada gravação"""
+        def build():
+            return QuoteAggregates.from_frames(self._read_sheet('quotes'), self._read_sheet('quote_items'))
+
+        def on_change(aggregates, sheet_name, op, before):
+            return aggregates.apply(sheet_name, op, before)
+        return self._derived('quote_aggregates', ('quotes', 'quote_items'), build, on_change=on_change)
+
+    def rebuild_aggregates(self) -> QuoteAggregates:
+        """Descarta e refaz os agregados a partir das abas (ex.: após edição manual do arquivo)"""
+        with self._lock:
+            self._derived_cache.pop('quote_aggregates', None)
+            return self._quote_aggregates()
+
+    def get_analytics_overview(
+        self,
+        now: Optional[datetime] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        granularity: str = 'month'
+    ) -> Dict[str, Any]:
+        """Visão geral para /analytics/overview, sem percorrer orçamentos e itens"""
+        with self._lock:
+            sheets = self._snapshot('quotes', 'quote_items', 'services', 'clients')
+            return self._quote_aggregates().overview(
+                self._services_by_id(), len(sheets['services']), len(sheets['clients']), now,
+                start, end, granularity
+            )
+
+    def get_services_analytics(self) -> Dict[str, Any]:
+        """Analytics de preço e uso por serviço (/analytics/services)"""
+        with self._lock:
+            sheets = self._snapshot('services', 'quotes', 'quote_items')
+            quantiles = self._quote_sketches().price_quantiles((0.5, 0.9))
+        # As abas do snapshot não são alteradas in-place: o cálculo dispensa o lock
+        return services_analytics(sheets['services'], sheets['quotes'], sheets['quote_items'], quantiles)
+
+    def get_clients_analytics(self) -> Dict[str, Any]:
+        """Analytics de gasto por cliente (/analytics/clients)"""
+        with self._lock:
+            sheets = self._snapshot('clients', 'quotes')
+            unique_clients = self._quote_sketches().unique_clients()
+        return clients_analytics(sheets['clients'], sheets['quotes'], unique_clients)
+
+    # SKETCHES (PERCENTIS DE PREÇO E CLIENTES ÚNICOS)
+    def _sketches_path(self) -> str:
+        return f"{self.file_path}.sketches.json"
+
+    def _quote_sketches(self) -> QuoteSketches:
+        """Sketches de preços por serviço e de clientes por mês, alimentados a cada gravação.
+
+        Com o journal, partem do arquivo lateral gravado na última compactação
+        e recebem só as transações posteriores a ele; sem arquivo lateral
+        válido, ou se alguma dessas transações alterou ou excluiu orçamentos
+        ou itens, são montados a partir das abas.
+        """
+        def build():
+            sheets = self._snapshot('quotes', 'quote_items')
+            sketches = None
+            if self.journal is not None:
+                self._load_journal()
+                sketches = QuoteSketches.load(self._sketches_path())
+                if sketches is not None and not self._journal_base_seq <= sketches.seq <= self._last_seq():
+                    # Arquivo lateral de outra versão da base
+                    sketches = None
+            if sketches is not None:
+                ops = [op for seq, tx_ops in self._journal_txs if seq > sketches.seq for op in tx_ops]
+                if not all(sketches.apply(op['sheet'], op) for op in ops + self._tx_ops):
+                    sketches = None
+            if sketches is None:
+                sketches = QuoteSketches.from_frames(sheets['quotes'], sheets['quote_items'])
+            sketches.seq = self._last_seq()
+            return sketches
+
+        def on_change(sketches, sheet_name, op, before):
+            return sketches.apply(sheet_name, op)
+        return self._derived('quote_sketches', ('quotes', 'quote_items'), build, on_change=on_change)
+
+    def _save_sketches(self):
+        """Grava os sketches no arquivo lateral (chamado na compactação, dentro da transação)"""
+        sketches = self._quote_sketches()
+        sketches.seq = self._last_seq()
+        try:
+            sketches.save(self._sketches_path())
+        except OSError:
+            # O arquivo lateral é só um atalho: sem ele, os sketches são refeitos das abas
+            pass
+
+    def export_xlsx(self, dest_path: str) -> Dict[str, int]:
+        """Exporta a base inteira (todas as abas, com o journal aplicado) para um arquivo .xlsx"""
+        with self._lock:
+            sheets = self._snapshot(
+                *(sheet_name for sheet_name in self.storage.sheet_names() if sheet_name != JOURNAL_SHEET), full=True
+            )
+        XlsxStorageEngine(dest_path).write_sheets(sheets)
+        return {sheet_name: len(df) for sheet_name, df in sheets.items()}
+
+    # PAGINAÇÃO POR CURSOR
+    def _order_index(self, sheet_name: str, sort: str) -> Dict[str, np.ndarray]:
+        """Posições da aba ordenadas por (coluna, id), com as chaves já ordenadas"""
+        def build():
+            df = self._read_sheet(sheet_name)
+            keys = _sort_keys(df[sort])
+            ids = df['id'].to_numpy()
+            order = np.lexsort((ids, keys))
+            return {'positions': order, 'keys': keys[order], 'ids': ids[order]}
+        
+        def on_append(index, df, start):
+            new = df.iloc[start:]
+            keys = _sort_keys(new[sort])
+            ids = new['id'].to_numpy()
+            order = np.lexsort((ids, keys))
+            if len(index['keys']) and (keys[order[0]], ids[order[0]]) < (index['keys'][-1], index['ids'][-1]):
+                # As linhas novas não vão para o final da ordenação: refaz o índice
+                index.update(build())
+                return
+            index['positions'] = np.concatenate([index['positions'], order + start])
+            index['keys'] = np.concatenate([index['keys'], keys[order]])
+            index['ids'] = np.concatenate([index['ids'], ids[order]])
+        
+        return self._derived(f'order:{sheet_name}:{sort}', (sheet_name,), build, on_append)
+    
+    def _page(
+        self,
+        sheet_name: str,
+        limit: Optional[int],
+        cursor: Optional[str],
+        sort: str,
+        order: str,
+        where: Optional[Callable[[np.ndarray], np.ndarray]] = None,
+        key_range: Tuple[Any, Any] = (None, None)
+    ) -> Tuple[np.ndarray, Optional[str]]:
+        """Seleciona as posições de uma página pela ordem (coluna, id).
+        
+        O cursor é a chave da última linha entregue: a página começa por uma
+        busca binária no índice ordenado e percorre só o necessário para
+        preencher `limit` linhas que passem no filtro `where` (que recebe um
+        lote de posições e retorna a máscara). `key_range` limita a busca
+        quando o filtro é um intervalo sobre a própria coluna ordenada.
+        """
+        if sort not in SORTABLE_COLUMNS[sheet_name]:
+            raise ValueError(f"Ordenação inválida: {sort!r} (opções: {', '.join(SORTABLE_COLUMNS[sheet_name])})")
+        if order not in ('asc', 'desc'):
+            raise ValueError(f"Direção inválida: {order!r} (opções: asc, desc)")
+        
+        with self._lock:
+            index = self._order_index(sheet_name, sort)
+            keys, ids = index['keys'], index['ids']
+            
+            low, high = 0, len(keys)
+            if key_range[0] is not None:
+                low = int(np.searchsorted(keys, key_range[0], 'left'))
+            if key_range[1] is not None:
+                high = int(np.searchsorted(keys, key_range[1], 'right'))
+            if cursor:
+                key, row_id = _decode_cursor(cursor, sort, order)
+                try:
+                    first = int(np.searchsorted(keys, key, 'left'))
+                    last = int(np.searchsorted(keys, key, 'right'))
+                except TypeError:
+                    raise ValueError("Cursor inválido")
+                if order == 'asc':
+                    low = max(low, first + int(np.searchsorted(ids[first:last], row_id, 'right')))
+                else:
+                    high = min(high, first + int(np.searchsorted(ids[first:last], row_id, 'left')))
+            
+            ranks = np.arange(low, high) if order == 'asc' else np.arange(high - 1, low - 1, -1)
+            if limit is None:
+                if where is not None:
+                    ranks = ranks[where(index['positions'][ranks])]
+                return index['positions'][ranks], None
+            
+            # Percorre em lotes: com filtros seletivos, lê só o suficiente para a página
+            selected: List[np.ndarray] = []
+            found = 0
+            batch = max(limit * 4, 256)
+            for start in range(0, len(ranks), batch):
+                chunk = ranks[start:start + batch]
+                if where is not None:
+                    chunk = chunk[where(index['positions'][chunk])]
+                selected.append(chunk)
+                found += len(chunk)
+                if found > limit:
+                    break
+            ranks = np.concatenate(selected) if selected else ranks[:0]
+            next_cursor = None
+            if len(ranks) > limit:
+                ranks = ranks[:limit]
+                next_cursor = _encode_cursor(sort, order, keys[ranks[-1]], ids[ranks[-1]])
+            return index['positions'][ranks], next_cursor
+    
+    def _column_keys(self, sheet_name: str, column: str) -> np.ndarray:
+        """Coluna da aba como array (no formato de _sort_keys), para filtros vetorizados"""
+        def build():
+            return {'values': _sort_keys(self._read_sheet(sheet_name)[column])}
+        
+        def on_append(entry, df, start):
+            entry['values'] = np.concatenate([entry['values'], _sort_keys(df[column].iloc[start:])])
+        
+        return self._derived(f'column:{sheet_name}:{column}', (sheet_name,), build, on_append)['values']
+    
+    def _where(
+        self,
+        sheet_name: str,
+        equals: Optional[Dict[str, Any]] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None
+    ) -> Optional[Callable[[np.ndarray], np.ndarray]]:
+        """Monta o filtro da página: igualdade por coluna e intervalo de created_at.
+        
+        Datas são comparadas como texto ISO, o formato gravado nas abas.
+        """
+        equals = {column: value for column, value in (equals or {}).items() if value is not None}
+        low, high = _iso(created_from), _iso(created_to)
+        if not equals and low is None and high is None:
+            return None
+        
+        def where(positions):
+            mask = np.ones(len(positions), dtype=bool)
+            for column, value in equals.items():
+                mask &= self._column_keys(sheet_name, column)[positions] == value
+            if low is not None or high is not None:
+                created = self._column_keys(sheet_name, 'created_at')[positions]
+                if low is not None:
+                    mask &= created >= low
+                if high is not None:
+                    mask &= created <= high
+            return mask
+        return where
+    
+    def _created_range(self, sort: str, created_from: Optional[datetime], created_to: Optional[datetime]):
+        """Com ordenação por created_at, o intervalo de datas vira busca binária no índice"""
+        if sort != 'created_at':
+            return (None, None)
+        return (_iso(created_from), _iso(created_to))
 
     # MÉTODOS PARA CLIENTES
     def get_all_clients(self) -> List[Client]:
         """Retorna todos os clientes"""
-        df = self._read_sheet('clients')
-        clients = []
-        for _, row in df.iterrows():
-            clients.append(Client(
-                id=int(row['id']),
-                name=row['name'],
-                created_at=datetime.fromisoformat(row['created_at']),
-                updated_at=datetime.fromisoformat(row['updated_at'])
-            ))
-        return clients
+        return self._clients_from_frame(self._read_sheet('clients'))
 
+    def list_clients(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        sort: str = 'id',
+        order: str = 'asc'
+    ) -> Tuple[List[Client], Optional[str]]:
+        """Retorna uma página de clientes e o cursor da próxima (None na última)"""
+        with self._lock:
+            positions, next_cursor = self._page(
+                'clients', limit, cursor, sort, order,
+                where=self._where('clients', created_from=created_from, created_to=created_to),
+                key_range=self._created_range(sort, created_from, created_to)
+            )
+            return self._clients_from_frame(self._read_sheet('clients').iloc[positions]), next_cursor
+
+    @_serialized
     def create_client(self, client: ClientCreate) -> Client:
         """Cria novo cliente"""
-        df = self._read_sheet('clients')
-        new_id = self._get_next_id('clients')
-        now = datetime.now().isoformat()
-        
-        new_row = pd.DataFrame([{
-            'id': new_id,
-            'name': client.name,
-            'created_at': now,
-            'updated_at': now
-        }])
-        
-        df = pd.concat([df, new_row], ignore_index=True)
-        self._save_sheet(df, 'clients')
+        # O id é calculado e gravado sob o mesmo lock
+        with self.transaction():
+            new_id = self._get_next_id('clients')
+            now = datetime.now().isoformat()
+            
+            self._append_rows('clients', [{
+                'id': new_id,
+                'name': client.name,
+                'created_at': now,
+                'updated_at': now
+            }])
         
         return Client(
             id=new_id,
@@ -150,39 +1055,63 @@ class ExcelService:
             updated_at=datetime.fromisoformat(now)
         )
 
+    @_serialized
+    def create_clients(self, clients: List[ClientCreate]) -> List[Client]:
+        """Cria vários clientes numa única gravação, com um bloco de ids"""
+        if not clients:
+            return []
+        with self.transaction():
+            first_id = self._get_next_id('clients', len(clients))
+            now = datetime.now().isoformat()
+            rows = [{
+                'id': first_id + offset,
+                'name': client.name,
+                'created_at': now,
+                'updated_at': now
+            } for offset, client in enumerate(clients)]
+            self._append_rows('clients', rows)
+        
+        return [self._client_from_row(row) for row in rows]
+
     # MÉTODOS PARA SERVIÇOS
     def get_all_services(self) -> List[Service]:
         """Retorna todos os serviços"""
-        df = self._read_sheet('services')
-        services = []
-        for _, row in df.iterrows():
-            services.append(Service(
-                id=int(row['id']),
-                name=row['name'],
-                unit_price=float(row['unit_price']),
-                unit=row['unit'],
-                created_at=datetime.fromisoformat(row['created_at']),
-                updated_at=datetime.fromisoformat(row['updated_at'])
-            ))
-        return services
+        return self._services_from_frame(self._read_sheet('services'))
+
+    def list_services(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        sort: str = 'id',
+        order: str = 'asc'
+    ) -> Tuple[List[Service], Optional[str]]:
+        """Retorna uma página de serviços e o cursor da próxima (None na última)"""
+        with self._lock:
+            positions, next_cursor = self._page(
+                'services', limit, cursor, sort, order,
+                where=self._where('services', created_from=created_from, created_to=created_to),
+                key_range=self._created_range(sort, created_from, created_to)
+            )
+            return self._services_from_frame(self._read_sheet('services').iloc[positions]), next_cursor
 
+    @_serialized
     def create_service(self, service: ServiceCreate) -> Service:
         """Cria novo serviço"""
-        df = self._read_sheet('services')
-        new_id = self._get_next_id('services')
-        now = datetime.now().isoformat()
-        
-        new_row = pd.DataFrame([{
-            'id': new_id,
-            'name': service.name,
-            'unit_price': service.unit_price,
-            'unit': service.unit,
-            'created_at': now,
-            'updated_at': now
-        }])
-        
-        df = pd.concat([df, new_row], ignore_index=True)
-        self._save_sheet(df, 'services')
+        # O id é calculado e gravado sob o mesmo lock
+        with self.transaction():
+            new_id = self._get_next_id('services')
+            now = datetime.now().isoformat()
+            
+            self._append_rows('services', [{
+                'id': new_id,
+                'name': service.name,
+                'unit_price': service.unit_price,
+                'unit': service.unit,
+                'created_at': now,
+                'updated_at': now
+            }])
         
         return Service(
             id=new_id,
@@ -193,157 +1122,434 @@ class ExcelService:
             updated_at=datetime.fromisoformat(now)
         )
 
+    @_serialized
+    def create_services(self, services: List[ServiceCreate]) -> List[Service]:
+        """Cria vários serviços numa única gravação, com um bloco de ids"""
+        if not services:
+            return []
+        with self.transaction():
+            first_id = self._get_next_id('services', len(services))
+            now = datetime.now().isoformat()
+            rows = [{
+                'id': first_id + offset,
+                'name': service.name,
+                'unit_price': service.unit_price,
+                'unit': service.unit,
+                'created_at': now,
+                'updated_at': now
+            } for offset, service in enumerate(services)]
+            self._append_rows('services', rows)
+        
+        return [self._service_from_row(row) for row in rows]
+
+    # MONTAGEM DE MODELOS
+    def _client_from_row(self, row: dict) -> Client:
+        """Monta um Client a partir de uma linha da aba de clientes"""
+        return Client(
+            id=int(row['id']),
+            name=row['name'],
+            created_at=datetime.fromisoformat(row['created_at']),
+            updated_at=datetime.fromisoformat(row['updated_at'])
+        )
+
+    def _service_from_row(self, row: dict) -> Service:
+        """Monta um Service a partir de uma linha da aba de serviços"""
+        return Service(
+            id=int(row['id']),
+            name=row['name'],
+            unit_price=float(row['unit_price']),
+            unit=row['unit'],
+            created_at=datetime.fromisoformat(row['created_at']),
+            updated_at=datetime.fromisoformat(row['updated_at'])
+        )
+
+    def _clients_from_frame(self, df: pd.DataFrame) -> List[Client]:
+        """Monta Clients coluna a coluna, sem revalidar linhas que o serviço já gravou validadas"""
+        return _construct_all(Client, {
+            'id': df['id'].astype('int64').tolist(),
+            'name': df['name'].tolist(),
+            'created_at': _pydatetimes(df['created_at']),
+            'updated_at': _pydatetimes(df['updated_at']),
+        })
+
+    def _services_from_frame(self, df: pd.DataFrame) -> List[Service]:
+        """Monta Services coluna a coluna, sem revalidar linhas que o serviço já gravou validadas"""
+        return _construct_all(Service, {
+            'id': df['id'].astype('int64').tolist(),
+            'name': df['name'].tolist(),
+            'unit_price': df['unit_price'].astype(float).tolist(),
+            'unit': df['unit'].tolist(),
+            'created_at': _pydatetimes(df['created_at']),
+            'updated_at': _pydatetimes(df['updated_at']),
+        })
+
+    def _item_from_row(self, row: dict, service_row: dict) -> QuoteItem:
+        """Monta um QuoteItem com nome e unidade vindos do serviço"""
+        return QuoteItem(
+            id=int(row['id']),
+            service_id=int(row['service_id']),
+            quantity=float(row['quantity']),
+            unit_price=float(row['unit_price']),
+            total_price=float(row['total_price']),
+            service_name=service_row['name'],
+            service_unit=service_row['unit']
+        )
+
+    def _quote_from_row(self, row: dict, client: Client, items: List[QuoteItem]) -> Quote:
+        """Monta um Quote a partir de uma linha da aba de orçamentos"""
+        return Quote(
+            id=int(row['id']),
+            quote_number=row['quote_number'],
+            client_id=int(row['client_id']),
+            title=row['title'],
+            description=row['description'] if pd.notna(row['description']) else None,
+            status=row['status'],
+            total=float(row['total']),
+            created_at=datetime.fromisoformat(row['created_at']),
+            updated_at=datetime.fromisoformat(row['updated_at']),
+            client=client,
+            items=items
+        )
+
+    # ÍNDICES PARA JOIN
+    def _clients_by_id(self) -> Dict[int, Client]:
+        """Clientes indexados por id (primeira ocorrência de cada id)"""
+        def build():
+            clients = self._clients_from_frame(self._read_sheet('clients').drop_duplicates('id'))
+            return {client.id: client for client in clients}
+        return self._derived('clients_by_id', ('clients',), build)
+
+    def _services_by_id(self) -> Dict[int, dict]:
+        """Linhas de serviços indexadas por id (primeira ocorrência de cada id)"""
+        def build():
+            df = self._read_sheet('services').drop_duplicates('id')
+            return {int(row['id']): row for row in df.to_dict('records')}
+        return self._derived('services_by_id', ('services',), build)
+
+    def _items_by_quote(self) -> Dict[int, List[QuoteItem]]:
+        """Itens agrupados por orçamento, já com nome e unidade do serviço"""
+        def build():
+            services = self._services_by_id()
+            grouped: Dict[int, List[QuoteItem]] = {}
+            for row in self._read_sheet('quote_items').to_dict('records'):
+                item = self._item_from_row(row, services[int(row['service_id'])])
+                grouped.setdefault(int(row['quote_id']), []).append(item)
+            return grouped
+        return self._derived('items_by_quote', ('quote_items', 'services'), build)
+
     # MÉTODOS PARA ORÇAMENTOS
     def get_all_quotes(self) -> List[Quote]:
-        """Retorna todos os orçamentos"""
-        quotes_df = self._read_sheet('quotes')
-        clients_df = self._read_sheet('clients')
-        quote_items_df = self._read_sheet('quote_items')
-        services_df = self._read_sheet('services')
+        """Retorna todos os orçamentos.
         
-        quotes = []
-        for _, quote_row in quotes_df.iterrows():
-            # Busca cliente
-            client_row = clients_df[clients_df['id'] == quote_row['client_id']].iloc[0]
-            client = Client(
-                id=int(client_row['id']),
-                name=client_row['name'],
-                created_at=datetime.fromisoformat(client_row['created_at']),
-                updated_at=datetime.fromisoformat(client_row['updated_at'])
+        Clientes, serviços e itens são indexados por id uma vez por snapshot,
+        então a montagem é uma única passada sobre os orçamentos. As quatro
+        abas vêm da mesma versão do arquivo (lidas juntas numa leitura a frio).
+        """
+        with self._lock:
+            quotes = self._snapshot('quotes', 'clients', 'services', 'quote_items')['quotes']
+            clients = self._clients_by_id()
+            items_by_quote = self._items_by_quote()
+        return [
+            self._quote_from_row(row, clients[int(row['client_id'])], items_by_quote.get(int(row['id']), []))
+            for row in quotes.to_dict('records')
+        ]
+
+    def list_quotes(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        status: Optional[str] = None,
+        client_id: Optional[int] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        sort: str = 'id',
+        order: str = 'asc'
+    ) -> Tuple[List[Quote], Optional[str]]:
+        """Retorna uma página de orçamentos e o cursor da próxima (None na última).
+        
+        Só os orçamentos da página são montados, com cliente e itens buscados
+        pelos índices por chave primária; sem `limit`, usa o join completo.
+        """
+        with self._lock:
+            self._snapshot('quotes', 'clients', 'services', 'quote_items')
+            positions, next_cursor = self._page(
+                'quotes', limit, cursor, sort, order,
+                where=self._where(
+                    'quotes', {'status': status, 'client_id': client_id}, created_from, created_to
+                ),
+                key_range=self._created_range(sort, created_from, created_to)
             )
-            
-            # Busca itens do orçamento
-            items = []
-            quote_items = quote_items_df[quote_items_df['quote_id'] == quote_row['id']]
-            for _, item_row in quote_items.iterrows():
-                service_row = services_df[services_df['id'] == item_row['service_id']].iloc[0]
-                items.append(QuoteItem(
-                    id=int(item_row['id']),
-                    service_id=int(item_row['service_id']),
-                    quantity=float(item_row['quantity']),
-                    unit_price=float(item_row['unit_price']),
-                    total_price=float(item_row['total_price']),
-                    service_name=service_row['name'],
-                    service_unit=service_row['unit']
-                ))
-            
-            quotes.append(Quote(
-                id=int(quote_row['id']),
-                quote_number=quote_row['quote_number'],
-                client_id=int(quote_row['client_id']),
-                title=quote_row['title'],
-                description=quote_row['description'] if pd.notna(quote_row['description']) else None,
-                status=quote_row['status'],
-                total=float(quote_row['total']),
-                created_at=datetime.fromisoformat(quote_row['created_at']),
-                updated_at=datetime.fromisoformat(quote_row['updated_at']),
-                client=client,
-                items=items
-            ))
+            rows = self._read_sheet('quotes').iloc[positions].to_dict('records')
+            if limit is None:
+                clients = self._clients_by_id()
+                items_by_quote = self._items_by_quote()
+                quotes = [
+                    self._quote_from_row(row, clients[int(row['client_id'])], items_by_quote.get(int(row['id']), []))
+                    for row in rows
+                ]
+            else:
+                quotes = self._quotes_with_relations(rows)
+            return quotes, next_cursor
+
+    def iter_quote_export(
+        self,
+        chunk_size: int = MAX_PAGE_SIZE,
+        status: Optional[str] = None,
+        client_id: Optional[int] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None
+    ) -> Iterator[List[list]]:
+        """Percorre os orçamentos com seus itens em blocos de linhas planas (EXPORT_COLUMNS).
         
-        return quotes
+        Cada bloco é uma página por cursor de `chunk_size` orçamentos montada
+        direto das abas, sem criar modelos: a memória usada não depende do
+        tamanho da base, e o lock é liberado entre um bloco e outro.
+        """
+        where = self._where('quotes', {'status': status, 'client_id': client_id}, created_from, created_to)
+        cursor = None
+        while True:
+            with self._lock:
+                self._snapshot('quotes', 'clients', 'services', 'quote_items')
+                positions, cursor = self._page('quotes', chunk_size, cursor, 'id', 'asc', where=where)
+                quotes = self._read_sheet('quotes').iloc[positions][[
+                    'id', 'quote_number', 'client_id', 'title', 'description',
+                    'status', 'total', 'created_at', 'updated_at'
+                ]].to_numpy(dtype=object).tolist()
+                client_positions = self._positions_by_id('clients')
+                service_positions = self._positions_by_id('services')
+                item_positions = self._item_positions_by_quote()
+                client_names = self._read_sheet('clients')['name'].tolist()
+                services = self._read_sheet('services')[['name', 'unit']].to_numpy(dtype=object).tolist()
+                # Itens do bloco inteiro numa única seleção, na ordem dos orçamentos
+                quote_item_positions = [item_positions.get(int(quote[0]), []) for quote in quotes]
+                items = iter(self._read_sheet('quote_items').iloc[
+                    [pos for group in quote_item_positions for pos in group]
+                ][[
+                    'id', 'service_id', 'service_name', 'service_unit', 'quantity', 'unit_price', 'total_price'
+                ]].to_numpy(dtype=object).tolist())
+                
+                rows = []
+                for (quote_id, number, client_id, title, description, status, total, created_at, updated_at), group \
+                        in zip(quotes, quote_item_positions):
+                    pos = client_positions.get(int(client_id))
+                    head = [
+                        int(quote_id), number, int(client_id), client_names[pos] if pos is not None else None,
+                        title, None if pd.isna(description) else description,
+                        status, float(total), created_at, updated_at
+                    ]
+                    if not group:
+                        rows.append(head + [None] * 7)
+                    for item_id, service_id, service_name, service_unit, quantity, unit_price, total_price \
+                            in (next(items) for _ in group):
+                        # Nome e unidade vêm do serviço, como nos itens retornados pela API
+                        service_pos = service_positions.get(int(service_id))
+                        if service_pos is not None:
+                            service_name, service_unit = services[service_pos]
+                        rows.append(head + [
+                            int(item_id), int(service_id), service_name, service_unit,
+                            float(quantity), float(unit_price), float(total_price)
+                        ])
+            if rows:
+                yield rows
+            if cursor is None:
+                return
 
+    @_serialized
     def create_quote(self, quote: QuoteCreate) -> Quote:
         """Cria novo orçamento"""
-        quotes_df = self._read_sheet('quotes')
-        quote_items_df = self._read_sheet('quote_items')
-        
-        new_id = self._get_next_id('quotes')
-        quote_number = self._generate_quote_number()
-        now = datetime.now().isoformat()
-        
-        # Calcula total
-        total = sum(item.quantity * item.unit_price for item in quote.items)
-        
-        # Cria orçamento
-        new_quote_row = pd.DataFrame([{
-            'id': new_id,
-            'quote_number': quote_number,
-            'client_id': quote.client_id,
-            'title': quote.title,
-            'description': quote.description,
-            'status': quote.status,
-            'total': total,
-            'created_at': now,
-            'updated_at': now
-        }])
-        
-        quotes_df = pd.concat([quotes_df, new_quote_row], ignore_index=True)
-        self._save_sheet(quotes_df, 'quotes')
-        
-        # Cria itens do orçamento
-        if quote.items:
-            new_items = []
-            for item in quote.items:
-                item_id = self._get_next_id('quote_items')
-                item_total = item.quantity * item.unit_price
-                
-                # Busca dados do serviço
-                services_df = self._read_sheet('services')
-                service_row = services_df[services_df['id'] == item.service_id].iloc[0]
-                
-                new_items.append({
-                    'id': item_id,
-                    'quote_id': new_id,
-                    'service_id': item.service_id,
-                    'quantity': item.quantity,
-                    'unit_price': item.unit_price,
-                    'total_price': item_total,
-                    'service_name': service_row['name'],
-                    'service_unit': service_row['unit'],
-                    'created_at': now
-                })
+        # Orçamento e itens são gravados juntos, numa única escrita
+        with self.transaction():
+            new_id = self._get_next_id('quotes')
+            quote_number = self._generate_quote_number()
+            now = datetime.now().isoformat()
+            
+            # Calcula total
+            total = sum(item.quantity * item.unit_price for item in quote.items)
+            
+            # Cria orçamento
+            self._append_rows('quotes', [{
+                'id': new_id,
+                'quote_number': quote_number,
+                'client_id': quote.client_id,
+                'title': quote.title,
+                'description': quote.description,
+                'status': quote.status,
+                'total': total,
+                'created_at': now,
+                'updated_at': now
+            }])
+            
+            # Cria itens do orçamento
+            if quote.items:
+                first_item_id = self._get_next_id('quote_items', len(quote.items))
+                new_items = []
+                for offset, item in enumerate(quote.items):
+                    item_total = item.quantity * item.unit_price
+            
+                    # Busca dados do serviço
+                    service_row = self._service_row(item.service_id)
             
-            quote_items_df = pd.concat([quote_items_df, pd.DataFrame(new_items)], ignore_index=True)
-            self._save_sheet(quote_items_df, 'quote_items')
+                    new_items.append({
+                        'id': first_item_id + offset,
+                        'quote_id': new_id,
+                        'service_id': item.service_id,
+                        'quantity': item.quantity,
+                        'unit_price': item.unit_price,
+                        'total_price': item_total,
+                        'service_name': service_row['name'],
+                        'service_unit': service_row['unit'],
+                        'created_at': now
+                    })
+            
+                self._append_rows('quote_items', new_items)
         
         # Retorna orçamento criado
         return self.get_quote_by_id(new_id)
 
+    @_serialized
+    def create_quotes(self, quotes: List[QuoteCreate]) -> Tuple[List[Quote], List[Tuple[int, str]]]:
+        """Cria vários orçamentos numa única gravação.
+        
+        Orçamentos com cliente ou serviço inexistente são recusados e voltam
+        como (posição na lista, motivo); os demais recebem um bloco de ids,
+        de números e de ids de itens, e orçamentos e itens são gravados juntos.
+        """
+        with self.transaction():
+            client_positions = self._positions_by_id('clients')
+            service_positions = self._positions_by_id('services')
+            accepted, rejected = [], []
+            for index, quote in enumerate(quotes):
+                missing = [item.service_id for item in quote.items if item.service_id not in service_positions]
+                if quote.client_id not in client_positions:
+                    rejected.append((index, f"Cliente {quote.client_id} não encontrado"))
+                elif missing:
+                    rejected.append((index, f"Serviço {missing[0]} não encontrado"))
+                else:
+                    accepted.append(quote)
+            if not accepted:
+                return [], rejected
+            
+            first_id = self._get_next_id('quotes', len(accepted))
+            quote_numbers = self._reserve_quote_numbers(len(accepted))
+            item_count = sum(len(quote.items) for quote in accepted)
+            next_item_id = self._get_next_id('quote_items', item_count) if item_count else None
+            now = datetime.now().isoformat()
+            
+            quote_rows, item_rows = [], []
+            for offset, quote in enumerate(accepted):
+                quote_id = first_id + offset
+                for item in quote.items:
+                    service_row = self._service_row(item.service_id)
+                    item_rows.append({
+                        'id': next_item_id,
+                        'quote_id': quote_id,
+                        'service_id': item.service_id,
+                        'quantity': item.quantity,
+                        'unit_price': item.unit_price,
+                        'total_price': item.quantity * item.unit_price,
+                        'service_name': service_row['name'],
+                        'service_unit': service_row['unit'],
+                        'created_at': now
+                    })
+                    next_item_id += 1
+                quote_rows.append({
+                    'id': quote_id,
+                    'quote_number': quote_numbers[offset],
+                    'client_id': quote.client_id,
+                    'title': quote.title,
+                    'description': quote.description,
+                    'status': quote.status,
+                    'total': sum(item.quantity * item.unit_price for item in quote.items),
+                    'created_at': now,
+                    'updated_at': now
+                })
+            
+            self._append_rows('quotes', quote_rows)
+            if item_rows:
+                self._append_rows('quote_items', item_rows)
+            created = self._quotes_with_relations(quote_rows)
+        
+        return created, rejected
+
     def get_quote_by_id(self, quote_id: int) -> Optional[Quote]:
-        """Retorna orçamento por ID"""
-        quotes = self.get_all_quotes()
-        for quote in quotes:
-            if quote.id == quote_id:
-                return quote
-        return None
+        """Retorna orçamento por ID.
+        
+        Usa os índices por chave primária: só a linha do orçamento, a do
+        cliente e as dos seus itens são lidas, em tempo constante.
+        """
+        row = self._row_by_id('quotes', quote_id)
+        if row is None:
+            return None
+        return self._quotes_with_relations([row])[0]
+
+    def _quotes_with_relations(self, rows: List[dict]) -> List[Quote]:
+        """Monta orçamentos buscando clientes, itens e serviços pelos índices por chave primária.
+        
+        Cada aba relacionada é lida uma vez para o lote inteiro, então o custo
+        depende só do número de orçamentos pedidos.
+        """
+        with self._lock:
+            client_positions = self._positions_by_id('clients')
+            positions = []
+            for row in rows:
+                pos = client_positions.get(int(row['client_id']))
+                if pos is None:
+                    raise ValueError(f"Cliente {row['client_id']} não encontrado")
+                positions.append(pos)
+            client_rows = self._read_sheet('clients').iloc[positions].to_dict('records')
+            
+            item_positions = self._item_positions_by_quote()
+            positions_by_quote = [item_positions.get(int(row['id']), []) for row in rows]
+            item_rows = self._read_sheet('quote_items').iloc[
+                [pos for positions in positions_by_quote for pos in positions]
+            ].to_dict('records')
+            service_rows = {
+                service_id: self._service_row(service_id)
+                for service_id in {int(item_row['service_id']) for item_row in item_rows}
+            }
+        
+        quotes = []
+        items = iter(item_rows)
+        for row, client_row, positions in zip(rows, client_rows, positions_by_quote):
+            quote_items = [next(items) for _ in positions]
+            quotes.append(self._quote_from_row(
+                row,
+                self._client_from_row(client_row),
+                [self._item_from_row(item_row, service_rows[int(item_row['service_id'])]) for item_row in quote_items]
+            ))
+        return quotes
 
+    @_serialized
     def update_quote(self, quote_id: int, quote_update: QuoteUpdate) -> Optional[Quote]:
         """Atualiza um orçamento existente"""
         try:
-            # Lê dados atuais
-            quotes_df = self._read_sheet('quotes')
-            quote_items_df = self._read_sheet('quote_items')
-            
-            # Verifica se o orçamento existe
-            quote_idx = quotes_df[quotes_df['id'] == quote_id].index
-            if quote_idx.empty:
-                return None
-            
-            # Atualiza campos do orçamento
-            update_data = quote_update.model_dump(exclude_unset=True)
-            for field, value in update_data.items():
-                if field != 'items':  # items é tratado separadamente
-                    quotes_df.loc[quote_idx[0], field] = value
-            
-            # Atualiza itens se fornecidos
-            if hasattr(quote_update, 'items') and quote_update.items is not None:
-                # Remove itens antigos
-                quote_items_df = quote_items_df[quote_items_df['quote_id'] != quote_id]
+            # Campos e itens do orçamento são gravados juntos, numa única escrita
+            with self.transaction():
+                # Verifica se o orçamento existe (dentro da transação: uma exclusão
+                # concorrente não pode acontecer entre a verificação e a gravação)
+                if int(quote_id) not in self._positions_by_id('quotes'):
+                    return None
                 
-                # Adiciona novos itens
-                if quote_update.items:
+                # Campos do orçamento (items é tratado separadamente)
+                update_data = quote_update.model_dump(exclude_unset=True)
+                values = {field: value for field, value in update_data.items() if field != 'items'}
+                
+                # Atualiza itens se fornecidos
+                if hasattr(quote_update, 'items') and quote_update.items is not None:
+                    # Remove itens antigos
+                    self._delete_rows('quote_items', 'quote_id', quote_id)
+                    
+                    # Adiciona novos itens
                     new_items = []
-                    for item in quote_update.items:
-                        item_id = self._get_next_id('quote_items')
+                    first_item_id = self._get_next_id('quote_items', len(quote_update.items)) if quote_update.items else None
+                    for offset, item in enumerate(quote_update.items):
                         item_total = item.quantity * item.unit_price
                         
                         # Busca dados do serviço
-                        services_df = self._read_sheet('services')
-                        service_row = services_df[services_df['id'] == item.service_id].iloc[0]
+                        service_row = self._service_row(item.service_id)
                         
                         new_items.append({
-                            'id': item_id,
+                            'id': first_item_id + offset,
                             'quote_id': quote_id,
                             'service_id': item.service_id,
                             'quantity': item.quantity,
@@ -353,20 +1559,17 @@ class ExcelService:
                             'service_unit': service_row['unit'],
                             'created_at': datetime.now().isoformat()
                         })
+                    if new_items:
+                        self._append_rows('quote_items', new_items)
                     
-                    quote_items_df = pd.concat([quote_items_df, pd.DataFrame(new_items)], ignore_index=True)
-                    self._save_sheet(quote_items_df, 'quote_items')
+                    # Recalcula total
+                    values['total'] = sum(item['total_price'] for item in new_items)
                 
-                # Recalcula total
-                items = quote_items_df[quote_items_df['quote_id'] == quote_id]
-                total = items['total_price'].sum() if not items.empty else 0
-                quotes_df.loc[quote_idx[0], 'total'] = total
-            
-            # Atualiza timestamp
-            quotes_df.loc[quote_idx[0], 'updated_at'] = datetime.now().isoformat()
-            
-            # Salva alterações
-            self._save_sheet(quotes_df, 'quotes')
+                # Atualiza timestamp
+                values['updated_at'] = datetime.now().isoformat()
+                
+                # Salva alterações
+                self._update_row('quotes', quote_id, values)
             
             # Retorna orçamento atualizado
             return self.get_quote_by_id(quote_id)
@@ -375,24 +1578,18 @@ class ExcelService:
             print(f"Erro ao atualizar orçamento: {e}")
             return None
 
+    @_serialized
     def delete_quote(self, quote_id: int) -> bool:
         """Exclui um orçamento"""
         try:
-            # Lê dados atuais
-            quotes_df = self._read_sheet('quotes')
-            quote_items_df = self._read_sheet('quote_items')
-            
-            # Verifica se o orçamento existe
-            if quote_id not in quotes_df['id'].values:
-                return False
-            
-            # Remove orçamento e seus itens
-            quotes_df = quotes_df[quotes_df['id'] != quote_id]
-            quote_items_df = quote_items_df[quote_items_df['quote_id'] != quote_id]
-            
-            # Salva alterações
-            self._save_sheet(quotes_df, 'quotes')
-            self._save_sheet(quote_items_df, 'quote_items')
+            # Orçamento e itens são removidos numa única escrita
+            with self.transaction():
+                # Verifica se o orçamento existe (dentro da transação, como em update_quote)
+                if int(quote_id) not in self._positions_by_id('quotes'):
+                    return False
+                
+                self._delete_rows('quotes', 'id', quote_id)
+                self._delete_rows('quote_items', 'quote_id', quote_id)
             
             return True
             
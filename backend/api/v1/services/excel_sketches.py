@@ -0,0 +1,245 @@
+"""
+Sketches de quantis e de cardinalidade para os analytics da base legada
+
+KLLSketch guarda um resumo de tamanho limitado de uma sequência de números e
+responde quantis (p50, p90) com erro de rank de cerca de 1/k. HyperLogLog
+conta valores distintos (clientes únicos) com ~1,6% de erro em 4 KB. Os dois
+aceitam merge (somar o resumo de outro worker ou de outro trecho da base) e
+são serializáveis em JSON, para persistirem junto com o arquivo da base.
+
+QuoteSketches reúne um KLL de preços praticados por serviço e um HyperLogLog
+de clientes por mês, alimentados pelas inserções do ExcelService. Sketches só
+acumulam e não sabem remover um valor: apply() recusa alterações e exclusões
+de orçamentos ou itens, e o ExcelService então refaz os sketches a partir das
+abas (from_frames).
+"""
+import base64
+import bisect
+import hashlib
+import itertools
+import json
+import math
+import os
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+import pandas as pd
+
+
+class KLLSketch:
+    """Sketch de quantis KLL (Karnin, Lang e Liberty) com compactação determinística"""
+
+    def __init__(self, k: int = 200, c: float = 2 / 3):
+        self.k = k
+        self.c = c
+        self.n = 0
+        self.compactors: List[List[float]] = [[]]
+        # Alterna a metade mantida em cada compactação, no lugar da moeda aleatória
+        self._flip = False
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.compactors) - level - 1
+        return int(math.ceil(self.k * self.c ** depth)) + 1
+
+    def _size(self) -> int:
+        return sum(len(compactor) for compactor in self.compactors)
+
+    def _max_size(self) -> int:
+        return sum(self._capacity(level) for level in range(len(self.compactors)))
+
+    def _compress(self):
+        while self._size() >= self._max_size():
+            for level, compactor in enumerate(self.compactors):
+                if len(compactor) < self._capacity(level):
+                    continue
+                if level + 1 == len(self.compactors):
+                    self.compactors.append([])
+                compactor.sort()
+                # Número ímpar de itens: o último fica no nível para a próxima compactação
+                keep = compactor[-1:] if len(compactor) % 2 else []
+                pairs = compactor[:len(compactor) - len(keep)]
+                self._flip = not self._flip
+                self.compactors[level + 1].extend(pairs[int(self._flip)::2])
+                self.compactors[level] = keep
+                break
+
+    def update(self, value: float):
+        self.update_many([value])
+
+    def update_many(self, values: Iterable[float]):
+        """Acrescenta vários valores (NaN e None são ignorados)"""
+        added = [float(value) for value in values if value is not None and not math.isnan(float(value))]
+        self.compactors[0].extend(added)
+        self.n += len(added)
+        self._compress()
+
+    def merge(self, other: 'KLLSketch'):
+        """Incorpora o resumo de outro sketch (o resultado resume as duas sequências)"""
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append([])
+        for level, compactor in enumerate(other.compactors):
+            self.compactors[level].extend(compactor)
+        self.n += other.n
+        self._compress()
+
+    def quantiles(self, qs: Sequence[float]) -> List[Optional[float]]:
+        """Quantis por posição (nearest-rank) sobre os itens ponderados por 2^nível"""
+        weighted = sorted(
+            (value, 1 << level) for level, compactor in enumerate(self.compactors) for value in compactor
+        )
+        if not weighted:
+            return [None] * len(qs)
+        cumulative = list(itertools.accumulate(weight for _, weight in weighted))
+        return [
+            weighted[min(bisect.bisect_left(cumulative, q * cumulative[-1]), len(weighted) - 1)][0] for q in qs
+        ]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'k': self.k, 'c': self.c, 'n': self.n, 'flip': self._flip, 'compactors': self.compactors}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'KLLSketch':
+        sketch = cls(k=data['k'], c=data['c'])
+        sketch.n = data['n']
+        sketch._flip = data['flip']
+        sketch.compactors = [list(compactor) for compactor in data['compactors']] or [[]]
+        return sketch
+
+
+class HyperLogLog:
+    """Contador de valores distintos (HyperLogLog com correção para poucos valores)"""
+
+    def __init__(self, p: int = 12):
+        self.p = p
+        self.registers = bytearray(1 << p)
+
+    def add(self, value: Any):
+        x = int.from_bytes(hashlib.blake2b(str(value).encode('utf-8'), digest_size=8).digest(), 'big')
+        index = x >> (64 - self.p)
+        rest = x & ((1 << (64 - self.p)) - 1)
+        rank = (64 - self.p) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def add_many(self, values: Iterable[Any]):
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: 'HyperLogLog'):
+        if other.p != self.p:
+            raise ValueError("HyperLogLog com precisões diferentes não podem ser combinados")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def count(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Poucos valores: contagem linear pelos registradores vazios
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'p': self.p, 'registers': base64.b64encode(bytes(self.registers)).decode('ascii')}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'HyperLogLog':
+        sketch = cls(p=data['p'])
+        sketch.registers = bytearray(base64.b64decode(data['registers']))
+        return sketch
+
+
+class QuoteSketches:
+    """Preços praticados por serviço (KLL) e clientes distintos por mês (HyperLogLog)"""
+
+    def __init__(self, seq: int = 0):
+        # Última transação do journal refletida nos sketches (persistência)
+        self.seq = seq
+        self.prices: Dict[int, KLLSketch] = {}
+        self.clients: Dict[str, HyperLogLog] = {}
+
+    @classmethod
+    def from_frames(cls, quotes: pd.DataFrame, items: pd.DataFrame) -> 'QuoteSketches':
+        """Monta os sketches a partir das abas atuais"""
+        sketches = cls()
+        sketches._feed_items(items)
+        sketches._feed_quotes(quotes)
+        return sketches
+
+    def _feed_items(self, items: pd.DataFrame):
+        if not len(items):
+            return
+        prices = pd.to_numeric(items['unit_price'], errors='coerce')
+        for service_id, values in prices.groupby(pd.to_numeric(items['service_id'], errors='coerce')):
+            self.prices.setdefault(int(service_id), KLLSketch()).update_many(values.tolist())
+
+    def _feed_quotes(self, quotes: pd.DataFrame):
+        if not len(quotes):
+            return
+        months = quotes['created_at'].astype(str).str[:7]
+        pairs = pd.DataFrame({'month': months, 'client_id': quotes['client_id'].astype(str)}).drop_duplicates()
+        for month, client_ids in pairs.groupby('month')['client_id']:
+            self.clients.setdefault(month, HyperLogLog()).add_many(client_ids.tolist())
+
+    def apply(self, sheet_name: str, op: dict) -> bool:
+        """Alimenta os sketches com as linhas inseridas.
+
+        Retorna False para as demais operações em orçamentos e itens (update,
+        upsert, delete, replace): um sketch não desfaz valores já contados, então
+        os sketches precisam ser refeitos a partir das abas.
+        """
+        if sheet_name not in ('quotes', 'quote_items'):
+            return True
+        if op['op'] != 'insert':
+            return False
+        if op['rows']:
+            if sheet_name == 'quote_items':
+                self._feed_items(pd.DataFrame(op['rows']))
+            else:
+                self._feed_quotes(pd.DataFrame(op['rows']))
+        return True
+
+    def merge(self, other: 'QuoteSketches'):
+        """Combina os sketches de outro worker ou de outro trecho da base"""
+        for service_id, sketch in other.prices.items():
+            self.prices.setdefault(service_id, KLLSketch(k=sketch.k, c=sketch.c)).merge(sketch)
+        for month, sketch in other.clients.items():
+            self.clients.setdefault(month, HyperLogLog(p=sketch.p)).merge(sketch)
+        self.seq = max(self.seq, other.seq)
+
+    def price_quantiles(self, qs: Sequence[float] = (0.5, 0.9)) -> Dict[int, List[Optional[float]]]:
+        return {service_id: sketch.quantiles(qs) for service_id, sketch in self.prices.items()}
+
+    def unique_clients(self) -> Dict[str, int]:
+        """Clientes distintos com orçamentos criados em cada mês (YYYY-MM)"""
+        return {month: self.clients[month].count() for month in sorted(self.clients) if month[:1].isdigit()}
+
+    # PERSISTÊNCIA
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'seq': self.seq,
+            'prices': {str(service_id): sketch.to_dict() for service_id, sketch in self.prices.items()},
+            'clients': {month: sketch.to_dict() for month, sketch in self.clients.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'QuoteSketches':
+        sketches = cls(seq=data['seq'])
+        sketches.prices = {int(service_id): KLLSketch.from_dict(d) for service_id, d in data['prices'].items()}
+        sketches.clients = {month: HyperLogLog.from_dict(d) for month, d in data['clients'].items()}
+        return sketches
+
+    def save(self, path: str):
+        """Grava o arquivo lateral de forma atômica (arquivo temporário + rename)"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional['QuoteSketches']:
+        """Lê o arquivo lateral; None se não existir ou estiver corrompido"""
+        try:
+            with open(path, encoding='utf-8') as f:
+                return cls.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
@@ -0,0 +1,295 @@
+"""
+Motores de armazenamento da base legada de orçamentos (clients, services, quotes, quote_items)
+
+O ExcelService mantém as abas como DataFrames em memória e delega a persistência
+a um StorageEngine. O motor padrão continua sendo o .xlsx (openpyxl); o SQLite é
+uma alternativa embarcada mais rápida para leituras e appends, e o .xlsx passa a
+ser apenas um formato de exportação.
+"""
+import os
+import shutil
+import sqlite3
+import tempfile
+from abc import ABC, abstractmethod
+from contextlib import closing
+from datetime import date
+from typing import Any, Collection, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+
+class StorageEngine(ABC):
+    """Contrato de persistência das abas do ExcelService"""
+
+    # Nome usado na configuração (QUOTES_STORE_ENGINE)
+    name: str = ""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def exists(self) -> bool:
+        """Verifica se o arquivo da base existe"""
+        return os.path.exists(self.path)
+
+    def stamp(self) -> Optional[Tuple[int, int]]:
+        """Carimbo da versão em disco (mtime em ns, tamanho)"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    @abstractmethod
+    def sheet_names(self) -> List[str]:
+        """Lista as abas (tabelas) existentes"""
+        pass
+
+    @abstractmethod
+    def read_sheet(self, sheet_name: str) -> pd.DataFrame:
+        """Lê uma aba inteira"""
+        pass
+
+    def read_sheets(self, sheet_names: List[str], columns: Optional[Collection[str]] = None) -> Dict[str, pd.DataFrame]:
+        """Lê várias abas de uma só vez, da mesma versão do arquivo.
+
+        Abas inexistentes ficam de fora do resultado. `columns` limita as
+        colunas lidas (as que não estiverem na aba são ignoradas); as colunas
+        da aba que ficaram de fora vão em `df.attrs['dropped_columns']`.
+        """
+        existing = set(self.sheet_names())
+        frames = {sheet_name: self.read_sheet(sheet_name) for sheet_name in sheet_names if sheet_name in existing}
+        if columns is not None:
+            for sheet_name, df in frames.items():
+                dropped = [column for column in df.columns if column not in columns]
+                frames[sheet_name] = df.drop(columns=dropped)
+                frames[sheet_name].attrs['dropped_columns'] = dropped
+        return frames
+
+    @abstractmethod
+    def write_sheets(self, sheets: Dict[str, pd.DataFrame], appended_from: Optional[Dict[str, int]] = None):
+        """Grava as abas informadas de forma atômica.
+
+        `appended_from` indica, por aba, que o DataFrame é o conteúdo anterior
+        acrescido de linhas a partir daquela posição. Motores que suportam
+        append podem gravar só as linhas novas.
+        """
+        pass
+
+    def stage_sheets(self, sheets: Dict[str, pd.DataFrame]) -> Any:
+        """Prepara uma gravação sem torná-la visível (ver publish/discard).
+
+        Permite fazer a parte lenta da gravação fora de qualquer lock e só
+        publicar o resultado sob o lock. Por padrão nada é preparado.
+        """
+        return sheets
+
+    def publish(self, staged: Any):
+        """Torna visível uma gravação preparada por stage_sheets"""
+        self.write_sheets(staged)
+
+    def discard(self, staged: Any):
+        """Descarta uma gravação preparada e não publicada"""
+        pass
+
+    def read_all(self) -> Dict[str, pd.DataFrame]:
+        """Lê todas as abas"""
+        return {sheet_name: self.read_sheet(sheet_name) for sheet_name in self.sheet_names()}
+
+
+class XlsxStorageEngine(StorageEngine):
+    """Armazenamento em planilha .xlsx via openpyxl"""
+
+    name = "xlsx"
+
+    def sheet_names(self) -> List[str]:
+        with pd.ExcelFile(self.path, engine='openpyxl') as workbook:
+            return list(workbook.sheet_names)
+
+    def read_sheet(self, sheet_name: str) -> pd.DataFrame:
+        return pd.read_excel(self.path, sheet_name=sheet_name)
+
+    def read_sheets(self, sheet_names: List[str], columns: Optional[Collection[str]] = None) -> Dict[str, pd.DataFrame]:
+        """Abre e descompacta o arquivo uma única vez para todas as abas pedidas"""
+        with pd.ExcelFile(self.path, engine='openpyxl') as workbook:
+            present = [sheet_name for sheet_name in sheet_names if sheet_name in workbook.sheet_names]
+            if not present:
+                return {}
+            if columns is None:
+                return pd.read_excel(workbook, sheet_name=present)
+            frames = {}
+            for sheet_name in present:
+                dropped = []
+
+                def usecols(column, dropped=dropped):
+                    # Chamado com cada coluna do cabeçalho: registra as descartadas
+                    if column in columns:
+                        return True
+                    dropped.append(column)
+                    return False
+
+                frames[sheet_name] = pd.read_excel(workbook, sheet_name=sheet_name, usecols=usecols)
+                frames[sheet_name].attrs['dropped_columns'] = dropped
+            return frames
+
+    def write_sheets(self, sheets: Dict[str, pd.DataFrame], appended_from: Optional[Dict[str, int]] = None):
+        """Substitui as abas numa cópia do arquivo e a renomeia sobre o original.
+
+        As abas não informadas são preservadas. O .xlsx não tem append
+        incremental: `appended_from` é ignorado.
+        """
+        self.publish(self.stage_sheets(sheets))
+
+    def stage_sheets(self, sheets: Dict[str, pd.DataFrame]) -> str:
+        """Grava as abas numa cópia temporária do arquivo e retorna o caminho dela"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(prefix='.~', suffix='.xlsx', dir=directory)
+        os.close(fd)
+        try:
+            if self.exists():
+                shutil.copyfile(self.path, tmp_path)
+                writer = pd.ExcelWriter(tmp_path, engine='openpyxl', mode='a', if_sheet_exists='replace')
+            else:
+                writer = pd.ExcelWriter(tmp_path, engine='openpyxl')
+            with writer:
+                for sheet_name, df in sheets.items():
+                    df.to_excel(writer, sheet_name=sheet_name, index=False)
+        except BaseException:
+            self.discard(tmp_path)
+            raise
+        return tmp_path
+
+    def publish(self, staged: str):
+        """Renomeia a cópia temporária sobre o arquivo original"""
+        try:
+            os.replace(staged, self.path)
+        except BaseException:
+            self.discard(staged)
+            raise
+
+    def discard(self, staged: str):
+        if os.path.exists(staged):
+            os.remove(staged)
+
+
+def _sqlite_type(dtype) -> str:
+    """Tipo de coluna SQLite correspondente ao dtype do pandas"""
+    if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+        return "INTEGER"
+    if pd.api.types.is_float_dtype(dtype):
+        return "REAL"
+    if pd.api.types.is_object_dtype(dtype):
+        # Sem afinidade: colunas object (inclusive as de abas vazias) guardam
+        # cada valor com o tipo em que foi inserido, sem converter ids em texto
+        return ""
+    return "TEXT"
+
+
+def _sqlite_rows(df: pd.DataFrame):
+    """Linhas do DataFrame com NaN/NaT como NULL e tipos nativos do Python"""
+    values = df.astype(object).where(pd.notna(df), None)
+    for row in values.itertuples(index=False, name=None):
+        yield tuple(
+            value.isoformat() if isinstance(value, date)
+            else value.item() if hasattr(value, 'item')
+            else value
+            for value in row
+        )
+
+
+class SQLiteStorageEngine(StorageEngine):
+    """Armazenamento embarcado em SQLite: uma tabela por aba"""
+
+    name = "sqlite"
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def sheet_names(self) -> List[str]:
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' ORDER BY rowid"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def read_sheet(self, sheet_name: str) -> pd.DataFrame:
+        with closing(self._connect()) as conn:
+            return pd.read_sql_query(f'SELECT * FROM "{sheet_name}" ORDER BY rowid', conn)
+
+    def read_sheets(self, sheet_names: List[str], columns: Optional[Collection[str]] = None) -> Dict[str, pd.DataFrame]:
+        """Lê as tabelas pedidas numa única transação de leitura (mesma versão da base)"""
+        frames = {}
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN")
+            try:
+                for sheet_name in sheet_names:
+                    existing = self._table_columns(conn, sheet_name)
+                    if existing is None:
+                        continue
+                    selected = existing if columns is None else [column for column in existing if column in columns]
+                    select = ", ".join(f'"{column}"' for column in selected) or "NULL"
+                    frames[sheet_name] = pd.read_sql_query(
+                        f'SELECT {select} FROM "{sheet_name}" ORDER BY rowid', conn
+                    )[selected]
+                    if columns is not None:
+                        frames[sheet_name].attrs['dropped_columns'] = [
+                            column for column in existing if column not in columns
+                        ]
+            finally:
+                conn.rollback()
+        return frames
+
+    def _table_columns(self, conn: sqlite3.Connection, sheet_name: str) -> Optional[List[str]]:
+        rows = conn.execute(f'PRAGMA table_info("{sheet_name}")').fetchall()
+        return [row[1] for row in rows] or None
+
+    def _insert(self, conn: sqlite3.Connection, sheet_name: str, df: pd.DataFrame):
+        columns = ", ".join(f'"{column}"' for column in df.columns)
+        placeholders = ", ".join("?" for _ in df.columns)
+        conn.executemany(
+            f'INSERT INTO "{sheet_name}" ({columns}) VALUES ({placeholders})',
+            _sqlite_rows(df)
+        )
+
+    def write_sheets(self, sheets: Dict[str, pd.DataFrame], appended_from: Optional[Dict[str, int]] = None):
+        """Grava todas as abas numa única transação SQLite.
+
+        Abas que só receberam linhas novas têm apenas essas linhas inseridas;
+        as demais são recriadas.
+        """
+        appended_from = appended_from or {}
+        with closing(self._connect()) as conn:
+            with conn:
+                for sheet_name, df in sheets.items():
+                    existing = self._table_columns(conn, sheet_name)
+                    start = appended_from.get(sheet_name)
+                    if start is not None and existing is not None and set(df.columns) <= set(existing):
+                        self._insert(conn, sheet_name, df.iloc[start:])
+                        continue
+                    conn.execute(f'DROP TABLE IF EXISTS "{sheet_name}"')
+                    columns = ", ".join(f'"{column}" {_sqlite_type(dtype)}'.rstrip() for column, dtype in df.dtypes.items())
+                    conn.execute(f'CREATE TABLE "{sheet_name}" ({columns})')
+                    self._insert(conn, sheet_name, df)
+
+
+STORAGE_ENGINES = {
+    XlsxStorageEngine.name: XlsxStorageEngine,
+    SQLiteStorageEngine.name: SQLiteStorageEngine,
+}
+
+
+def create_storage_engine(kind: str, path: str) -> StorageEngine:
+    """Instancia o motor de armazenamento configurado"""
+    try:
+        engine_class = STORAGE_ENGINES[kind.lower()]
+    except KeyError:
+        raise ValueError(
+            f"Motor de armazenamento desconhecido: {kind!r} (opções: {', '.join(STORAGE_ENGINES)})"
+        )
+    return engine_class(path)
+
+
+def migrate_store(source: StorageEngine, target: StorageEngine) -> Dict[str, int]:
+    """Copia todas as abas de um motor para outro, retornando o total de linhas por aba"""
+    sheets = source.read_all()
+    target.write_sheets(sheets)
+    return {sheet_name: len(df) for sheet_name, df in sheets.items()}
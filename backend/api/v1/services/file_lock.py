@@ -0,0 +1,79 @@
+"""
+Lock exclusivo entre processos baseado em arquivo
+
+Usado pelo ExcelService para que vários workers (gunicorn/uvicorn) não gravem
+a base de orçamentos ao mesmo tempo. Usa fcntl.flock no Linux/macOS e
+msvcrt.locking no Windows.
+"""
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:  # Linux/macOS
+    msvcrt = None
+
+
+class InterProcessLock:
+    """Lock exclusivo sobre um arquivo .lock, bloqueante e não reentrante"""
+
+    def __init__(self, path: str):
+        self.path = path
+        # flock não exclui threads que compartilham o mesmo descritor
+        self._thread_lock = threading.Lock()
+        self._fd = None
+
+    def acquire(self):
+        self._thread_lock.acquire()
+        try:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                self._lock_fd(fd)
+            except BaseException:
+                os.close(fd)
+                raise
+        except BaseException:
+            self._thread_lock.release()
+            raise
+        self._fd = fd
+
+    def release(self):
+        fd, self._fd = self._fd, None
+        try:
+            self._unlock_fd(fd)
+        finally:
+            os.close(fd)
+            self._thread_lock.release()
+
+    def _lock_fd(self, fd: int):
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        elif msvcrt is not None:
+            # LK_LOCK desiste após ~10 s; tenta de novo até conseguir
+            while True:
+                try:
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                    return
+                except OSError:
+                    time.sleep(0.05)
+
+    def _unlock_fd(self, fd: int):
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        elif msvcrt is not None:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
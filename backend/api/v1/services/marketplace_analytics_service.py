@@ -0,0 +1,130 @@
+"""
+Serviço de Analytics do Marketplace (SQLAlchemy)
+
+Mesmos números da função marketplace_analytics (supabase_marketplace_analytics.sql),
+calculados por consultas agregadas no banco do DATABASE_URL ou no SQLite local.
+As medianas usam funções de janela (ROW_NUMBER/COUNT OVER), disponíveis
+também no SQLite, para que só o resultado agregado saia do banco.
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, case, func, literal, literal_column, select
+from datetime import datetime
+from typing import Any, Dict, Optional
+from ..models.db_models import Orcamento, Solicitacao, StatusOrcamento
+
+ACEITOS = (StatusOrcamento.ACEITO, StatusOrcamento.REALIZADO)
+
+
+def _periodo(inicio: Optional[datetime], fim: Optional[datetime]):
+    """Filtro das solicitações pelo created_at (inclusive; None = sem limite)"""
+    condicoes = []
+    if inicio is not None:
+        condicoes.append(Solicitacao.created_at >= inicio)
+    if fim is not None:
+        condicoes.append(Solicitacao.created_at <= fim)
+    return and_(literal(True), *condicoes)
+
+
+def _horas_entre(db: Session, inicio, fim):
+    """Expressão SQL com as horas entre dois timestamps, no dialeto do banco"""
+    dialeto = db.get_bind().dialect.name
+    if dialeto == "sqlite":
+        return (func.julianday(fim) - func.julianday(inicio)) * 24.0
+    if dialeto == "mysql":
+        return func.timestampdiff(literal_column("SECOND"), inicio, fim) / 3600.0
+    return func.extract("epoch", fim - inicio) / 3600.0
+
+
+def _mediana(valores, por_grupo: bool = False):
+    """Mediana da coluna `valor` de uma subconsulta (por `grupo`, se `por_grupo`).
+
+    Numera as linhas de cada grupo em ordem de valor e faz a média da(s)
+    linha(s) do meio: (n + 1) / 2 e (n + 2) / 2 em divisão inteira.
+    """
+    particao = [valores.c.grupo] if por_grupo else []
+    ranqueado = select(
+        *particao,
+        valores.c.valor,
+        func.row_number().over(partition_by=particao or None, order_by=valores.c.valor).label("posicao"),
+        func.count().over(partition_by=particao or None).label("total"),
+    ).where(valores.c.valor.is_not(None)).subquery()
+    meio = ranqueado.c.posicao.between((ranqueado.c.total + 1) // 2, (ranqueado.c.total + 2) // 2)
+    colunas = [ranqueado.c.grupo] if por_grupo else []
+    consulta = select(*colunas, func.avg(ranqueado.c.valor)).where(meio)
+    return consulta.group_by(ranqueado.c.grupo) if por_grupo else consulta
+
+
+def obter_analytics_marketplace(
+    db: Session,
+    inicio: Optional[datetime] = None,
+    fim: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """Conversão, orçamentos por categoria, medianas de valor e tempo até o aceite"""
+    periodo = _periodo(inicio, fim)
+    aceito = Orcamento.status.in_(ACEITOS)
+
+    # Conversão: solicitações com algum orçamento / com orçamento aceito
+    por_solicitacao = select(
+        Solicitacao.id,
+        func.count(Orcamento.id).label("orcamentos"),
+        func.coalesce(func.sum(case((aceito, 1), else_=0)), 0).label("aceitos"),
+    ).outerjoin(Orcamento, Orcamento.solicitacao_id == Solicitacao.id).where(periodo).group_by(Solicitacao.id).subquery()
+    total, com_orcamentos, com_aceite = db.execute(select(
+        func.count(),
+        func.coalesce(func.sum(case((por_solicitacao.c.orcamentos > 0, 1), else_=0)), 0),
+        func.coalesce(func.sum(case((por_solicitacao.c.aceitos > 0, 1), else_=0)), 0),
+    ).select_from(por_solicitacao)).one()
+
+    # Contagens e medianas por categoria
+    por_categoria = db.execute(select(
+        Solicitacao.categoria,
+        func.count(func.distinct(Solicitacao.id)),
+        func.count(Orcamento.id),
+        func.coalesce(func.sum(case((aceito, 1), else_=0)), 0),
+    ).outerjoin(Orcamento, Orcamento.solicitacao_id == Solicitacao.id).where(periodo)
+        .group_by(Solicitacao.categoria)).all()
+    medianas = {}
+    for coluna in ("valor_proposto", "valor_ml_sugerido"):
+        valores = select(
+            Solicitacao.categoria.label("grupo"), getattr(Orcamento, coluna).label("valor")
+        ).join(Solicitacao, Solicitacao.id == Orcamento.solicitacao_id).where(periodo).subquery()
+        medianas[coluna] = dict(db.execute(_mediana(valores, por_grupo=True)).all())
+
+    categorias = []
+    for categoria, solicitacoes, orcamentos, aceitos in por_categoria:
+        proposto = medianas["valor_proposto"].get(categoria)
+        sugerido = medianas["valor_ml_sugerido"].get(categoria)
+        categorias.append({
+            "categoria": categoria,
+            "solicitacoes": solicitacoes,
+            "orcamentos": orcamentos,
+            "orcamentos_aceitos": int(aceitos),
+            "mediana_valor_proposto": proposto,
+            "mediana_valor_ml_sugerido": sugerido,
+            "razao_proposto_sugerido": proposto / sugerido if proposto is not None and sugerido else None,
+        })
+    categorias.sort(key=lambda c: (-c["orcamentos"], c["categoria"]))
+
+    # Tempo entre a criação da solicitação e o aceite do orçamento
+    aceites = select(
+        _horas_entre(db, Solicitacao.created_at, Orcamento.aceito_em).label("valor")
+    ).join(Solicitacao, Solicitacao.id == Orcamento.solicitacao_id).where(
+        periodo, aceito, Orcamento.aceito_em.is_not(None)
+    ).subquery()
+    quantidade, media = db.execute(select(func.count(), func.avg(aceites.c.valor))).one()
+    mediana = db.execute(_mediana(aceites)).scalar() if quantidade else None
+
+    return {
+        "conversao": {
+            "solicitacoes": total,
+            "com_orcamentos": int(com_orcamentos),
+            "com_orcamento_aceito": int(com_aceite),
+            "taxa_conversao": int(com_aceite) / total if total else 0,
+        },
+        "categorias": categorias,
+        "tempo_ate_aceite": {
+            "aceites": quantidade,
+            "media_horas": media,
+            "mediana_horas": mediana,
+        },
+    }
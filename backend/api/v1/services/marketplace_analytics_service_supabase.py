@@ -0,0 +1,25 @@
+"""
+Serviço de Analytics do Marketplace usando Supabase RPC
+
+A agregação roda no Postgres (função marketplace_analytics, definida em
+supabase_marketplace_analytics.sql); só o JSON com o resultado vem pela rede.
+"""
+from typing import Optional, Dict, Any
+from datetime import datetime
+from ..services.supabase_service import supabase_service
+
+
+def obter_analytics_marketplace(
+    inicio: Optional[datetime] = None,
+    fim: Optional[datetime] = None
+) -> Optional[Dict[str, Any]]:
+    """Conversão, orçamentos por categoria, medianas de valor e tempo até o aceite"""
+    try:
+        response = supabase_service.get_client().rpc("marketplace_analytics", {
+            "p_inicio": inicio.isoformat() if inicio else None,
+            "p_fim": fim.isoformat() if fim else None,
+        }).execute()
+        return response.data
+    except Exception as e:
+        print(f"Erro ao buscar analytics do marketplace: {e}")
+        return None
@@ -0,0 +1,153 @@
+"""
+Micro-batching das predições de ML
+
+Requisições concorrentes que chegam ao event loop ficam numa fila por até
+ML_BATCH_MAX_WAIT_MS (ou até juntar ML_BATCH_MAX_SIZE itens) e viram uma
+única chamada em lote ao modelo, executada fora do event loop. Cada chamador
+recebe o resultado do seu item. Histogramas de tamanho de lote e de espera
+na fila ficam disponíveis em /ml/status.
+"""
+import asyncio
+import threading
+import time
+from bisect import bisect_left
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from ..core.config import ML_BATCH_MAX_SIZE, ML_BATCH_MAX_WAIT_MS
+from . import ml_workers
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+QUEUE_WAIT_BUCKETS_MS = (0.5, 1, 2, 5, 10, 25, 50, 100, 250, 1000)
+
+
+class Histogram:
+    """Histograma cumulativo (no formato dos buckets `le` do Prometheus)"""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        with self._lock:
+            self._counts[bisect_left(self.buckets, value)] += 1
+            self.count += 1
+            self.sum += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            buckets, cumulative = {}, 0
+            for bound, count in zip(self.buckets, self._counts):
+                cumulative += count
+                buckets[str(bound)] = cumulative
+            buckets["+Inf"] = self.count
+            return {"buckets": buckets, "count": self.count, "sum": self.sum}
+
+
+# Thread única de inferência do processo: os lotes rodam um de cada vez e,
+# enquanto um roda, os pedidos seguintes se acumulam no próximo lote. No modo
+# "process" há uma thread por processo de inferência, cada uma esperando o IPC
+# de um lote, para que todos os processos trabalhem ao mesmo tempo
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def inference_executor() -> Executor:
+    global _executor
+    # Criado sob demanda: workers com fork não herdam threads do processo pai
+    with _executor_lock:
+        if _executor is None:
+            pool = ml_workers.process_inference
+            threads = pool.workers if pool is not None else 1
+            _executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="ml-inference")
+        return _executor
+
+
+def shutdown_inference():
+    """Encerra as threads e os processos de inferência (os lotes em andamento terminam antes)"""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+    ml_workers.shutdown_workers()
+
+
+class MicroBatcher:
+    """Agrupa chamadas concorrentes de `predict_many(itens) -> resultados` em lotes"""
+
+    def __init__(
+        self,
+        predict_many: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = ML_BATCH_MAX_SIZE,
+        max_wait_ms: float = ML_BATCH_MAX_WAIT_MS,
+        executor: Callable[[], Executor] = inference_executor
+    ):
+        self.predict_many = predict_many
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_ms = max_wait_ms
+        self._executor = executor
+        self.batch_sizes = Histogram(BATCH_SIZE_BUCKETS)
+        self.queue_wait_ms = Histogram(QUEUE_WAIT_BUCKETS_MS)
+        # Estado do event loop corrente (só acessado pela thread do loop)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: List[Tuple[Any, asyncio.Future, float]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def submit(self, item: Any) -> Any:
+        """Enfileira o item e aguarda o resultado do lote em que ele entrar"""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Outro event loop (ex.: testes): a fila do anterior não vale mais
+            self._loop, self._pending, self._timer = loop, [], None
+        future = loop.create_future()
+        self._pending.append((item, future, time.perf_counter()))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait_ms / 1000, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._pending:
+            batch = self._pending[:self.max_batch_size]
+            self._pending = self._pending[self.max_batch_size:]
+            self._run(batch)
+
+    def _run(self, batch: List[Tuple[Any, asyncio.Future, float]]):
+        now = time.perf_counter()
+        for _, _, queued_at in batch:
+            self.queue_wait_ms.observe((now - queued_at) * 1000)
+        self.batch_sizes.observe(len(batch))
+        done = self._loop.run_in_executor(self._executor(), self.predict_many, [item for item, _, _ in batch])
+        done.add_done_callback(lambda result: self._resolve(batch, result))
+
+    @staticmethod
+    def _resolve(batch: List[Tuple[Any, asyncio.Future, float]], done: asyncio.Future):
+        """Entrega a cada chamador o seu resultado (ou a exceção do lote)"""
+        error = done.exception() if not done.cancelled() else asyncio.CancelledError()
+        results = done.result() if error is None else None
+        if error is None and len(results) != len(batch):
+            error = RuntimeError(f"Lote de {len(batch)} itens devolveu {len(results)} resultados")
+        for position, (_, future, _) in enumerate(batch):
+            if future.done():
+                # O chamador desistiu (timeout, desconexão)
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(results[position])
+
+    def stats(self) -> Dict[str, Any]:
+        """Configuração e histogramas para /ml/status"""
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "batch_size": self.batch_sizes.snapshot(),
+            "queue_wait_ms": self.queue_wait_ms.snapshot(),
+        }
@@ -0,0 +1,93 @@
+"""
+Cache LRU com TTL das predições de ML
+
+A chave é (tipo da predição, texto normalizado, versão dos modelos). O texto
+é normalizado só no que os vetorizadores TF-IDF já ignoram (maiúsculas e
+espaços repetidos), então a resposta do cache é a mesma do modelo. Quando o
+registro carrega modelos de outra versão, o cache se esvazia sozinho.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from ..core.config import ML_PREDICTION_CACHE_SIZE, ML_PREDICTION_CACHE_TTL
+
+
+def normalize_text(text: str) -> str:
+    """Minúsculas e espaços colapsados (o TF-IDF com lowercase=True não distingue)"""
+    return " ".join(str(text).lower().split())
+
+
+class PredictionCache:
+    """LRU limitado a `maxsize` entradas, cada uma válida por `ttl` segundos"""
+
+    def __init__(
+        self,
+        maxsize: int = ML_PREDICTION_CACHE_SIZE,
+        ttl: float = ML_PREDICTION_CACHE_TTL,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[Tuple[Hashable, ...], Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._version: Optional[str] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _check_version(self, version: Optional[str]):
+        if version != self._version:
+            self._entries.clear()
+            self._version = version
+
+    def get(self, kind: str, text: str, version: Optional[str]) -> Optional[Any]:
+        """Valor guardado para o texto (None se ausente ou expirado)"""
+        key = (kind, normalize_text(text))
+        with self._lock:
+            self._check_version(version)
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > self._clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, kind: str, text: str, version: Optional[str], value: Any):
+        if self.maxsize <= 0:
+            return
+        key = (kind, normalize_text(text))
+        with self._lock:
+            self._check_version(version)
+            self._entries[key] = (self._clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores para /ml/status"""
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / requests if requests else 0.0,
+                "evictions": self.evictions,
+                "models_version": self._version,
+            }
+
+
+# Instância compartilhada pelo processo
+prediction_cache = PredictionCache()
@@ -0,0 +1,117 @@
+"""
+Avaliação compilada das florestas de preço e categoria
+
+O predict do scikit-learn percorre as 100 árvores uma a uma (com o despacho
+do joblib para o n_jobs salvo no .pkl), o que custa milissegundos mesmo para
+uma única linha. Aqui as árvores de uma floresta viram arrays NumPy contíguos
+(feature, threshold, filhos e valor de cada nó) e as linhas do lote descem por
+todas as árvores ao mesmo tempo, um nível por iteração.
+
+Vale para uma linha e lotes pequenos (até MAX_COMPILED_ROWS); lotes maiores e
+entradas com NaN vão para o predict do próprio sklearn.
+
+O resultado é idêntico bit a bit ao do scikit-learn com n_jobs=1: a entrada é
+convertida para float32 como no sklearn, a comparação com o threshold é feita
+em float64 e as contribuições das árvores são somadas na ordem dos estimadores
+antes da divisão pelo número de árvores. (Com n_jobs > 1 o próprio sklearn soma
+na ordem em que as threads terminam.)
+"""
+from typing import Any
+import numpy as np
+
+# Acima disso o predict do sklearn (Cython, árvore por árvore) é mais rápido que a
+# descida vetorizada; ver benchmarks/bench_ml_forest.py
+MAX_COMPILED_ROWS = 512
+
+
+class CompiledForest:
+    """RandomForest/ExtraTrees (regressor ou classificador de uma saída) em arrays planos"""
+
+    def __init__(self, estimator: Any):
+        trees = [tree.tree_ for tree in estimator.estimators_]
+        offsets = np.cumsum([0] + [tree.node_count for tree in trees])
+        self.estimator = estimator
+        self.n_estimators = len(trees)
+        self.n_features_in_ = estimator.n_features_in_
+        self.is_classifier = hasattr(estimator, "classes_")
+        self.classes_ = getattr(estimator, "classes_", None)
+        self.roots = offsets[:-1].astype(np.intp)
+        self.max_depth = max(tree.max_depth for tree in trees)
+
+        feature, threshold, children, value = [], [], [], []
+        for tree, offset in zip(trees, offsets):
+            nodes = np.arange(tree.node_count, dtype=np.intp) + offset
+            leaf = tree.children_left == -1
+            # Folhas apontam para si mesmas: continuar descendo não muda nada
+            left = np.where(leaf, nodes, tree.children_left + offset)
+            right = np.where(leaf, nodes, tree.children_right + offset)
+            feature.append(np.where(leaf, 0, tree.feature))
+            threshold.append(tree.threshold)
+            # children[2 * nó + (x <= threshold)]: direita em 2n, esquerda em 2n + 1
+            children.append(np.stack([right, left], axis=1).ravel())
+            value.append(tree.value[:, 0, :] if self.is_classifier else tree.value[:, 0, 0])
+        self.feature = np.concatenate(feature).astype(np.intp)
+        self.threshold = np.concatenate(threshold).astype(np.float64)
+        self.children = np.concatenate(children).astype(np.intp)
+        self.value = np.ascontiguousarray(np.concatenate(value), dtype=np.float64)
+
+    def _as_float32(self, X: Any) -> np.ndarray:
+        X = X.astype(np.float32).toarray() if hasattr(X, "toarray") else np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(
+                f"X tem {X.shape[-1]} features, mas a floresta espera {self.n_features_in_}"
+            )
+        return X
+
+    def apply(self, X: np.ndarray) -> np.ndarray:
+        """Índice (nos arrays planos) da folha de cada linha em cada árvore: (linhas, árvores)"""
+        flat = X.ravel()
+        row_start = (np.arange(X.shape[0], dtype=np.intp) * X.shape[1])[:, None]
+        nodes = np.broadcast_to(self.roots, (X.shape[0], self.n_estimators))
+        for _ in range(self.max_depth):
+            # float32 da entrada comparado em float64 com o threshold, como no sklearn
+            go_left = flat.take(row_start + self.feature.take(nodes)) <= self.threshold.take(nodes)
+            nodes = self.children.take(2 * nodes + go_left)
+        return nodes
+
+    def _accumulate(self, X: np.ndarray) -> np.ndarray:
+        """Média das saídas das árvores, somadas na ordem dos estimadores como no sklearn"""
+        leaves = self.apply(X)
+        total = np.zeros((X.shape[0],) + self.value.shape[1:])
+        for tree in range(self.n_estimators):
+            total += self.value.take(leaves[:, tree], axis=0)
+        total /= self.n_estimators
+        return total
+
+    def _use_sklearn(self, X: Any) -> bool:
+        """Lotes grandes e entradas com NaN (regra de ausentes de cada nó) ficam com o sklearn"""
+        data = X.data if hasattr(X, "toarray") else np.asarray(X, dtype=np.float64)
+        return np.shape(X)[0] > MAX_COMPILED_ROWS or bool(np.isnan(data).any())
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        if not self.is_classifier:
+            raise AttributeError("predict_proba só existe para classificadores")
+        if self._use_sklearn(X):
+            return self.estimator.predict_proba(X)
+        return self._accumulate(self._as_float32(X))
+
+    def predict(self, X: Any) -> np.ndarray:
+        if self._use_sklearn(X):
+            return self.estimator.predict(X)
+        if self.is_classifier:
+            proba = self._accumulate(self._as_float32(X))
+            return self.classes_.take(np.argmax(proba, axis=1), axis=0)
+        return self._accumulate(self._as_float32(X))
+
+
+def compile_forest(model: Any) -> Any:
+    """CompiledForest do modelo, ou o próprio modelo se não for uma floresta suportada"""
+    if not hasattr(model, "estimators_"):
+        return model
+    from sklearn.ensemble import (
+        ExtraTreesClassifier, ExtraTreesRegressor, RandomForestClassifier, RandomForestRegressor
+    )
+    forests = (RandomForestRegressor, RandomForestClassifier, ExtraTreesRegressor, ExtraTreesClassifier)
+    if not isinstance(model, forests) or getattr(model, "n_outputs_", 1) != 1:
+        return model
+    return CompiledForest(model)
@@ -0,0 +1,140 @@
+"""
+Registro único dos modelos de ML do processo
+
+Os quatro .pkl (preço e categoria, modelo e vetorizador) são lidos uma única
+vez por processo e compartilhados pelo ml_service e pelo SklearnMLAdapter.
+A leitura acontece na primeira predição ou no aquecimento em segundo plano
+disparado no startup; o import dos módulos não toca no disco. As florestas
+são compiladas para arrays NumPy na carga (ml_forest), salvo com
+ML_COMPILED_FORESTS=false.
+"""
+import hashlib
+import os
+import pickle
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from ..core.config import ML_COMPILED_FORESTS, ML_MODELS_DIR
+
+MODEL_FILES = {
+    "price_model": "price_model.pkl",
+    "price_vectorizer": "price_vectorizer.pkl",
+    "category_model": "category_model.pkl",
+    "category_vectorizer": "category_vectorizer.pkl",
+}
+
+
+def models_fingerprint(models_dir: str) -> Optional[str]:
+    """Versão dos arquivos em disco (tamanho e mtime), sem carregá-los; None se falta algum"""
+    fingerprint = hashlib.sha1()
+    try:
+        for file_name in MODEL_FILES.values():
+            stat = os.stat(os.path.join(models_dir, file_name))
+            fingerprint.update(f"{file_name}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    except OSError:
+        return None
+    return fingerprint.hexdigest()[:12]
+
+
+class ModelRegistry:
+    """Carrega os modelos sob demanda (uma vez) e informa prontidão e tempo de carga"""
+
+    def __init__(self, models_dir: str = ML_MODELS_DIR, compile_forests: bool = ML_COMPILED_FORESTS):
+        self.models_dir = models_dir
+        self.compile_forests = compile_forests
+        self._models: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        # not_loaded -> loading -> ready | failed
+        self._state = "not_loaded"
+        self._error: Optional[str] = None
+        self._load_seconds: Optional[float] = None
+        self._loaded_at: Optional[datetime] = None
+        self._version: Optional[str] = None
+        self._compiled: List[str] = []
+
+    @property
+    def ready(self) -> bool:
+        return self._state == "ready"
+
+    @property
+    def version(self) -> Optional[str]:
+        """Identificador dos modelos em memória (muda a cada carga de arquivos diferentes)"""
+        return self._version
+
+    def fingerprint(self) -> Optional[str]:
+        """Versão dos arquivos em disco (ver models_fingerprint)"""
+        return models_fingerprint(self.models_dir)
+
+    def load(self) -> bool:
+        """Carrega os modelos se ainda não foram carregados; True se estão prontos.
+
+        Chamadas concorrentes esperam a mesma carga. Uma falha fica registrada
+        e não é repetida a cada predição (use reload()).
+        """
+        if self._state in ("ready", "failed"):
+            return self.ready
+        with self._lock:
+            if self._state in ("ready", "failed"):
+                return self.ready
+            self._state = "loading"
+            start = time.perf_counter()
+            try:
+                version = self.fingerprint()
+                models = {}
+                for name, file_name in MODEL_FILES.items():
+                    with open(os.path.join(self.models_dir, file_name), "rb") as f:
+                        models[name] = pickle.load(f)
+                compiled = []
+                if self.compile_forests:
+                    # Import tardio: o NumPy só é carregado junto com os modelos
+                    from .ml_forest import compile_forest
+                    for name, model in models.items():
+                        models[name] = compile_forest(model)
+                        if models[name] is not model:
+                            compiled.append(name)
+                self._models = models
+                self._compiled = sorted(compiled)
+                self._version = version
+                self._error = None
+                self._state = "ready"
+            except Exception as e:
+                print(f"⚠️ Aviso: Modelos ML não carregados: {e}")
+                self._models = {}
+                self._compiled = []
+                self._version = None
+                self._error = str(e)
+                self._state = "failed"
+            self._load_seconds = time.perf_counter() - start
+            self._loaded_at = datetime.now()
+        return self.ready
+
+    def reload(self) -> bool:
+        """Descarta os modelos em memória e lê os arquivos de novo (ex.: após retreino)"""
+        with self._lock:
+            self._state = "not_loaded"
+            self._models = {}
+        return self.load()
+
+    def get(self, name: str) -> Optional[Any]:
+        """Modelo pelo nome (ver MODEL_FILES); None se os modelos não carregaram"""
+        self.load()
+        return self._models.get(name)
+
+    def status(self) -> Dict[str, Any]:
+        """Estado para /ml/status (não dispara a carga)"""
+        return {
+            "ready": self.ready,
+            "state": self._state,
+            "models_dir": self.models_dir,
+            "models": sorted(self._models),
+            "compiled": self._compiled,
+            "version": self._version,
+            "load_seconds": self._load_seconds,
+            "loaded_at": self._loaded_at.isoformat() if self._loaded_at else None,
+            "error": self._error,
+        }
+
+
+# Instância compartilhada pelo processo
+model_registry = ModelRegistry()
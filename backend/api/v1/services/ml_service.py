@@ -1,55 +1,107 @@
 """
 Serviço de Machine Learning para Predição de Preços e Categorias
 """
-import pickle
-import os
-from typing import Dict
-
-# Caminhos dos modelos
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-MODELS_DIR = os.path.join(BASE_DIR, "models")
-
-# Carregar modelos
-try:
-    with open(os.path.join(MODELS_DIR, "price_model.pkl"), "rb") as f:
-        price_model = pickle.load(f)
-    with open(os.path.join(MODELS_DIR, "price_vectorizer.pkl"), "rb") as f:
-        price_vectorizer = pickle.load(f)
-    with open(os.path.join(MODELS_DIR, "category_model.pkl"), "rb") as f:
-        category_model = pickle.load(f)
-    with open(os.path.join(MODELS_DIR, "category_vectorizer.pkl"), "rb") as f:
-        category_vectorizer = pickle.load(f)
-    
-    MODELS_LOADED = True
-except Exception as e:
-    print(f"⚠️ Aviso: Modelos ML não carregados: {e}")
-    MODELS_LOADED = False
+import asyncio
+import anyio
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from . import ml_workers
+from .ml_batcher import MicroBatcher
+from .ml_cache import normalize_text, prediction_cache
+from .ml_registry import MODEL_FILES, model_registry
 
-def predizer_preco(descricao: str) -> float:
-    """Prediz preço baseado na descrição do serviço"""
-    if not MODELS_LOADED:
-        return 500.0
+
+def __getattr__(name: str) -> Any:
+    """MODELS_LOADED e os modelos (price_model, ...) vêm do registro, carregados na primeira consulta.
+
+    No modo "process", MODELS_LOADED consulta os arquivos do pool de inferência
+    sem carregar os modelos aqui; os próprios modelos sempre carregam neste processo.
+    """
+    if name == "MODELS_LOADED":
+        if ml_workers.process_inference is not None:
+            return ml_workers.process_inference.models_version() is not None
+        return model_registry.load()
+    if name in MODEL_FILES:
+        return model_registry.get(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _predizer_lote(
+    tipo: str,
+    descricoes: List[str],
+    vetorizador: str,
+    modelo: str,
+    converter: Callable[[Any], Any],
+    padrao: Any
+) -> List[Any]:
+    """Predições de várias descrições com um transform e um predict.
+
+    Descrições já no cache (ou repetidas no lote, após a normalização) não
+    são recalculadas. Se os modelos não carregaram ou a predição falhar,
+    o lote inteiro recebe o valor padrão, que não é guardado no cache.
+    No modo "process" (ml_workers), só as descrições pendentes vão aos
+    processos de inferência; este processo não carrega os modelos.
+    """
+    pool = ml_workers.process_inference
+    if pool is None and not model_registry.load():
+        return [padrao] * len(descricoes)
+    
+    versao = pool.models_version() if pool is not None else model_registry.version
+    resultados: List[Any] = [None] * len(descricoes)
+    # Texto normalizado -> (primeira descrição original, posições no lote)
+    pendentes: Dict[str, Tuple[str, List[int]]] = {}
+    for posicao, descricao in enumerate(descricoes):
+        if versao is not None:
+            valor = prediction_cache.get(tipo, descricao, versao)
+            if valor is not None:
+                resultados[posicao] = valor
+                continue
+        pendentes.setdefault(normalize_text(descricao), (descricao, []))[1].append(posicao)
+    if not pendentes:
+        return resultados
     
     try:
-        X = price_vectorizer.transform([descricao])
-        preco = price_model.predict(X)[0]
-        return float(preco)
+        originais = [descricao for descricao, _ in pendentes.values()]
+        if pool is not None:
+            preditos = pool.predict(vetorizador, modelo, originais)
+        else:
+            preditos = model_registry.get(modelo).predict(model_registry.get(vetorizador).transform(originais))
+        valores = [converter(valor) for valor in preditos]
     except Exception as e:
-        print(f"Erro ao predizer preço: {e}")
-        return 500.0
+        print(f"Erro ao predizer {tipo}: {e}")
+        return [padrao] * len(descricoes)
+    for (descricao, posicoes), valor in zip(pendentes.values(), valores):
+        if versao is not None:
+            prediction_cache.put(tipo, descricao, versao, valor)
+        for posicao in posicoes:
+            resultados[posicao] = valor
+    return resultados
+
+def predizer_precos(descricoes: List[str]) -> List[float]:
+    """Prediz os preços de várias descrições numa única passada pelo modelo"""
+    return _predizer_lote("preço", descricoes, "price_vectorizer", "price_model", float, 500.0)
+
+def predizer_categorias(descricoes: List[str]) -> List[str]:
+    """Prediz as categorias de várias descrições numa única passada pelo modelo"""
+    return _predizer_lote("categoria", descricoes, "category_vectorizer", "category_model", str, "Serviços Gerais")
+
+def predizer_preco(descricao: str) -> float:
+    """Prediz preço baseado na descrição do serviço (com cache; o valor padrão nunca é guardado)"""
+    return predizer_precos([descricao])[0]
 
 def predizer_categoria(descricao: str) -> str:
-    """Prediz categoria baseada na descrição do serviço"""
-    if not MODELS_LOADED:
-        return "Serviços Gerais"
+    """Prediz categoria baseada na descrição do serviço (com cache; o valor padrão nunca é guardado)"""
+    return predizer_categorias([descricao])[0]
+
+def _limites(valor_sugerido: float, categoria_predita: str) -> Dict[str, float]:
+    valor_minimo = valor_sugerido * 0.7
+    valor_maximo = valor_sugerido * 1.5
     
-    try:
-        X = category_vectorizer.transform([descricao])
-        categoria = category_model.predict(X)[0]
-        return str(categoria)
-    except Exception as e:
-        print(f"Erro ao predizer categoria: {e}")
-        return "Serviços Gerais"
+    return {
+        "valor_minimo": round(valor_minimo, 2),
+        "valor_sugerido": round(valor_sugerido, 2),
+        "valor_maximo": round(valor_maximo, 2),
+        "categoria_predita": categoria_predita
+    }
 
 def calcular_limites_preco(
     categoria: str,
@@ -64,19 +116,46 @@ def calcular_limites_preco(
     - Valor sugerido: predição do ML
     - Valor mínimo: 70% do valor sugerido
     - Valor máximo: 150% do valor sugerido
+    
+    As duas predições passam pelo cache (ml_cache): pedidos repetidos
+    da mesma solicitação não rodam os modelos de novo.
     """
     texto_completo = f"{categoria} {descricao} {localizacao}"
     valor_sugerido = predizer_preco(texto_completo)
-    
-    valor_minimo = valor_sugerido * 0.7
-    valor_maximo = valor_sugerido * 1.5
-    
-    return {
-        "valor_minimo": round(valor_minimo, 2),
-        "valor_sugerido": round(valor_sugerido, 2),
-        "valor_maximo": round(valor_maximo, 2),
-        "categoria_predita": predizer_categoria(descricao)
-    }
+    return _limites(valor_sugerido, predizer_categoria(descricao))
+
+# ============= MICRO-BATCHING (ROTAS) =============
+
+# Predições de requisições concorrentes viram um único predict em lote (ml_batcher)
+batcher_precos = MicroBatcher(lambda descricoes: predizer_precos(descricoes))
+batcher_categorias = MicroBatcher(lambda descricoes: predizer_categorias(descricoes))
+
+async def predizer_preco_async(descricao: str) -> float:
+    """predizer_preco agrupado com as chamadas concorrentes, sem bloquear o event loop"""
+    return await batcher_precos.submit(descricao)
+
+async def predizer_categoria_async(descricao: str) -> str:
+    """predizer_categoria agrupado com as chamadas concorrentes, sem bloquear o event loop"""
+    return await batcher_categorias.submit(descricao)
+
+async def calcular_limites_preco_async(categoria: str, descricao: str, localizacao: str) -> Dict[str, float]:
+    """calcular_limites_preco com as duas predições nos micro-batchers"""
+    valor_sugerido, categoria_predita = await asyncio.gather(
+        predizer_preco_async(f"{categoria} {descricao} {localizacao}"),
+        predizer_categoria_async(descricao)
+    )
+    return _limites(valor_sugerido, categoria_predita)
+
+def calcular_limites_preco_agrupado(categoria: str, descricao: str, localizacao: str) -> Dict[str, float]:
+    """Ponte síncrona para rotas `def` (executadas pelo FastAPI no threadpool do anyio).
+
+    Entrega o cálculo aos micro-batchers no event loop e espera o resultado;
+    fora de uma thread do anyio (scripts, testes) calcula direto. Erros das
+    predições ou dos micro-batchers são propagados.
+    """
+    if getattr(anyio.from_thread.threadlocals, "current_token", None) is None:
+        return calcular_limites_preco(categoria, descricao, localizacao)
+    return anyio.from_thread.run(calcular_limites_preco_async, categoria, descricao, localizacao)
 
 # ============= CLASSE PARA COMPATIBILIDADE COM CÓDIGO ANTIGO =============
 
@@ -95,6 +174,10 @@ class MLService:
         """Prediz categoria"""
         return predizer_categoria(name)
     
+    async def predict_category_async(self, name: str) -> str:
+        """Prediz categoria pelo micro-batcher"""
+        return await predizer_categoria_async(name)
+    
     def predict_price(self, name: str, category: str = None) -> dict:
         """Prediz preço"""
         texto = f"{category} {name}" if category else name
@@ -105,6 +188,36 @@ class MLService:
             "max_price": preco * 1.2
         }
     
+    async def predict_price_async(self, name: str, category: str = None) -> dict:
+        """Prediz preço pelo micro-batcher"""
+        texto = f"{category} {name}" if category else name
+        preco = await predizer_preco_async(texto)
+        return {
+            "suggested_price": preco,
+            "min_price": preco * 0.8,
+            "max_price": preco * 1.2
+        }
+    
+    def predict_batch(self, items: List[Tuple[str, Optional[str]]]) -> List[dict]:
+        """Prediz categoria e preço de vários (nome, categoria opcional) de uma vez.
+
+        Mesmo resultado de predict_category/predict_price item a item, com um
+        predict para as categorias que faltam e um para os preços.
+        """
+        sem_categoria = [name for name, category in items if not category]
+        preditas = iter(predizer_categorias(sem_categoria) if sem_categoria else [])
+        precos = predizer_precos([f"{category} {name}" if category else name for name, category in items])
+        return [
+            {
+                "service_name": name,
+                "category": category or next(preditas),
+                "suggested_price": preco,
+                "min_price": preco * 0.8,
+                "max_price": preco * 1.2
+            }
+            for (name, category), preco in zip(items, precos)
+        ]
+    
     def generate_professional_description(self, name: str, category: str) -> str:
         """Gera descrição profissional"""
         return f"Serviço de {category}: {name}"
@@ -0,0 +1,132 @@
+"""
+Inferência de ML em processos separados
+
+Com ML_INFERENCE_MODE=process, a avaliação das florestas (CPU puro, presa ao
+GIL) sai do processo da API: um pool de ML_INFERENCE_WORKERS processos, cada
+um com a sua cópia dos modelos lida uma única vez ao iniciar, recebe os textos
+por IPC e devolve as predições. O processo da API não carrega os modelos; o
+cache (ml_cache) e o micro-batching (ml_batcher) continuam nele, então só os
+textos ainda não preditos atravessam o IPC.
+"""
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional
+from ..core.config import ML_INFERENCE_MODE, ML_INFERENCE_WORKERS, ML_MODELS_DIR
+from .ml_registry import ModelRegistry, models_fingerprint
+
+# Lotes menores que isso por processo não compensam o custo do IPC
+MIN_CHUNK_SIZE = 64
+
+# Registro dos modelos dentro de cada processo de inferência (None no processo da API)
+_worker_registry: Optional[ModelRegistry] = None
+
+
+def _init_worker(models_dir: str):
+    """Inicializador de cada processo do pool: lê os modelos uma vez"""
+    global _worker_registry
+    _worker_registry = ModelRegistry(models_dir)
+    _worker_registry.load()
+
+
+def _worker_status() -> Dict[str, Any]:
+    status = _worker_registry.status() if _worker_registry is not None else {"ready": False}
+    return {"pid": os.getpid(), **status}
+
+
+def _predict_in_worker(vectorizer: str, model: str, texts: List[str]) -> List[Any]:
+    """transform + predict no processo de inferência (devolve tipos nativos, baratos de serializar)"""
+    if _worker_registry is None or not _worker_registry.ready:
+        error = _worker_registry.status()["error"] if _worker_registry is not None else None
+        raise RuntimeError(f"Modelos não carregados no processo de inferência {os.getpid()}: {error}")
+    X = _worker_registry.get(vectorizer).transform(texts)
+    return _worker_registry.get(model).predict(X).tolist()
+
+
+class ProcessInference:
+    """Pool de processos de inferência, criado na primeira predição (ou no warm_up)"""
+
+    def __init__(self, workers: int = ML_INFERENCE_WORKERS, models_dir: str = ML_MODELS_DIR):
+        self.workers = max(1, workers)
+        self.models_dir = models_dir
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # spawn: o processo da API tem threads (uvicorn, executores), que o fork não copia
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.models_dir,)
+                )
+            return self._pool
+
+    def models_version(self) -> Optional[str]:
+        """Versão dos arquivos de modelo (chave do cache), sem carregá-los neste processo"""
+        return models_fingerprint(self.models_dir)
+
+    def predict(self, vectorizer: str, model: str, texts: List[str]) -> List[Any]:
+        """Predições dos textos, com lotes grandes divididos entre os processos"""
+        if not texts:
+            return []
+        chunks = max(1, min(self.workers, math.ceil(len(texts) / MIN_CHUNK_SIZE)))
+        size = math.ceil(len(texts) / chunks)
+        pool = self._executor()
+        try:
+            futures = [
+                pool.submit(_predict_in_worker, vectorizer, model, texts[start:start + size])
+                for start in range(0, len(texts), size)
+            ]
+            return [value for future in futures for value in future.result()]
+        except BrokenProcessPool:
+            # Um processo morreu (ex.: OOM): o próximo pedido cria um pool novo
+            self._discard(pool)
+            raise
+
+    def warm_up(self) -> List[Dict[str, Any]]:
+        """Sobe os processos e espera cada um carregar os modelos (startup)"""
+        futures = [self._executor().submit(_worker_status) for _ in range(self.workers)]
+        return [future.result() for future in futures]
+
+    def _discard(self, pool: ProcessPoolExecutor):
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    def status(self) -> Dict[str, Any]:
+        """Estado para /ml/status (não cria o pool)"""
+        return {
+            "mode": "process",
+            "workers": self.workers,
+            "started": self._pool is not None,
+            "models_version": self.models_version(),
+        }
+
+
+# Pool do processo da API; None no modo "thread" (inferência na thread do ml_batcher)
+process_inference: Optional[ProcessInference] = ProcessInference() if ML_INFERENCE_MODE == "process" else None
+
+
+def inference_status() -> Dict[str, Any]:
+    if process_inference is None:
+        return {"mode": "thread", "workers": 1}
+    return process_inference.status()
+
+
+def shutdown_workers():
+    """Encerra os processos de inferência (os lotes em andamento terminam antes)"""
+    if process_inference is not None:
+        process_inference.shutdown()
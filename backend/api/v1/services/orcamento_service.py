@@ -3,6 +3,7 @@ Serviço de Orçamentos
 """
 from sqlalchemy.orm import Session
 from typing import List, Optional
+from datetime import datetime, timezone
 from ..models.db_models import Orcamento, Solicitacao, StatusOrcamento, StatusSolicitacao
 from ..schemas import OrcamentoCreate
 from fastapi import HTTPException
@@ -108,6 +109,7 @@ def aceitar_orcamento(
     
     # Aceita o orçamento escolhido
     orcamento.status = StatusOrcamento.ACEITO
+    orcamento.aceito_em = datetime.now(timezone.utc)
     
     # Recusa os demais orçamentos
     outros_orcamentos = db.query(Orcamento).filter(
@@ -4,7 +4,7 @@ Serviço de Orçamentos usando Supabase REST
 from typing import Optional, List, Dict, Any
 from ..services.supabase_service import supabase_service
 from ..schemas import OrcamentoCreate
-from datetime import datetime
+from datetime import datetime, timezone
 
 # ============= ORÇAMENTOS =============
 
@@ -110,13 +110,20 @@ def aceitar_orcamento(orcamento_id: int, cliente_id: int) -> Optional[Dict[str,
         except Exception:
             inicio_iso = None
 
-        update_data = {"status": "aceito"}
+        update_data = {"status": "aceito", "aceito_em": datetime.now(timezone.utc).isoformat()}
         if inicio_iso:
             # garante string em ISO; se já vier ISO do Supabase só reaproveita
             update_data["datetime_inicio"] = inicio_iso
 
         # Atualiza status para aceito + datetime_inicio (se definido)
-        response = supabase_service.get_client().table("orcamentos").update(update_data).eq("id", orcamento_id).execute()
+        try:
+            response = supabase_service.get_client().table("orcamentos").update(update_data).eq("id", orcamento_id).execute()
+        except Exception as e:
+            # Base sem a coluna aceito_em (ver supabase_sql_commands.sql): aceita sem registrar o momento
+            if "aceito_em" not in str(e):
+                raise
+            update_data.pop("aceito_em")
+            response = supabase_service.get_client().table("orcamentos").update(update_data).eq("id", orcamento_id).execute()
         
         if response.data:
             # Atualiza status da solicitação para "com_orcamentos"
@@ -0,0 +1,125 @@
+"""
+Benchmark de /analytics/services e /analytics/clients: laços vs. groupby
+
+Compara as implementações originais (para cada serviço/cliente, percorrer
+todos os orçamentos e itens) com o cálculo atual por groupby sobre as abas.
+O laço original é O(serviços × itens) e só é medido enquanto esse produto
+couber em --legacy-limit; acima disso a coluna fica com "—".
+
+Uso (a partir de backend/):
+    python benchmarks/bench_analytics.py
+    python benchmarks/bench_analytics.py --sizes 1000:10000 10000:100000
+"""
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.v1.services.excel_service import ExcelService  # noqa: E402
+from benchmarks.synthetic_store import gerar_frames, carregar_no_snapshot  # noqa: E402
+
+
+def legacy_services(services, quotes):
+    """Implementação original de get_services_analytics"""
+    service_analytics = []
+    for service in services:
+        service_items = []
+        for quote in quotes:
+            for item in quote.items:
+                if item.service_id == service.id:
+                    service_items.append(item)
+        if service_items:
+            prices = [item.unit_price for item in service_items]
+            quantities = [item.quantity for item in service_items]
+            service_analytics.append({
+                "service_id": service.id,
+                "service_name": service.name,
+                "unit": service.unit,
+                "base_price": service.unit_price,
+                "avg_price_used": sum(prices) / len(prices),
+                "min_price": min(prices),
+                "max_price": max(prices),
+                "total_usage": sum(quantities),
+                "times_used": len(service_items)
+            })
+    service_analytics.sort(key=lambda x: x["times_used"], reverse=True)
+    return service_analytics
+
+
+def legacy_clients(clients, quotes):
+    """Implementação original de get_clients_analytics"""
+    client_analytics = []
+    for client in clients:
+        client_quotes = [q for q in quotes if q.client_id == client.id]
+        if client_quotes:
+            total_spent = sum(quote.total for quote in client_quotes)
+            client_analytics.append({
+                "client_id": client.id,
+                "client_name": client.name,
+                "quotes_count": len(client_quotes),
+                "total_spent": total_spent,
+                "avg_quote_value": total_spent / len(client_quotes),
+                "last_quote_date": max(quote.created_at for quote in client_quotes).isoformat()
+            })
+    client_analytics.sort(key=lambda x: x["total_spent"], reverse=True)
+    return client_analytics
+
+
+def medir(func, *args):
+    gc.collect()
+    inicio = time.perf_counter()
+    resultado = func(*args)
+    return time.perf_counter() - inicio, resultado
+
+
+def iguais(esperado, obtido):
+    """Compara as listas com tolerância de ponto flutuante (soma em outra ordem)"""
+    if len(esperado) != len(obtido):
+        return False
+    for a, b in zip(esperado, obtido):
+        for chave, valor in a.items():
+            if isinstance(valor, float):
+                if abs(valor - b[chave]) > 1e-6 * max(1.0, abs(valor)):
+                    return False
+            elif valor != b[chave]:
+                return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", nargs="+", default=["100:10000", "1000:10000", "10000:100000"],
+                        help="pares serviços:itens")
+    parser.add_argument("--legacy-limit", type=float, default=2e7,
+                        help="maior serviços × itens medido com o laço original")
+    args = parser.parse_args()
+
+    print(f"{'rota':>8} | {'serviços':>8} | {'itens':>7} | {'laço (s)':>9} | {'groupby (s)':>11} | iguais")
+    with tempfile.TemporaryDirectory() as tmp:
+        service = ExcelService(file_path=os.path.join(tmp, "bench.xlsx"))
+        for size in args.sizes:
+            n_services, n_items = (int(part) for part in size.split(":"))
+            n_quotes = n_items // 2
+            carregar_no_snapshot(service, gerar_frames(n_quotes=n_quotes, n_services=n_services))
+            quotes = service.get_all_quotes()
+            for rota, custo, legado, entradas, atual, chave in (
+                ('services', n_services * n_items, legacy_services, service.get_all_services,
+                 service.get_services_analytics, 'services'),
+                ('clients', len(service.get_all_clients()) * n_quotes, legacy_clients, service.get_all_clients,
+                 service.get_clients_analytics, 'clients'),
+            ):
+                depois, obtido = medir(atual)
+                if custo <= args.legacy_limit:
+                    antes, esperado = medir(legado, entradas(), quotes)
+                    coluna, confere = f"{antes:9.3f}", "sim" if iguais(esperado, obtido[chave]) else "NÃO"
+                else:
+                    coluna, confere = f"{'—':>9}", "—"
+                print(f"{rota:>8} | {n_services:>8} | {n_items:>7} | {coluna} | {depois:11.4f} | {confere}")
+
+
+if __name__ == "__main__":
+    main()
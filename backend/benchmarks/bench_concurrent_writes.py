@@ -0,0 +1,82 @@
+"""
+Benchmark de gravações concorrentes no ExcelService (vários workers/threads)
+
+Simula vários workers do gunicorn/uvicorn criando clientes e orçamentos na
+mesma base ao mesmo tempo, mede a vazão e confere que nenhum id se repetiu.
+
+Uso (a partir de backend/):
+    python benchmarks/bench_concurrent_writes.py
+    python benchmarks/bench_concurrent_writes.py --processes 1 4 8 --threads 4 --ops 50 --engine sqlite
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.v1.models import ClientCreate, QuoteCreate, QuoteItemCreate, ServiceCreate  # noqa: E402
+from api.v1.services.excel_service import ExcelService  # noqa: E402
+
+
+def _worker(args):
+    """Um processo: `threads` threads gravando `ops` vezes cada na mesma instância"""
+    file_path, engine, threads, ops = args
+    service = ExcelService(file_path=file_path, engine=engine)
+
+    def gravar(_):
+        ids = []
+        for i in range(ops):
+            cliente = service.create_client(ClientCreate(name=f"Cliente {os.getpid()}-{i}"))
+            orcamento = service.create_quote(QuoteCreate(
+                client_id=cliente.id,
+                title="Orçamento",
+                items=[QuoteItemCreate(service_id=1, quantity=2, unit_price=50.0)]
+            ))
+            ids.append((cliente.id, orcamento.id, orcamento.quote_number))
+        return ids
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        return [registro for parcial in pool.map(gravar, range(threads)) for registro in parcial]
+
+
+def rodar(tmp, engine, processes, threads, ops):
+    extensao = "xlsx" if engine == "xlsx" else "sqlite3"
+    file_path = os.path.join(tmp, f"bench_{engine}_{processes}x{threads}.{extensao}")
+    ExcelService(file_path=file_path, engine=engine).create_service(ServiceCreate(name="Pintura", unit_price=50.0))
+
+    contexto = multiprocessing.get_context("fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn")
+    inicio = time.perf_counter()
+    with contexto.Pool(processes) as pool:
+        resultados = pool.map(_worker, [(file_path, engine, threads, ops)] * processes)
+    duracao = time.perf_counter() - inicio
+
+    registros = [registro for parcial in resultados for registro in parcial]
+    total = len(registros)
+    unicos = all(len({registro[i] for registro in registros}) == total for i in range(3))
+    relido = ExcelService(file_path=file_path, engine=engine)
+    persistidos = len(relido.get_all_quotes())
+    return total, duracao, unicos and persistidos == total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--threads", type=int, default=4, help="threads por processo")
+    parser.add_argument("--ops", type=int, default=25, help="cliente + orçamento por thread")
+    parser.add_argument("--engine", choices=["xlsx", "sqlite"], default="xlsx")
+    args = parser.parse_args()
+
+    print(f"{'processos':>9} | {'threads':>7} | {'transações':>10} | {'tempo (s)':>9} | {'tx/s':>7} | ids únicos")
+    with tempfile.TemporaryDirectory() as tmp:
+        for processes in args.processes:
+            total, duracao, ok = rodar(tmp, args.engine, processes, args.threads, args.ops)
+            print(f"{processes:>9} | {args.threads:>7} | {total * 2:>10} | {duracao:9.2f} | "
+                  f"{total * 2 / duracao:7.1f} | {'sim' if ok else 'NÃO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark de latência de cauda com carga mista (rotas legadas + marketplace)
+
+Enquanto várias tarefas chamam as rotas legadas (listagens completas e
+paginadas de /quotes, criação de clientes), uma sonda mede a latência de uma
+rota leve que não usa a base legada (/health, no lugar do tráfego do
+marketplace). Uma sonda com poucas amostras indica que o event loop ficou
+travado pela carga legada. Compara o modo "bloqueante" (ExcelService chamado direto no
+event loop, como antes da fachada assíncrona) com o modo "pool" (excel_io).
+
+Uso (a partir de backend/):
+    python benchmarks/bench_event_loop_latency.py
+    python benchmarks/bench_event_loop_latency.py --quotes 20000 --legacy-tasks 8 --seconds 10
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+import httpx
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.v1.services.excel_async import AsyncExcelService  # noqa: E402
+from api.v1.services.excel_service import ExcelService  # noqa: E402
+from benchmarks.synthetic_store import gerar_frames, carregar_no_snapshot  # noqa: E402
+from main import app  # noqa: E402
+
+ROTAS_LEGADAS = ["clients", "quotes", "services", "analytics", "imports"]
+
+
+async def _inline(self, fn, *args, **kwargs):
+    """Executa no próprio event loop, como as rotas faziam antes da fachada"""
+    return fn(*args, **kwargs)
+
+
+async def carga_legada(client, fim, contador):
+    i = 0
+    while time.perf_counter() < fim:
+        if i % 3 == 0:
+            await client.get("/api/v1/quotes")
+        elif i % 3 == 1:
+            await client.get("/api/v1/quotes", params={"limit": 50, "status": "approved"})
+        else:
+            await client.post("/api/v1/clients", json={"name": f"Cliente {i}"})
+        contador[0] += 1
+        i += 1
+        # Sem rede no meio (ASGITransport), cede o loop entre requisições como faria um socket
+        await asyncio.sleep(0)
+
+
+async def sonda(client, fim, intervalo):
+    latencias = []
+    while time.perf_counter() < fim:
+        inicio = time.perf_counter()
+        await client.get("/health")
+        latencias.append(time.perf_counter() - inicio)
+        await asyncio.sleep(intervalo)
+    return latencias
+
+
+async def rodar(service, legacy_tasks, seconds):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        fim = time.perf_counter() + seconds
+        contador = [0]
+        tarefas = [asyncio.create_task(carga_legada(client, fim, contador)) for _ in range(legacy_tasks)]
+        latencias = await sonda(client, fim, 0.01)
+        await asyncio.gather(*tarefas)
+    return np.array(latencias) * 1000, contador[0] / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--quotes", type=int, default=5000)
+    parser.add_argument("--legacy-tasks", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"{'modo':>11} | {'req. legadas/s':>14} | {'amostras':>8} | {'sonda p50 (ms)':>14} | "
+          f"{'p95 (ms)':>8} | {'p99 (ms)':>8} | {'máx (ms)':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        service = ExcelService(file_path=os.path.join(tmp, "bench.xlsx"))
+        carregar_no_snapshot(service, gerar_frames(n_quotes=args.quotes))
+        service.get_all_quotes()
+        excel_io = AsyncExcelService(service)
+        for modo in ("bloqueante", "pool"):
+            patches = [patch(f"api.v1.routes.{rota}.excel_io", excel_io) for rota in ROTAS_LEGADAS]
+            if modo == "bloqueante":
+                patches.append(patch.object(AsyncExcelService, "run", _inline))
+            for p in patches:
+                p.start()
+            try:
+                latencias, vazao = asyncio.run(rodar(service, args.legacy_tasks, args.seconds))
+            finally:
+                for p in patches:
+                    p.stop()
+            p50, p95, p99 = np.percentile(latencias, [50, 95, 99])
+            print(f"{modo:>11} | {vazao:14.1f} | {len(latencias):8d} | {p50:14.2f} | "
+                  f"{p95:8.2f} | {p99:8.2f} | {latencias.max():8.2f}")
+        excel_io.shutdown()
+
+
+if __name__ == "__main__":
+    main()
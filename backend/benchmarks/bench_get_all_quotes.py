@@ -0,0 +1,103 @@
+"""
+Benchmark de ExcelService.get_all_quotes: join indexado vs. laço original
+
+Uso (a partir de backend/):
+    python benchmarks/bench_get_all_quotes.py
+    python benchmarks/bench_get_all_quotes.py --sizes 1000 10000 --legacy-max 1000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.v1.models import Client, Quote, QuoteItem  # noqa: E402
+from api.v1.services.excel_service import ExcelService  # noqa: E402
+from benchmarks.synthetic_store import gerar_frames, carregar_no_snapshot  # noqa: E402
+
+
+def legacy_get_all_quotes(frames):
+    """Implementação original (iterrows + filtro booleano por orçamento/item)"""
+    quotes_df = frames['quotes']
+    clients_df = frames['clients']
+    quote_items_df = frames['quote_items']
+    services_df = frames['services']
+
+    quotes = []
+    for _, quote_row in quotes_df.iterrows():
+        client_row = clients_df[clients_df['id'] == quote_row['client_id']].iloc[0]
+        client = Client(
+            id=int(client_row['id']),
+            name=client_row['name'],
+            created_at=datetime.fromisoformat(client_row['created_at']),
+            updated_at=datetime.fromisoformat(client_row['updated_at'])
+        )
+        items = []
+        quote_items = quote_items_df[quote_items_df['quote_id'] == quote_row['id']]
+        for _, item_row in quote_items.iterrows():
+            service_row = services_df[services_df['id'] == item_row['service_id']].iloc[0]
+            items.append(QuoteItem(
+                id=int(item_row['id']),
+                service_id=int(item_row['service_id']),
+                quantity=float(item_row['quantity']),
+                unit_price=float(item_row['unit_price']),
+                total_price=float(item_row['total_price']),
+                service_name=service_row['name'],
+                service_unit=service_row['unit']
+            ))
+        quotes.append(Quote(
+            id=int(quote_row['id']),
+            quote_number=quote_row['quote_number'],
+            client_id=int(quote_row['client_id']),
+            title=quote_row['title'],
+            description=quote_row['description'] if pd.notna(quote_row['description']) else None,
+            status=quote_row['status'],
+            total=float(quote_row['total']),
+            created_at=datetime.fromisoformat(quote_row['created_at']),
+            updated_at=datetime.fromisoformat(quote_row['updated_at']),
+            client=client,
+            items=items
+        ))
+    return quotes
+
+
+def medir(func):
+    inicio = time.perf_counter()
+    resultado = func()
+    return time.perf_counter() - inicio, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--legacy-max", type=int, default=10000,
+                        help="maior tamanho em que o laço original é executado")
+    args = parser.parse_args()
+
+    print(f"{'orçamentos':>10} | {'itens':>7} | {'original (s)':>12} | {'indexado frio (s)':>17} | {'indexado quente (s)':>19}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.sizes:
+            frames = gerar_frames(n_quotes=n)
+            service = ExcelService(file_path=os.path.join(tmp, f"bench_{n}.xlsx"))
+            carregar_no_snapshot(service, frames)
+
+            frio, novos = medir(service.get_all_quotes)
+            quente, _ = medir(service.get_all_quotes)
+
+            if n <= args.legacy_max:
+                original, antigos = medir(lambda: legacy_get_all_quotes(frames))
+                assert [q.model_dump() for q in antigos] == [q.model_dump() for q in novos]
+                original_txt = f"{original:12.3f}"
+            else:
+                original_txt = f"{'-':>12}"
+
+            print(f"{n:>10} | {len(frames['quote_items']):>7} | {original_txt} | {frio:17.3f} | {quente:19.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark da predição em lote: uma chamada por item vs. predizer_precos/categorias
+
+Mede a latência por item (preço + categoria) para lotes de 1, 32 e 1024
+descrições distintas, com o cache de predições vazio em cada medida, usando
+os modelos de backend/models.
+
+Uso (a partir de backend/):
+    python benchmarks/bench_ml_batch.py
+    python benchmarks/bench_ml_batch.py --sizes 1 8 64 512 --repeat 5
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.v1.services import ml_service  # noqa: E402
+from api.v1.services.ml_cache import prediction_cache  # noqa: E402
+from api.v1.services.ml_registry import model_registry  # noqa: E402
+
+SERVICOS = ["Pintura", "Instalação", "Troca", "Conserto", "Limpeza", "Montagem", "Reparo", "Manutenção"]
+OBJETOS = ["parede", "chuveiro", "tomada", "telhado", "piso", "armário", "portão", "ar-condicionado"]
+LOCAIS = ["São Paulo", "Campinas", "Jacareí", "São José dos Campos"]
+
+
+def descricoes(n):
+    """n descrições distintas (o número no fim evita acertos no cache)"""
+    return [
+        f"{SERVICOS[i % len(SERVICOS)]} de {OBJETOS[(i // 8) % len(OBJETOS)]} em {LOCAIS[i % len(LOCAIS)]} {i}"
+        for i in range(n)
+    ]
+
+
+def medir(func, textos, repeat):
+    melhor = float("inf")
+    for _ in range(repeat):
+        prediction_cache.clear()
+        gc.collect()
+        inicio = time.perf_counter()
+        func(textos)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def um_a_um(textos):
+    return [(ml_service.predizer_preco(t), ml_service.predizer_categoria(t)) for t in textos]
+
+
+def em_lote(textos):
+    return list(zip(ml_service.predizer_precos(textos), ml_service.predizer_categorias(textos)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", type=int, default=[1, 32, 1024], help="tamanhos de lote")
+    parser.add_argument("--repeat", type=int, default=3, help="repetições (vale a melhor)")
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    if not model_registry.load():
+        sys.exit(f"Modelos não carregados: {model_registry.status()['error']}")
+
+    print(f"{'lote':>6} | {'um a um (ms/item)':>17} | {'em lote (ms/item)':>17} | {'ganho':>6} | iguais")
+    for n in args.sizes:
+        textos = descricoes(n)
+        prediction_cache.clear()
+        iguais = um_a_um(textos) == (prediction_cache.clear() or em_lote(textos))
+        antes = medir(um_a_um, textos, args.repeat) / n * 1000
+        depois = medir(em_lote, textos, args.repeat) / n * 1000
+        print(f"{n:>6} | {antes:17.3f} | {depois:17.3f} | {antes / depois:5.1f}x | {'sim' if iguais else 'NÃO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark das florestas: predict do scikit-learn vs. avaliação compilada (ml_forest)
+
+Para os modelos de preço e de categoria de backend/models, mede a latência do
+predict (só o modelo; o TF-IDF é calculado antes) em lotes de 1, 8, 64 e 1024
+descrições: o sklearn como salvo no .pkl (n_jobs do treino), o sklearn com
+n_jobs=1 e a floresta compilada (que acima de MAX_COMPILED_ROWS repassa o
+lote ao sklearn, marcado com *). A coluna "iguais" confere que as predições
+compiladas são idênticas, bit a bit, às do sklearn com n_jobs=1.
+
+Uso (a partir de backend/):
+    python benchmarks/bench_ml_forest.py
+    python benchmarks/bench_ml_forest.py --sizes 1 16 256 --repeat 20
+"""
+import argparse
+import copy
+import os
+import statistics
+import sys
+import time
+import warnings
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.v1.services.ml_forest import MAX_COMPILED_ROWS  # noqa: E402
+from api.v1.services.ml_registry import ModelRegistry  # noqa: E402
+from bench_ml_batch import descricoes  # noqa: E402
+
+MODELOS = (("preço", "price_model", "price_vectorizer"), ("categoria", "category_model", "category_vectorizer"))
+
+
+def medir(predict, X, repeat):
+    """Mediana do tempo de `predict(X)` em ms"""
+    tempos = []
+    for _ in range(repeat):
+        inicio = time.perf_counter()
+        predict(X)
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tempos)
+
+
+def iguais(a, b):
+    if a.dtype.kind == "f":
+        return np.array_equal(a.view(np.int64), b.view(np.int64))
+    return np.array_equal(a, b)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", type=int, default=[1, 8, 64, 1024], help="tamanhos de lote")
+    parser.add_argument("--repeat", type=int, default=15, help="repetições (vale a mediana)")
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    original = ModelRegistry(compile_forests=False)
+    if not original.load():
+        sys.exit(f"Modelos não carregados: {original.status()['error']}")
+    compilado = ModelRegistry(compile_forests=True)
+    compilado.load()
+
+    print(f"{'modelo':>9} | {'lote':>5} | {'sklearn .pkl (ms)':>17} | {'sklearn n_jobs=1':>16} | "
+          f"{'compilado (ms)':>14} | {'ganho':>6} | iguais")
+    for rotulo, modelo, vetorizador in MODELOS:
+        sklearn = original.get(modelo)
+        sequencial = copy.copy(sklearn)
+        sequencial.n_jobs = 1
+        floresta = compilado.get(modelo)
+        for n in args.sizes:
+            X = original.get(vetorizador).transform(descricoes(n))
+            tempo_pkl = medir(sklearn.predict, X, args.repeat)
+            tempo_seq = medir(sequencial.predict, X, args.repeat)
+            tempo_compilado = medir(floresta.predict, X, args.repeat)
+            ok = iguais(floresta.predict(X), sequencial.predict(X))
+            marca = "*" if n > MAX_COMPILED_ROWS else " "
+            print(f"{rotulo:>9} | {n:>5} | {tempo_pkl:17.3f} | {tempo_seq:16.3f} | {tempo_compilado:13.3f}{marca} | "
+                  f"{min(tempo_pkl, tempo_seq) / tempo_compilado:5.1f}x | {'sim' if ok else 'NÃO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark dos modos de inferência: na thread (GIL da API) vs. pool de processos
+
+Vários clientes concorrentes (threads, como o threadpool das rotas) pedem
+preço + categoria de lotes de descrições distintas, com o cache de predições
+desligado. Para cada modo mede a vazão (itens/s) e, ao mesmo tempo, a latência
+de um "handler leve" (um pouco de Python puro numa outra thread), que no modo
+"thread" disputa o GIL com a avaliação das florestas.
+
+O ganho de vazão do modo "process" depende dos núcleos livres: com um único
+núcleo os processos só dividem a mesma CPU, e o que sobra é o custo do IPC.
+
+Uso (a partir de backend/):
+    python benchmarks/bench_ml_inference_mode.py
+    python benchmarks/bench_ml_inference_mode.py --workers 1 2 4 --clients 8 --batch 32 --duration 5
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.v1.services import ml_service, ml_workers  # noqa: E402
+from api.v1.services.ml_cache import prediction_cache  # noqa: E402
+from api.v1.services.ml_registry import model_registry  # noqa: E402
+from bench_ml_batch import descricoes  # noqa: E402
+
+
+def handler_leve():
+    """Trabalho de uma rota simples (validação, serialização): ~0,1 ms de Python puro"""
+    return sum(i * i for i in range(2000))
+
+
+def rodar(clientes, lote, duracao):
+    """(itens/s, p50 e p99 do handler leve em ms) com `clientes` threads pedindo lotes"""
+    parar = threading.Event()
+    itens = [0] * clientes
+
+    def cliente(indice):
+        rodada = 0
+        while not parar.is_set():
+            # Textos novos a cada rodada: nada vem do cache nem se repete no lote
+            textos = [f"{t} c{indice} r{rodada}" for t in descricoes(lote)]
+            ml_service.predizer_precos(textos)
+            ml_service.predizer_categorias(textos)
+            itens[indice] += lote
+            rodada += 1
+
+    latencias = []
+
+    def sonda():
+        while not parar.is_set():
+            inicio = time.perf_counter()
+            handler_leve()
+            latencias.append((time.perf_counter() - inicio) * 1000)
+            time.sleep(0.005)
+
+    threads = [threading.Thread(target=cliente, args=(i,)) for i in range(clientes)]
+    threads.append(threading.Thread(target=sonda))
+    inicio = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(duracao)
+    parar.set()
+    for thread in threads:
+        thread.join()
+    decorrido = time.perf_counter() - inicio
+    latencias.sort()
+    p99 = latencias[min(len(latencias) - 1, int(len(latencias) * 0.99))]
+    return sum(itens) / decorrido, statistics.median(latencias), p99
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", nargs="+", type=int, default=sorted({1, 2, os.cpu_count() or 1}),
+                        help="tamanhos do pool de processos")
+    parser.add_argument("--clients", type=int, default=8, help="threads clientes concorrentes")
+    parser.add_argument("--batch", type=int, default=32, help="descrições por pedido")
+    parser.add_argument("--duration", type=float, default=5, help="segundos por medida")
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    # Cache desligado: toda predição passa pelos modelos
+    prediction_cache.maxsize = 0
+    print(f"núcleos: {os.cpu_count()} | clientes: {args.clients} | lote: {args.batch} | {args.duration:g}s por medida")
+    print(f"{'modo':>12} | {'itens/s':>9} | {'handler leve p50 (ms)':>21} | {'p99 (ms)':>8}")
+
+    ml_workers.process_inference = None
+    if not model_registry.load():
+        sys.exit(f"Modelos não carregados: {model_registry.status()['error']}")
+    vazao, p50, p99 = rodar(args.clients, args.batch, args.duration)
+    print(f"{'thread':>12} | {vazao:9.0f} | {p50:21.2f} | {p99:8.2f}")
+
+    for workers in args.workers:
+        pool = ml_workers.ProcessInference(workers=workers)
+        if not all(worker["ready"] for worker in pool.warm_up()):
+            sys.exit("Modelos não carregados nos processos de inferência")
+        ml_workers.process_inference = pool
+        try:
+            vazao, p50, p99 = rodar(args.clients, args.batch, args.duration)
+        finally:
+            ml_workers.process_inference = None
+            pool.shutdown()
+        print(f"{f'process x{workers}':>12} | {vazao:9.0f} | {p50:21.2f} | {p99:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Micro-benchmark da montagem de Client/Service: iterrows vs. caminho colunar
+
+Compara, por linha, o laço original (iterrows + datetime.fromisoformat +
+construtor validado) com o caminho atual (datas convertidas em bloco e
+model_construct) sobre abas sintéticas.
+
+Uso (a partir de backend/):
+    python benchmarks/bench_model_materialisation.py
+    python benchmarks/bench_model_materialisation.py --rows 10000 100000
+"""
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.v1.models import Client, Service  # noqa: E402
+from api.v1.services.excel_service import ExcelService  # noqa: E402
+from benchmarks.synthetic_store import gerar_frames  # noqa: E402
+
+
+def legacy_clients(df):
+    """Implementação original de get_all_clients"""
+    clients = []
+    for _, row in df.iterrows():
+        clients.append(Client(
+            id=int(row['id']),
+            name=row['name'],
+            created_at=datetime.fromisoformat(row['created_at']),
+            updated_at=datetime.fromisoformat(row['updated_at'])
+        ))
+    return clients
+
+
+def legacy_services(df):
+    """Implementação original de get_all_services"""
+    services = []
+    for _, row in df.iterrows():
+        services.append(Service(
+            id=int(row['id']),
+            name=row['name'],
+            unit_price=float(row['unit_price']),
+            unit=row['unit'],
+            created_at=datetime.fromisoformat(row['created_at']),
+            updated_at=datetime.fromisoformat(row['updated_at'])
+        ))
+    return services
+
+
+def medir(func, df):
+    func(df.head(100))  # aquecimento
+    gc.collect()
+    inicio = time.perf_counter()
+    resultado = func(df)
+    return (time.perf_counter() - inicio) / max(len(df), 1) * 1e6, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args()
+
+    print(f"{'aba':>8} | {'linhas':>7} | {'iterrows (µs/linha)':>19} | {'colunar (µs/linha)':>18} | {'ganho':>6} | iguais")
+    with tempfile.TemporaryDirectory() as tmp:
+        service = ExcelService(file_path=os.path.join(tmp, "bench.xlsx"))
+        for n in args.rows:
+            # Um cliente e um serviço por linha pedida
+            frames = gerar_frames(n_quotes=1, n_clients=n, n_services=n)
+            for aba, legado, atual in (
+                ('clients', legacy_clients, service._clients_from_frame),
+                ('services', legacy_services, service._services_from_frame),
+            ):
+                df = frames[aba]
+                antes, esperado = medir(legado, df)
+                depois, obtido = medir(atual, df)
+                print(f"{aba:>8} | {n:>7} | {antes:19.2f} | {depois:18.2f} | {antes / depois:5.1f}x | "
+                      f"{'sim' if obtido == esperado else 'NÃO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Benchmark de GET /quotes paginado: latência por página vs. tamanho da base
+
+Uso (a partir de backend/):
+    python benchmarks/bench_pagination.py
+    python benchmarks/bench_pagination.py --sizes 1000 100000 --limit 50
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.v1.services.excel_service import ExcelService  # noqa: E402
+from benchmarks.synthetic_store import gerar_frames, carregar_no_snapshot  # noqa: E402
+
+
+def medir(func, repeticoes=20):
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        resultado = func()
+    return (time.perf_counter() - inicio) / repeticoes, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'orçamentos':>10} | {'lista inteira (s)':>17} | {'1ª página (ms)':>14} | "
+          f"{'página do meio (ms)':>19} | {'filtro status (ms)':>18}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.sizes:
+            service = ExcelService(file_path=os.path.join(tmp, f"bench_{n}.xlsx"))
+            carregar_no_snapshot(service, gerar_frames(n_quotes=n))
+
+            inteira, _ = medir(service.get_all_quotes, repeticoes=1)
+            # Índices de ordenação e de colunas são montados uma vez por snapshot
+            service.list_quotes(limit=args.limit, status="approved")
+            primeira, (_, cursor) = medir(lambda: service.list_quotes(limit=args.limit))
+            meio_cursor = service.list_quotes(limit=n // 2)[1]
+            meio, _ = medir(lambda: service.list_quotes(limit=args.limit, cursor=meio_cursor))
+            filtro, _ = medir(lambda: service.list_quotes(limit=args.limit, status="approved", order="desc"))
+
+            print(f"{n:>10} | {inteira:17.3f} | {primeira * 1000:14.2f} | {meio * 1000:19.2f} | {filtro * 1000:18.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Geração de dados sintéticos no formato das abas de quotes_data.xlsx
+"""
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+STATUS = ["draft", "sent", "approved", "rejected", "pendente"]
+UNIDADES = ["h", "un", "m²", "unidade"]
+
+
+def gerar_frames(n_quotes: int, n_clients: int = None, n_services: int = None,
+                 itens_por_orcamento: int = 2, seed: int = 42) -> dict:
+    """Gera as quatro abas (clients, services, quotes, quote_items) como DataFrames"""
+    rng = np.random.default_rng(seed)
+    n_clients = n_clients or max(1, n_quotes // 10)
+    n_services = n_services or max(1, min(500, n_quotes // 20))
+    inicio = datetime(2024, 1, 1)
+
+    def datas(n):
+        offsets = rng.integers(0, 600 * 24 * 3600, size=n)
+        return [(inicio + timedelta(seconds=int(s))).isoformat() for s in offsets]
+
+    clients = pd.DataFrame({
+        'id': np.arange(1, n_clients + 1),
+        'name': [f"Cliente {i}" for i in range(1, n_clients + 1)],
+        'created_at': datas(n_clients),
+        'updated_at': datas(n_clients),
+    })
+    services = pd.DataFrame({
+        'id': np.arange(1, n_services + 1),
+        'name': [f"Serviço {i}" for i in range(1, n_services + 1)],
+        'unit_price': rng.uniform(20, 500, size=n_services).round(2),
+        'unit': rng.choice(UNIDADES, size=n_services),
+        'created_at': datas(n_services),
+        'updated_at': datas(n_services),
+    })
+
+    n_items = n_quotes * itens_por_orcamento
+    item_quote_ids = np.repeat(np.arange(1, n_quotes + 1), itens_por_orcamento)
+    item_service_ids = rng.integers(1, n_services + 1, size=n_items)
+    quantities = rng.integers(1, 10, size=n_items).astype(float)
+    unit_prices = services['unit_price'].to_numpy()[item_service_ids - 1]
+    item_totals = quantities * unit_prices
+    item_dates = datas(n_items)
+    quote_items = pd.DataFrame({
+        'id': np.arange(1, n_items + 1),
+        'quote_id': item_quote_ids,
+        'service_id': item_service_ids,
+        'quantity': quantities,
+        'unit_price': unit_prices,
+        'total_price': item_totals,
+        'service_name': services['name'].to_numpy()[item_service_ids - 1],
+        'service_unit': services['unit'].to_numpy()[item_service_ids - 1],
+        'created_at': item_dates,
+    })
+
+    created = datas(n_quotes)
+    quotes = pd.DataFrame({
+        'id': np.arange(1, n_quotes + 1),
+        'quote_number': [f"ORC{c[:4]}{c[5:7]}{i:03d}" for i, c in enumerate(created, start=1)],
+        'client_id': rng.integers(1, n_clients + 1, size=n_quotes),
+        'title': [f"Orçamento {i}" for i in range(1, n_quotes + 1)],
+        'description': [None if i % 3 == 0 else f"Descrição {i}" for i in range(1, n_quotes + 1)],
+        'status': rng.choice(STATUS, size=n_quotes),
+        'total': item_totals.reshape(n_quotes, itens_por_orcamento).sum(axis=1),
+        'created_at': created,
+        'updated_at': created,
+    })
+    return {'clients': clients, 'services': services, 'quotes': quotes, 'quote_items': quote_items}
+
+
+def carregar_no_snapshot(service, frames: dict):
+    """Injeta as abas no snapshot em memória do ExcelService, sem passar pelo xlsx"""
+    service.invalidate_cache()
+    service._sync_cache()
+    service._sheets.update(frames)
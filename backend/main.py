@@ -1,6 +1,7 @@
 # Configura o PYTHONPATH antes de qualquer importação
 import sys
 import os
+import asyncio
 from pathlib import Path
 
 # Adiciona o diretório atual ao sys.path se não estiver lá
@@ -18,7 +19,7 @@ try:
     from api.v1.core.config import (
         API_TITLE, API_DESCRIPTION, API_VERSION,
         CORS_ORIGINS, CORS_ALLOW_CREDENTIALS, 
-        CORS_ALLOW_METHODS, CORS_ALLOW_HEADERS
+        CORS_ALLOW_METHODS, CORS_ALLOW_HEADERS, ML_WARMUP_ON_STARTUP
     )
 except (ImportError, ModuleNotFoundError):
     # Valores padrão se config não estiver disponível
@@ -29,6 +30,7 @@ except (ImportError, ModuleNotFoundError):
     CORS_ALLOW_CREDENTIALS = True
     CORS_ALLOW_METHODS = ["*"]
     CORS_ALLOW_HEADERS = ["*"]
+    ML_WARMUP_ON_STARTUP = os.getenv("ML_WARMUP_ON_STARTUP", "true").lower() == "true"
 
 from api.v1.routes import router
 from api.v1.core.database import create_tables
@@ -47,6 +49,8 @@ app.add_middleware(
     allow_credentials=CORS_ALLOW_CREDENTIALS,
     allow_methods=CORS_ALLOW_METHODS,
     allow_headers=CORS_ALLOW_HEADERS,
+    # Cursor da próxima página nas listagens paginadas
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Inicialização não bloqueante para evitar timeout no Heroku
@@ -54,7 +58,27 @@ app.add_middleware(
 async def startup_event():
     # Operações de inicialização são feitas sob demanda ou em background
     # para garantir que a aplicação responda rapidamente (< 20s no Heroku)
-    pass
+    if ML_WARMUP_ON_STARTUP:
+        # Os modelos de ML são lidos numa thread; até lá, /ml/status informa "loading".
+        # No modo "process" quem lê são os processos de inferência, não este
+        from api.v1.services.ml_registry import model_registry
+        from api.v1.services.ml_workers import process_inference
+        warm_up = process_inference.warm_up if process_inference is not None else model_registry.load
+        asyncio.get_running_loop().run_in_executor(None, warm_up)
+
+@app.on_event("shutdown")
+def shutdown_event():
+    # Espera as chamadas em andamento à base de orçamentos e incorpora ao .xlsx
+    # o que ainda estiver apenas no journal
+    from api.v1.services.excel_service import excel_service
+    from api.v1.services.excel_async import excel_io
+    from api.v1.services.ml_batcher import shutdown_inference
+    excel_io.shutdown()
+    shutdown_inference()
+    try:
+        excel_service.compact()
+    except Exception as e:
+        print(f"⚠️ Erro ao compactar journal no desligamento: {e}")
 
 # Inclui as rotas
 app.include_router(router, prefix="/api/v1")
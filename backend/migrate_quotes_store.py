@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Script para migrar a base legada de orçamentos entre motores de armazenamento
+
+Exemplos:
+    # Converte o quotes_data.xlsx atual para SQLite
+    python migrate_quotes_store.py quotes_data.xlsx quotes_data.sqlite3
+
+    # Exporta uma base SQLite de volta para .xlsx
+    python migrate_quotes_store.py quotes_data.sqlite3 export.xlsx
+
+Depois da conversão, use QUOTES_STORE_ENGINE=sqlite (e QUOTES_SQLITE_FILE,
+se o caminho for outro) para que a API passe a usar a nova base.
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+# Adiciona o diretório do projeto ao path
+project_root = Path(__file__).parent
+sys.path.append(str(project_root))
+
+from api.v1.services.excel_service import ExcelService
+from api.v1.services.excel_storage import create_storage_engine, migrate_store
+
+# Extensão do arquivo -> motor de armazenamento
+ENGINES_BY_EXTENSION = {
+    ".xlsx": "xlsx",
+    ".sqlite": "sqlite",
+    ".sqlite3": "sqlite",
+    ".db": "sqlite",
+}
+
+
+def _engine_for(path: str, explicit: str = None):
+    kind = explicit or ENGINES_BY_EXTENSION.get(Path(path).suffix.lower())
+    if not kind:
+        raise ValueError(f"Não foi possível deduzir o motor de {path}; use --from-engine/--to-engine")
+    return create_storage_engine(kind, path)
+
+
+def main():
+    """Função principal da migração"""
+    parser = argparse.ArgumentParser(description="Migra a base de orçamentos entre .xlsx e SQLite")
+    parser.add_argument("source", help="arquivo de origem")
+    parser.add_argument("target", help="arquivo de destino")
+    parser.add_argument("--from-engine", choices=["xlsx", "sqlite"], help="motor da origem")
+    parser.add_argument("--to-engine", choices=["xlsx", "sqlite"], help="motor do destino")
+    parser.add_argument("--force", action="store_true", help="sobrescreve o destino se existir")
+    args = parser.parse_args()
+
+    try:
+        source = _engine_for(args.source, args.from_engine)
+        target = _engine_for(args.target, args.to_engine)
+        if not source.exists():
+            print(f"❌ Arquivo de origem não encontrado: {args.source}")
+            return False
+        if target.exists():
+            if not args.force:
+                print(f"❌ Destino já existe: {args.target} (use --force para sobrescrever)")
+                return False
+            os.remove(args.target)
+
+        if source.name == "xlsx" and os.path.exists(f"{args.source}.journal"):
+            print("🔄 Incorporando o journal pendente ao arquivo de origem...")
+            ExcelService(file_path=args.source, engine="xlsx", journal=True).compact()
+
+        print(f"🔄 Migrando {args.source} ({source.name}) -> {args.target} ({target.name})...")
+        totals = migrate_store(source, target)
+        for sheet_name, rows in totals.items():
+            print(f"   - {sheet_name}: {rows} linhas")
+        print("✅ Migração concluída!")
+    except Exception as e:
+        print(f"❌ Erro na migração: {e}")
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,95 @@
+-- Analytics do marketplace calculados dentro do Postgres
+-- Executar no Supabase SQL Editor depois de supabase_sql_commands.sql.
+-- A API chama a função via RPC (supabase.rpc('marketplace_analytics', ...)):
+-- só o resultado agregado atravessa a rede, nunca as tabelas inteiras.
+
+-- aceito_em (base do tempo até o aceite) vem de supabase_sql_commands.sql;
+-- repetido aqui para bases que ainda não rodaram a versão atual do script
+ALTER TABLE orcamentos ADD COLUMN IF NOT EXISTS aceito_em TIMESTAMP WITH TIME ZONE;
+
+CREATE INDEX IF NOT EXISTS idx_solicitacoes_created_at ON solicitacoes(created_at);
+CREATE INDEX IF NOT EXISTS idx_orcamentos_solicitacao_id ON orcamentos(solicitacao_id);
+
+-- Conversão, orçamentos por categoria, medianas de valor e tempo até o aceite
+-- das solicitações criadas entre p_inicio e p_fim (inclusive; NULL = sem limite).
+-- Orçamento aceito = status 'aceito' ou 'realizado'.
+CREATE OR REPLACE FUNCTION marketplace_analytics(
+    p_inicio TIMESTAMP WITH TIME ZONE DEFAULT NULL,
+    p_fim TIMESTAMP WITH TIME ZONE DEFAULT NULL
+)
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+AS $$
+WITH sol AS (
+    SELECT s.id, s.categoria, s.created_at
+    FROM solicitacoes s
+    WHERE (p_inicio IS NULL OR s.created_at >= p_inicio)
+      AND (p_fim IS NULL OR s.created_at <= p_fim)
+),
+orc AS (
+    SELECT o.id, o.solicitacao_id, o.valor_proposto, o.valor_ml_sugerido, o.aceito_em,
+           o.status IN ('aceito', 'realizado') AS aceito,
+           sol.categoria, sol.created_at AS solicitada_em
+    FROM orcamentos o
+    JOIN sol ON sol.id = o.solicitacao_id
+),
+por_solicitacao AS (
+    SELECT sol.id, count(orc.id) AS orcamentos, count(orc.id) FILTER (WHERE orc.aceito) AS aceitos
+    FROM sol
+    LEFT JOIN orc ON orc.solicitacao_id = sol.id
+    GROUP BY sol.id
+),
+por_categoria AS (
+    SELECT sol.categoria,
+           count(DISTINCT sol.id) AS solicitacoes,
+           count(orc.id) AS orcamentos,
+           count(orc.id) FILTER (WHERE orc.aceito) AS orcamentos_aceitos,
+           percentile_cont(0.5) WITHIN GROUP (ORDER BY orc.valor_proposto) AS mediana_valor_proposto,
+           percentile_cont(0.5) WITHIN GROUP (ORDER BY orc.valor_ml_sugerido) AS mediana_valor_ml_sugerido
+    FROM sol
+    LEFT JOIN orc ON orc.solicitacao_id = sol.id
+    GROUP BY sol.categoria
+),
+aceites AS (
+    SELECT extract(epoch FROM (orc.aceito_em - orc.solicitada_em)) / 3600.0 AS horas
+    FROM orc
+    WHERE orc.aceito AND orc.aceito_em IS NOT NULL
+)
+SELECT jsonb_build_object(
+    'conversao', (
+        SELECT jsonb_build_object(
+            'solicitacoes', count(*),
+            'com_orcamentos', count(*) FILTER (WHERE orcamentos > 0),
+            'com_orcamento_aceito', count(*) FILTER (WHERE aceitos > 0),
+            'taxa_conversao', CASE WHEN count(*) > 0
+                THEN (count(*) FILTER (WHERE aceitos > 0))::float8 / count(*) ELSE 0 END
+        )
+        FROM por_solicitacao
+    ),
+    'categorias', (
+        SELECT coalesce(jsonb_agg(jsonb_build_object(
+            'categoria', categoria,
+            'solicitacoes', solicitacoes,
+            'orcamentos', orcamentos,
+            'orcamentos_aceitos', orcamentos_aceitos,
+            'mediana_valor_proposto', mediana_valor_proposto,
+            'mediana_valor_ml_sugerido', mediana_valor_ml_sugerido,
+            'razao_proposto_sugerido', mediana_valor_proposto / nullif(mediana_valor_ml_sugerido, 0)
+        ) ORDER BY orcamentos DESC, categoria), '[]'::jsonb)
+        FROM por_categoria
+    ),
+    'tempo_ate_aceite', (
+        SELECT jsonb_build_object(
+            'aceites', count(*),
+            'media_horas', avg(horas),
+            'mediana_horas', percentile_cont(0.5) WITHIN GROUP (ORDER BY horas)
+        )
+        FROM aceites
+    )
+);
+$$;
+
+-- A API usa a service role key; libere também para usuários autenticados se o
+-- painel for consultar direto do frontend
+GRANT EXECUTE ON FUNCTION marketplace_analytics(TIMESTAMP WITH TIME ZONE, TIMESTAMP WITH TIME ZONE) TO service_role;
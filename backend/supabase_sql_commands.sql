@@ -74,6 +74,7 @@ CREATE TABLE IF NOT EXISTS orcamentos (
     observacoes TEXT,
     condicoes TEXT,
     status status_orcamento DEFAULT 'aguardando',
+    aceito_em TIMESTAMP WITH TIME ZONE,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     updated_at TIMESTAMP WITH TIME ZONE
 );
@@ -108,4 +109,7 @@ ALTER TABLE prestadores ADD COLUMN IF NOT EXISTS totp_secret VARCHAR(255);
 
 -- Adicionar coluna para backup codes (armazenado como JSON array de hashes)
 ALTER TABLE clientes ADD COLUMN IF NOT EXISTS backup_codes JSONB DEFAULT '[]'::jsonb;
-ALTER TABLE prestadores ADD COLUMN IF NOT EXISTS backup_codes JSONB DEFAULT '[]'::jsonb;
\ No newline at end of file
+ALTER TABLE prestadores ADD COLUMN IF NOT EXISTS backup_codes JSONB DEFAULT '[]'::jsonb;
+
+-- Momento em que o cliente aceitou o orçamento (bases criadas antes da coluna)
+ALTER TABLE orcamentos ADD COLUMN IF NOT EXISTS aceito_em TIMESTAMP WITH TIME ZONE;
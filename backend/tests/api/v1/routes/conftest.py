@@ -0,0 +1,26 @@
+"""
+Fixtures compartilhadas pelos testes das rotas
+"""
+import pytest
+from contextlib import ExitStack
+from unittest.mock import patch
+from api.v1.services.excel_async import AsyncExcelService
+from api.v1.services.excel_service import ExcelService
+
+# Rotas que usam a base legada pelo excel_io global
+EXCEL_ROUTES = ("analytics", "clients", "imports", "ml", "quotes", "services")
+
+
+@pytest.fixture
+def excel_service(tmp_path):
+    """Base isolada (vazia) usada no lugar da instância global em todas as rotas da base legada.
+
+    Módulos que precisam de dados redefinem a fixture pedindo esta e populando a base.
+    """
+    service = ExcelService(file_path=str(tmp_path / "quotes_test.xlsx"))
+    excel_io = AsyncExcelService(service)
+    with ExitStack() as stack:
+        for route in EXCEL_ROUTES:
+            stack.enter_context(patch(f"api.v1.routes.{route}.excel_io", excel_io))
+        yield service
+    excel_io.shutdown()
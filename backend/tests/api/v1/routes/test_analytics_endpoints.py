@@ -0,0 +1,100 @@
+"""
+Testes de integração das rotas de analytics da base legada
+"""
+import pytest
+from datetime import date
+from fastapi.testclient import TestClient
+from api.v1.models import ClientCreate, ServiceCreate, QuoteCreate, QuoteItemCreate
+
+
+@pytest.fixture
+def excel_service(excel_service):
+    """Base isolada (conftest) com 2 clientes, 2 serviços e 3 orçamentos"""
+    excel_service.create_services([
+        ServiceCreate(name="Pintura", unit_price=80.0, unit="m²"),
+        ServiceCreate(name="Limpeza", unit_price=25.0, unit="h"),
+    ])
+    excel_service.create_clients([ClientCreate(name="Ana"), ClientCreate(name="Bruno")])
+    excel_service.create_quotes([
+        QuoteCreate(client_id=1, title="Sala", status="approved", items=[
+            QuoteItemCreate(service_id=1, quantity=10, unit_price=80.0),
+            QuoteItemCreate(service_id=2, quantity=2, unit_price=30.0),
+        ]),
+        QuoteCreate(client_id=1, title="Quarto", items=[QuoteItemCreate(service_id=1, quantity=5, unit_price=90.0)]),
+        QuoteCreate(client_id=2, title="Cozinha", items=[QuoteItemCreate(service_id=1, quantity=1, unit_price=70.0)]),
+    ])
+    return excel_service
+
+
+@pytest.fixture(scope="module")
+def client():
+    """Fixture que fornece TestClient do FastAPI"""
+    from main import app
+    return TestClient(app)
+
+
+class TestAnalyticsOverviewEndpoint:
+    """Testes para GET /api/v1/analytics/overview"""
+
+    def test_visao_geral(self, client, excel_service):
+        """Totais, status e serviços mais usados vêm dos agregados"""
+        response = client.get("/api/v1/analytics/overview")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["overview"]["total_quotes"] == 3
+        assert data["overview"]["total_clients"] == 2
+        assert data["overview"]["total_revenue"] == pytest.approx(800.0 + 60.0 + 450.0 + 70.0)
+        assert data["status_distribution"] == {"approved": 1, "draft": 2}
+        assert data["top_services"][0] == ["Pintura", 3]
+
+    def test_periodo_e_granularidade(self, client, excel_service):
+        """from/to/granularity definem period e trends"""
+        hoje = date.today()
+
+        response = client.get("/api/v1/analytics/overview",
+                              params={"from": hoje.isoformat(), "to": hoje.isoformat(), "granularity": "day"})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["period"]["granularity"] == "day"
+        assert data["period"]["quotes_count"] == 3
+        assert data["trends"] == [{"period": hoje.isoformat(), "quotes_count": 3, "revenue": pytest.approx(1380.0)}]
+
+    def test_periodo_sem_orcamentos(self, client, excel_service):
+        """Um intervalo sem orçamentos devolve trends vazio"""
+        response = client.get("/api/v1/analytics/overview", params={"from": "2000-01-01", "to": "2000-12-31"})
+
+        assert response.status_code == 200
+        assert response.json()["trends"] == []
+        assert response.json()["period"]["revenue"] == 0
+
+    def test_intervalo_invertido(self, client, excel_service):
+        """from depois de to é recusado"""
+        response = client.get("/api/v1/analytics/overview", params={"from": "2025-02-01", "to": "2025-01-01"})
+
+        assert response.status_code == 400
+
+
+class TestServicesAndClientsAnalyticsEndpoints:
+    """Testes para GET /api/v1/analytics/services e /analytics/clients"""
+
+    def test_analytics_de_servicos(self, client, excel_service):
+        """Serviços ordenados por número de usos, com faixa de preços praticados"""
+        response = client.get("/api/v1/analytics/services")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [s["service_name"] for s in data["services"]] == ["Pintura", "Limpeza"]
+        assert data["services"][0]["min_price"] == 70.0
+        assert data["services"][0]["max_price"] == 90.0
+        assert data["services"][0]["total_usage"] == 16.0
+
+    def test_analytics_de_clientes(self, client, excel_service):
+        """Clientes ordenados pelo total gasto"""
+        response = client.get("/api/v1/analytics/clients")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [(c["client_name"], c["quotes_count"]) for c in data["clients"]] == [("Ana", 2), ("Bruno", 1)]
+        assert data["clients"][0]["total_spent"] == pytest.approx(1310.0)
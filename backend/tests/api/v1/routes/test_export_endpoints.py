@@ -0,0 +1,56 @@
+"""
+Testes de integração da exportação de orçamentos (/quotes/export)
+"""
+import csv
+import io
+import pytest
+from openpyxl import load_workbook
+from fastapi.testclient import TestClient
+from api.v1.services.excel_service import EXPORT_COLUMNS
+from api.v1.models import ClientCreate, ServiceCreate, QuoteCreate, QuoteItemCreate, QuoteUpdate
+
+
+@pytest.fixture
+def excel_service(excel_service):
+    """Base isolada (conftest) com 3 orçamentos de um item"""
+    excel_service.create_services([ServiceCreate(name="Pintura", unit_price=80.0, unit="m²")])
+    excel_service.create_clients([ClientCreate(name="Ana")])
+    excel_service.create_quotes([
+        QuoteCreate(client_id=1, title=f"Orçamento {i}", items=[QuoteItemCreate(service_id=1, quantity=i, unit_price=80.0)])
+        for i in range(1, 4)
+    ])
+    return excel_service
+
+
+@pytest.fixture(scope="module")
+def client():
+    """Fixture que fornece TestClient do FastAPI"""
+    from main import app
+    return TestClient(app)
+
+
+class TestQuotesExportEndpoint:
+    """Testes para GET /api/v1/quotes/export"""
+
+    def test_exporta_csv(self, client, excel_service):
+        """O CSV tem cabeçalho e uma linha por item"""
+        response = client.get("/api/v1/quotes/export", params={"format": "csv"})
+
+        linhas = list(csv.reader(io.StringIO(response.content.decode("utf-8-sig"))))
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        assert "quotes_export.csv" in response.headers["content-disposition"]
+        assert linhas[0] == EXPORT_COLUMNS
+        assert [linha[4] for linha in linhas[1:]] == ["Orçamento 1", "Orçamento 2", "Orçamento 3"]
+
+    def test_exporta_xlsx_com_filtro(self, client, excel_service):
+        """O .xlsx gerado em modo write-only abre normalmente e respeita os filtros"""
+        excel_service.update_quote(2, QuoteUpdate(status="sent"))
+
+        response = client.get("/api/v1/quotes/export", params={"format": "xlsx", "status": "draft"})
+
+        planilha = load_workbook(io.BytesIO(response.content), read_only=True)["quotes"]
+        linhas = list(planilha.iter_rows(values_only=True))
+        assert response.status_code == 200
+        assert list(linhas[0]) == EXPORT_COLUMNS
+        assert [linha[0] for linha in linhas[1:]] == [1, 3]
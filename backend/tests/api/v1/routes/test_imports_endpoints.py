@@ -0,0 +1,67 @@
+"""
+Testes de integração da importação em lote (/import/{entity})
+"""
+import io
+import json
+import pytest
+import pandas as pd
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture(scope="module")
+def client():
+    """Fixture que fornece TestClient do FastAPI"""
+    from main import app
+    return TestClient(app)
+
+
+class TestImportEndpoint:
+    """Testes para POST /api/v1/import/{entity}"""
+
+    def test_csv_de_servicos_com_linha_invalida(self, client, excel_service):
+        """Linhas válidas são importadas e as inválidas voltam com o erro"""
+        csv = "name,unit_price,unit\nPintura,80,m²\nLimpeza,abc,h\nElétrica,120,\n"
+
+        response = client.post("/api/v1/import/services", files={"file": ("servicos.csv", csv.encode("utf-8"))})
+
+        body = response.json()
+        assert response.status_code == 200
+        assert body["imported"] == 2
+        assert body["ids"] == [1, 2]
+        assert [r["row"] for r in body["rejected"]] == [2]
+        assert "unit_price" in body["rejected"][0]["errors"][0]
+        assert [s.name for s in excel_service.get_all_services()] == ["Pintura", "Elétrica"]
+
+    def test_xlsx_de_clientes(self, client, excel_service):
+        """Planilhas .xlsx usam a primeira aba"""
+        buffer = io.BytesIO()
+        pd.DataFrame({"name": ["Ana", "Bruno", "Carla"]}).to_excel(buffer, index=False)
+
+        response = client.post("/api/v1/import/clients", files={"file": ("clientes.xlsx", buffer.getvalue())})
+
+        assert response.status_code == 200
+        assert response.json()["imported"] == 3
+        assert len(excel_service.get_all_clients()) == 3
+
+    def test_jsonl_de_orcamentos(self, client, excel_service):
+        """Orçamentos em JSON lines trazem os itens aninhados"""
+        client.post("/api/v1/import/services", files={"file": ("s.jsonl", b'{"name": "Pintura", "unit_price": 80}\n')})
+        client.post("/api/v1/import/clients", files={"file": ("c.jsonl", b'{"name": "Ana"}\n')})
+        linhas = [
+            json.dumps({"client_id": 1, "title": "Sala", "items": [{"service_id": 1, "quantity": 2, "unit_price": 80}]}),
+            json.dumps({"client_id": 7, "title": "Sem cliente", "items": []}),
+            "não é json",
+        ]
+
+        response = client.post("/api/v1/import/quotes", files={"file": ("q.jsonl", "\n".join(linhas).encode("utf-8"))})
+
+        body = response.json()
+        assert body["imported"] == 1
+        assert [r["row"] for r in body["rejected"]] == [2, 3]
+        assert excel_service.get_quote_by_id(1).total == 160.0
+
+    def test_formato_nao_suportado_retorna_400(self, client, excel_service):
+        """Extensões desconhecidas são recusadas antes de qualquer gravação"""
+        response = client.post("/api/v1/import/clients", files={"file": ("clientes.txt", b"Ana")})
+
+        assert response.status_code == 400
@@ -0,0 +1,62 @@
+"""
+Testes de integração das rotas de analytics do marketplace (/marketplace/analytics)
+"""
+import pytest
+from unittest.mock import MagicMock, patch
+from fastapi.testclient import TestClient
+from tests.fixtures.marketplace_db import criar_sessao_marketplace, popular_marketplace
+
+
+@pytest.fixture
+def db():
+    """Sessão SQLAlchemy num SQLite em memória com solicitações e orçamentos"""
+    session = criar_sessao_marketplace()
+    popular_marketplace(session)
+    yield session
+    session.close()
+
+
+@pytest.fixture(scope="module")
+def client():
+    """Fixture que fornece TestClient do FastAPI"""
+    from main import app
+    return TestClient(app)
+
+
+class TestMarketplaceAnalyticsEndpoint:
+    """Testes para GET /api/v1/marketplace/analytics"""
+
+    def test_modo_sql(self, client, db):
+        """No modo sql, os números vêm das consultas agregadas na sessão do banco"""
+        with patch("api.v1.routes.marketplace_analytics.MARKETPLACE_ANALYTICS_SOURCE", "sql"), \
+                patch("api.v1.routes.marketplace_analytics.get_db", side_effect=lambda: iter([db])):
+            response = client.get("/api/v1/marketplace/analytics")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["periodo"] == {"inicio": None, "fim": None}
+        assert data["conversao"]["com_orcamento_aceito"] == 2
+        assert [c["categoria"] for c in data["categorias"]] == ["pintura", "eletrica"]
+
+    def test_modo_supabase_chama_rpc(self, client):
+        """No modo supabase, a rota chama a função RPC com o período, sem abrir sessão do banco"""
+        supabase = MagicMock()
+        supabase.rpc.return_value.execute.return_value.data = {"conversao": {"solicitacoes": 0}}
+        with patch("api.v1.services.marketplace_analytics_service_supabase.supabase_service") as service, \
+                patch("api.v1.routes.marketplace_analytics.get_db") as get_db:
+            service.get_client.return_value = supabase
+            response = client.get("/api/v1/marketplace/analytics", params={"inicio": "2025-01-01T00:00:00"})
+
+        assert response.status_code == 200
+        get_db.assert_not_called()
+        assert response.json()["conversao"] == {"solicitacoes": 0}
+        supabase.rpc.assert_called_once_with(
+            "marketplace_analytics", {"p_inicio": "2025-01-01T00:00:00", "p_fim": None}
+        )
+
+    def test_periodo_invertido(self, client):
+        """inicio depois de fim é recusado"""
+        response = client.get("/api/v1/marketplace/analytics",
+                              params={"inicio": "2025-02-01T00:00:00", "fim": "2025-01-01T00:00:00"})
+
+        assert response.status_code == 400
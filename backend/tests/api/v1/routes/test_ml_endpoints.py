@@ -0,0 +1,66 @@
+"""
+Testes de integração das rotas de ML
+"""
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from api.v1.services.ml_registry import ModelRegistry
+
+
+@pytest.fixture(scope="module")
+def client():
+    """Fixture que fornece TestClient do FastAPI"""
+    from main import app
+    return TestClient(app)
+
+
+class TestMLStatusEndpoint:
+    """Testes de GET /api/v1/ml/status"""
+
+    def test_status_nao_dispara_carga(self, client, tmp_path):
+        """Antes da primeira predição o registro informa que nada foi carregado"""
+        registry = ModelRegistry(str(tmp_path))
+        with patch("api.v1.routes.ml.model_registry", registry):
+            response = client.get("/api/v1/ml/status")
+
+        assert response.status_code == 200
+        assert response.json()["state"] == "not_loaded"
+        assert response.json()["ready"] is False
+        assert {"hits", "misses", "size"} <= set(response.json()["cache"])
+        assert response.json()["inference"] == {"mode": "thread", "workers": 1}
+        assert {"batch_size", "queue_wait_ms"} <= set(response.json()["batching"]["price"])
+
+    def test_status_apos_falha_de_carga(self, client, tmp_path):
+        """Falha na leitura dos .pkl aparece com a mensagem de erro"""
+        registry = ModelRegistry(str(tmp_path / "inexistente"))
+        registry.load()
+        with patch("api.v1.routes.ml.model_registry", registry):
+            response = client.get("/api/v1/ml/status")
+
+        body = response.json()
+        assert body["state"] == "failed"
+        assert body["error"]
+        assert body["load_seconds"] is not None
+
+
+class TestPredictBatchEndpoint:
+    """Testes de POST /api/v1/ml/predict-batch"""
+
+    def test_predicao_em_lote(self, client):
+        """Cada item volta com categoria, preço sugerido e limites"""
+        with patch("api.v1.services.ml_service.predizer_categorias", return_value=["Elétrica"]), \
+                patch("api.v1.services.ml_service.predizer_precos", return_value=[100.0, 50.0]):
+            response = client.post("/api/v1/ml/predict-batch", json={"items": [
+                {"name": "Pintura de parede", "category": "Pintura"},
+                {"name": "Troca de tomada"},
+            ]})
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["count"] == 2
+        assert [r["category"] for r in body["results"]] == ["Pintura", "Elétrica"]
+        assert body["results"][0]["max_price"] == pytest.approx(120.0)
+
+    def test_lote_vazio_e_rejeitado(self, client):
+        response = client.post("/api/v1/ml/predict-batch", json={"items": []})
+        assert response.status_code == 422
@@ -0,0 +1,51 @@
+"""
+Testes de integração da paginação de /quotes, /clients e /services
+"""
+import pytest
+import pandas as pd
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def excel_service(excel_service):
+    """Base isolada (conftest) com 3 clientes"""
+    excel_service.storage.write_sheets({'clients': pd.DataFrame([{
+        'id': i, 'name': f"Cliente {i}",
+        'created_at': "2025-01-01T10:00:00", 'updated_at': "2025-01-01T10:00:00"
+    } for i in range(1, 4)])})
+    return excel_service
+
+
+@pytest.fixture(scope="module")
+def client():
+    """Fixture que fornece TestClient do FastAPI"""
+    from main import app
+    return TestClient(app)
+
+
+class TestClientsPaginationEndpoint:
+    """Testes para GET /api/v1/clients com limit/cursor"""
+
+    def test_cursor_da_proxima_pagina_vem_no_cabecalho(self, client, excel_service):
+        """X-Next-Cursor leva à página seguinte e some na última"""
+        primeira = client.get("/api/v1/clients", params={"limit": 2})
+        segunda = client.get("/api/v1/clients", params={"limit": 2, "cursor": primeira.headers["X-Next-Cursor"]})
+
+        assert primeira.status_code == 200
+        assert [c["id"] for c in primeira.json()] == [1, 2]
+        assert [c["id"] for c in segunda.json()] == [3]
+        assert "X-Next-Cursor" not in segunda.headers
+
+    def test_sem_limit_lista_tudo(self, client, excel_service):
+        """Sem parâmetros, a resposta continua sendo a lista completa"""
+        response = client.get("/api/v1/clients")
+
+        assert response.status_code == 200
+        assert len(response.json()) == 3
+
+    def test_ordenacao_invalida_retorna_400(self, client, excel_service):
+        """Parâmetros inválidos viram erro 400 com a mensagem do serviço"""
+        response = client.get("/api/v1/clients", params={"sort": "email"})
+
+        assert response.status_code == 400
+        assert "Ordenação inválida" in response.json()["detail"]
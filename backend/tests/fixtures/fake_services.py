@@ -1,7 +1,7 @@
 """
 Fakes e mocks de serviços para testes
 """
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from unittest.mock import Mock, MagicMock
 
 
@@ -80,6 +80,14 @@ class FakeMLService:
     def predict_category(self, description: str) -> str:
         """Retorna categoria fixa para testes"""
         return "Serviços Gerais"
+    
+    def predict_prices(self, descriptions: List[str]) -> List[float]:
+        """Retorna preços fixos para testes"""
+        return [500.0] * len(descriptions)
+    
+    def predict_categories(self, descriptions: List[str]) -> List[str]:
+        """Retorna categorias fixas para testes"""
+        return ["Serviços Gerais"] * len(descriptions)
 
 
 def create_fake_ml_service() -> FakeMLService:
@@ -0,0 +1,39 @@
+"""
+Banco SQLite em memória com o esquema do marketplace, para testes das consultas SQL
+"""
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+from api.v1.core.database import Base
+from api.v1.models.db_models import Cliente, Prestador, Solicitacao, Orcamento, StatusOrcamento
+
+CRIADA_EM = datetime(2025, 3, 1, 9, 0)
+
+
+def criar_sessao_marketplace() -> Session:
+    """Sessão num SQLite em memória (compartilhado entre threads) com as tabelas criadas"""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)()
+
+
+def popular_marketplace(db: Session):
+    """Três solicitações: duas de pintura (uma aceita, uma realizada) e uma de elétrica sem orçamentos"""
+    db.add(Cliente(id=1, nome="Ana", email="ana@exemplo.com", senha_hash="x"))
+    db.add(Prestador(id=1, nome="Rui", email="rui@exemplo.com", senha_hash="x", categorias=[], regioes_atendimento=[]))
+    for id_, categoria in ((1, "pintura"), (2, "pintura"), (3, "eletrica")):
+        db.add(Solicitacao(id=id_, cliente_id=1, categoria=categoria, descricao="d", localizacao="SP",
+                           created_at=CRIADA_EM + timedelta(days=id_ - 1)))
+    for solicitacao_id, proposto, sugerido, status, horas in (
+        (1, 100.0, 90.0, StatusOrcamento.ACEITO, 6),
+        (1, 200.0, 90.0, StatusOrcamento.RECUSADO, None),
+        (2, 300.0, 110.0, StatusOrcamento.REALIZADO, 2),
+    ):
+        solicitada_em = CRIADA_EM + timedelta(days=solicitacao_id - 1)
+        db.add(Orcamento(
+            solicitacao_id=solicitacao_id, prestador_id=1, valor_ml_minimo=0.0, valor_ml_sugerido=sugerido,
+            valor_ml_maximo=0.0, valor_proposto=proposto, prazo_execucao="5 dias", status=status,
+            aceito_em=solicitada_em + timedelta(hours=horas) if horas else None
+        ))
+    db.commit()
@@ -158,6 +158,32 @@ class TestOrcamentoServiceCharacterization:
         # Pode retornar None ou dict dependendo da implementação
         assert resultado is None or isinstance(resultado, dict)
     
+    def test_aceitar_orcamento_sem_coluna_aceito_em(self):
+        """Em bases sem a coluna aceito_em o orçamento é aceito sem registrar o momento"""
+        # ARRANGE
+        erro_coluna = Exception("Could not find the 'aceito_em' column of 'orcamentos' in the schema cache")
+
+        # ACT
+        with patch('api.v1.services.orcamento_service_supabase.buscar_orcamento_por_id') as mock_buscar, \
+             patch('api.v1.services.orcamento_service_supabase.supabase_service') as mock_supabase, \
+             patch('api.v1.services.solicitacao_service_supabase.buscar_solicitacao_por_id') as mock_solic:
+            mock_buscar.return_value = {"id": 1, "solicitacao_id": 1, "prestador_id": 2}
+            mock_solic.return_value = {"id": 1, "cliente_id": 1}
+            mock_table = mock_supabase.get_client.return_value.table.return_value
+            atualizacoes = []
+            mock_table.update.side_effect = lambda dados: atualizacoes.append(dict(dados)) or mock_table.update.return_value
+            mock_table.update.return_value.eq.return_value.execute.side_effect = [
+                erro_coluna, MagicMock(data=[{"id": 1, "status": "aceito"}]), MagicMock(data=[])
+            ]
+            resultado = aceitar_orcamento(1, 1)
+
+        # ASSERT
+        assert resultado == {"id": 1, "status": "aceito"}
+        primeira, segunda = atualizacoes[:2]
+        assert primeira["aceito_em"].endswith("+00:00")
+        assert "aceito_em" not in segunda
+        assert segunda["status"] == "aceito"
+    
     def test_atualizar_status_orcamento(self):
         """Testa atualização de status"""
         # ARRANGE
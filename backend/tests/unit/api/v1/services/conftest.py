@@ -0,0 +1,33 @@
+"""
+Fixtures compartilhadas pelos testes do ExcelService
+"""
+import pytest
+from api.v1.services.excel_service import ExcelService
+from api.v1.models import ClientCreate, ServiceCreate
+
+ENGINE_FILES = {"xlsx": "quotes_test.xlsx", "sqlite": "quotes_test.sqlite3"}
+
+
+@pytest.fixture
+def excel_options():
+    """Argumentos do ExcelService (engine, journal); módulos redefinem para trocar o motor ou o journal"""
+    return {}
+
+
+@pytest.fixture
+def excel_service_vazio(tmp_path, excel_options):
+    """ExcelService isolado num arquivo temporário, sem nenhum registro"""
+    file_name = ENGINE_FILES[excel_options.get("engine", "xlsx")]
+    return ExcelService(file_path=str(tmp_path / file_name), **excel_options)
+
+
+@pytest.fixture
+def excel_service(excel_service_vazio):
+    """ExcelService isolado com a cliente "Ana" e o serviço "Pintura" (ambos com id 1).
+
+    Módulos que precisam de outros dados redefinem a fixture pedindo esta
+    (ou excel_service_vazio) e completando a base.
+    """
+    excel_service_vazio.create_client(ClientCreate(name="Ana"))
+    excel_service_vazio.create_service(ServiceCreate(name="Pintura", unit_price=80.0, unit="m²"))
+    return excel_service_vazio
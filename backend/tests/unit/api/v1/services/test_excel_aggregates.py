@@ -0,0 +1,180 @@
+"""
+Testes dos agregados de analytics mantidos incrementalmente pelo ExcelService
+"""
+import pytest
+from datetime import date, datetime
+import pandas as pd
+from api.v1.services.excel_aggregates import QuoteAggregates
+from api.v1.services.excel_service import ExcelService
+from api.v1.models import ClientCreate, ServiceCreate, QuoteCreate, QuoteItemCreate, QuoteUpdate
+
+
+@pytest.fixture
+def excel_service(excel_service):
+    """Base do conftest (Ana e Pintura) com um segundo serviço"""
+    excel_service.create_service(ServiceCreate(name="Limpeza", unit_price=25.0, unit="h"))
+    return excel_service
+
+
+def _orcamento(*servicos, status="draft"):
+    return QuoteCreate(
+        client_id=1, title="Obra", status=status,
+        items=[QuoteItemCreate(service_id=s, quantity=2, unit_price=10.0) for s in servicos]
+    )
+
+
+def _estado(aggregates: QuoteAggregates):
+    return (
+        aggregates.quotes_count, round(aggregates.revenue, 6), aggregates.status_counts,
+        aggregates.service_usage, {day: [c, round(r, 6)] for day, (c, r) in aggregates.days.items()}
+    )
+
+
+@pytest.mark.unit
+class TestQuoteAggregates:
+    """Testes da manutenção incremental dos agregados"""
+
+    def test_gravacoes_atualizam_sem_reconstruir(self, excel_service):
+        """Criar, alterar e excluir orçamentos mantém os agregados iguais a uma reconstrução"""
+        # ARRANGE
+        agregados = excel_service._quote_aggregates()
+        primeiro = excel_service.create_quote(_orcamento(1, 2))
+        segundo = excel_service.create_quote(_orcamento(1))
+
+        # ACT
+        excel_service.update_quote(primeiro.id, QuoteUpdate(status="approved", items=[
+            QuoteItemCreate(service_id=2, quantity=1, unit_price=50.0)
+        ]))
+        excel_service.delete_quote(segundo.id)
+
+        # ASSERT
+        assert excel_service._quote_aggregates() is agregados
+        assert _estado(agregados) == _estado(excel_service.rebuild_aggregates())
+        assert agregados.status_counts == {"approved": 1}
+        assert agregados.service_usage == {2: 1}
+        assert agregados.revenue == pytest.approx(50.0)
+
+    def test_rollback_descarta_agregados(self, excel_service):
+        """Uma transação desfeita faz os agregados serem refeitos na próxima consulta"""
+        # ARRANGE
+        excel_service.create_quote(_orcamento(1))
+        agregados = excel_service._quote_aggregates()
+
+        # ACT
+        with pytest.raises(RuntimeError):
+            with excel_service.transaction():
+                excel_service.create_quote(_orcamento(2))
+                raise RuntimeError("falha")
+
+        # ASSERT
+        refeitos = excel_service._quote_aggregates()
+        assert refeitos is not agregados
+        assert refeitos.quotes_count == 1
+
+    def test_visao_geral(self, excel_service):
+        """A visão geral sai dos agregados com nomes atuais dos serviços e meses ordenados"""
+        # ARRANGE
+        excel_service.create_quote(_orcamento(1, 1, 2, status="approved"))
+        excel_service.create_quote(_orcamento(2))
+
+        # ACT
+        visao = excel_service.get_analytics_overview(now=datetime.now())
+
+        # ASSERT
+        assert visao["overview"]["total_quotes"] == 2
+        assert visao["overview"]["total_services"] == 2
+        assert visao["overview"]["total_revenue"] == pytest.approx(80.0)
+        assert visao["overview"]["recent_revenue_30d"] == pytest.approx(80.0)
+        assert visao["status_distribution"] == {"approved": 1, "draft": 1}
+        assert visao["top_services"] == [("Pintura", 2), ("Limpeza", 2)]
+        assert visao["monthly_trends"] == [
+            {"month": datetime.now().strftime("%Y-%m"), "quotes_count": 2, "revenue": pytest.approx(80.0)}
+        ]
+
+
+@pytest.mark.unit
+class TestAggregateTrends:
+    """Testes dos baldes por período montados a partir dos baldes diários"""
+
+    @pytest.fixture
+    def agregados(self):
+        quotes = pd.DataFrame({
+            'total': [10.0, 20.0, 30.0, 40.0],
+            'status': ["draft"] * 4,
+            'created_at': ["2025-01-30T09:00:00", "2025-01-30T18:00:00", "2025-02-02T10:00:00", "2025-02-10T10:00:00"],
+        })
+        return QuoteAggregates.from_frames(quotes, pd.DataFrame(columns=['service_id']))
+
+    @pytest.mark.parametrize("granularity, esperado", [
+        ("day", [("2025-01-30", 2, 30.0), ("2025-02-02", 1, 30.0), ("2025-02-10", 1, 40.0)]),
+        ("week", [("2025-W05", 3, 60.0), ("2025-W07", 1, 40.0)]),
+        ("month", [("2025-01", 2, 30.0), ("2025-02", 2, 70.0)]),
+    ])
+    def test_granularidades(self, agregados, granularity, esperado):
+        """Dias são somados em semanas ISO e meses"""
+        # ACT
+        baldes = agregados.trends(granularity=granularity)
+
+        # ASSERT
+        assert [(b["period"], b["quotes_count"], b["revenue"]) for b in baldes] == esperado
+
+    def test_intervalo_inclusivo(self, agregados):
+        """from e to incluem os próprios dias"""
+        # ACT
+        baldes = agregados.trends(date(2025, 1, 30), date(2025, 2, 2), "month")
+
+        # ASSERT
+        assert [(b["period"], b["quotes_count"]) for b in baldes] == [("2025-01", 2), ("2025-02", 1)]
+
+
+@pytest.mark.unit
+class TestServicesAndClientsAnalytics:
+    """Testes dos analytics por serviço e por cliente calculados por groupby"""
+
+    def test_analytics_de_servicos(self, excel_service):
+        """Preços e uso por serviço; serviços sem uso não entram na lista"""
+        # ARRANGE
+        excel_service.create_service(ServiceCreate(name="Reboco", unit_price=40.0, unit="m²"))
+        excel_service.create_quotes([
+            QuoteCreate(client_id=1, title="A", items=[
+                QuoteItemCreate(service_id=2, quantity=3, unit_price=20.0),
+                QuoteItemCreate(service_id=1, quantity=1, unit_price=70.0),
+            ]),
+            QuoteCreate(client_id=1, title="B", items=[QuoteItemCreate(service_id=2, quantity=1, unit_price=30.0)]),
+        ])
+
+        # ACT
+        analytics = excel_service.get_services_analytics()
+
+        # ASSERT
+        assert analytics["total_services"] == 3
+        assert analytics["active_services"] == 2
+        assert analytics["services"][0] == {
+            "service_id": 2, "service_name": "Limpeza", "unit": "h", "base_price": 25.0,
+            "avg_price_used": 25.0, "min_price": 20.0, "max_price": 30.0, "total_usage": 4.0, "times_used": 2,
+            "p50_price": 20.0, "p90_price": 30.0
+        }
+        assert analytics["services"][1]["service_id"] == 1
+
+    def test_analytics_de_clientes(self, excel_service):
+        """Total gasto, média e data do último orçamento por cliente"""
+        # ARRANGE
+        excel_service.create_client(ClientCreate(name="Bruno"))
+        primeiro = excel_service.create_quote(_orcamento(1))
+        ultimo = excel_service.create_quote(_orcamento(1, 2))
+
+        # ACT
+        analytics = excel_service.get_clients_analytics()
+
+        # ASSERT
+        assert analytics["total_clients"] == 2
+        assert analytics["active_clients"] == 1
+        assert analytics["clients"] == [{
+            "client_id": 1, "client_name": "Ana", "quotes_count": 2,
+            "total_spent": primeiro.total + ultimo.total,
+            "avg_quote_value": (primeiro.total + ultimo.total) / 2,
+            "last_quote_date": ultimo.created_at.isoformat()
+        }]
+        assert analytics["unique_clients_by_month"] == [
+            {"month": ultimo.created_at.strftime("%Y-%m"), "unique_clients": 1}
+        ]
@@ -0,0 +1,84 @@
+"""
+Testes da fachada assíncrona do ExcelService
+"""
+import asyncio
+import threading
+import time
+import pytest
+from unittest.mock import patch
+from api.v1.services.excel_service import ExcelService
+from api.v1.services.excel_async import AsyncExcelService
+from api.v1.models import ClientCreate
+
+
+@pytest.fixture
+def excel_io(tmp_path):
+    """Fachada sobre um ExcelService isolado, com pool de 2 threads"""
+    facade = AsyncExcelService(ExcelService(file_path=str(tmp_path / "quotes_test.xlsx")), max_workers=2)
+    yield facade
+    facade.shutdown()
+
+
+@pytest.mark.unit
+class TestAsyncExcelService:
+    """Testes de execução fora do event loop"""
+
+    async def test_metodos_viram_corrotinas_no_pool(self, excel_io):
+        """Os métodos do serviço são aguardados e executam nas threads excel-io"""
+        # ARRANGE
+        threads = []
+        original = excel_io.service.get_all_clients
+
+        def registrar():
+            threads.append(threading.current_thread().name)
+            return original()
+
+        # ACT
+        cliente = await excel_io.create_client(ClientCreate(name="Ana"))
+        with patch.object(excel_io.service, "get_all_clients", side_effect=registrar):
+            clientes = await excel_io.get_all_clients()
+
+        # ASSERT
+        assert [c.id for c in clientes] == [cliente.id]
+        assert threads[0].startswith("excel-io")
+
+    async def test_chamada_lenta_nao_trava_o_event_loop(self, excel_io):
+        """Enquanto uma leitura bloqueia, outras corrotinas continuam rodando"""
+        # ARRANGE
+        ticks = 0
+
+        async def relogio():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        # ACT
+        tarefa = asyncio.create_task(relogio())
+        with patch.object(excel_io.service, "get_all_quotes", side_effect=lambda: time.sleep(0.3) or []):
+            await excel_io.get_all_quotes()
+        tarefa.cancel()
+
+        # ASSERT
+        assert ticks >= 10
+
+    async def test_pool_limita_chamadas_simultaneas(self, excel_io):
+        """No máximo max_workers chamadas ficam em execução ao mesmo tempo"""
+        # ARRANGE
+        ativas, pico = 0, 0
+        lock = threading.Lock()
+
+        def lenta():
+            nonlocal ativas, pico
+            with lock:
+                ativas += 1
+                pico = max(pico, ativas)
+            time.sleep(0.05)
+            with lock:
+                ativas -= 1
+
+        # ACT
+        await asyncio.gather(*(excel_io.run(lenta) for _ in range(6)))
+
+        # ASSERT
+        assert pico == 2
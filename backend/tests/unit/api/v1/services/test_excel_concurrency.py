@@ -0,0 +1,123 @@
+"""
+Testes de gravações concorrentes (threads e processos) no ExcelService
+"""
+import multiprocessing
+import threading
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from api.v1.services.excel_service import ExcelService
+from api.v1.services.file_lock import InterProcessLock
+from api.v1.models import ClientCreate, ServiceCreate, QuoteCreate, QuoteItemCreate
+
+
+@pytest.fixture(params=["sqlite", "xlsx"])
+def excel_options(request):
+    """Cada teste roda nos dois motores de armazenamento"""
+    return {"engine": request.param}
+
+
+@pytest.fixture
+def excel_service(excel_service_vazio):
+    """Base isolada (conftest) só com o serviço cadastrado: os clientes vêm dos testes"""
+    excel_service_vazio.create_service(ServiceCreate(name="Pintura", unit_price=80.0, unit="m²"))
+    return excel_service_vazio
+
+
+def _criar_orcamentos(file_path, engine, quantidade):
+    """Executado em outro processo: cria clientes e orçamentos na mesma base"""
+    service = ExcelService(file_path=file_path, engine=engine)
+    for i in range(quantidade):
+        cliente = service.create_client(ClientCreate(name=f"Cliente {i}"))
+        service.create_quote(QuoteCreate(
+            client_id=cliente.id,
+            title=f"Orçamento {i}",
+            items=[QuoteItemCreate(service_id=1, quantity=1, unit_price=80.0)]
+        ))
+
+
+@pytest.mark.unit
+class TestExcelServiceConcurrency:
+    """Testes de ids únicos e gravação serializada sob concorrência"""
+
+    def test_threads_concorrentes_geram_ids_unicos(self, excel_service):
+        """Criações simultâneas na mesma instância não repetem ids"""
+        # ACT
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            clientes = list(pool.map(lambda i: excel_service.create_client(ClientCreate(name=f"C{i}")), range(40)))
+
+        # ASSERT
+        assert sorted(c.id for c in clientes) == list(range(1, 41))
+
+    def test_mutacoes_rodam_na_thread_de_escrita(self, excel_service):
+        """As gravações de todas as requisições passam pela mesma thread"""
+        # ARRANGE
+        threads = set()
+        original = excel_service._commit
+
+        def registrar():
+            threads.add(threading.current_thread().name)
+            return original()
+
+        # ACT
+        with patch.object(excel_service, "_commit", side_effect=registrar):
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                list(pool.map(lambda i: excel_service.create_client(ClientCreate(name=f"C{i}")), range(8)))
+
+        # ASSERT
+        assert len(threads) == 1
+        assert threads.pop().startswith("excel-writer")
+
+    def test_leituras_nao_esperam_o_lock_em_arquivo(self, excel_service):
+        """Gravação à espera de outro processo não bloqueia as leituras deste"""
+        # ARRANGE
+        excel_service.get_all_services()
+        outro_processo = InterProcessLock(f"{excel_service.file_path}.lock")
+        outro_processo.acquire()
+        escrita = threading.Thread(target=excel_service.create_client, args=(ClientCreate(name="Ana"),))
+        servicos = []
+        leitura = threading.Thread(target=lambda: servicos.extend(excel_service.get_all_services()), daemon=True)
+
+        # ACT
+        try:
+            escrita.start()
+            escrita.join(timeout=0.2)
+            leitura.start()
+            leitura.join(timeout=5)
+            leitura_concluida = not leitura.is_alive()
+            escrita_pendente = escrita.is_alive()
+        finally:
+            outro_processo.release()
+        escrita.join(timeout=30)
+
+        # ASSERT
+        assert escrita_pendente
+        assert leitura_concluida
+        assert [s.name for s in servicos] == ["Pintura"]
+        assert [c.name for c in excel_service.get_all_clients()] == ["Ana"]
+
+    @pytest.mark.skipif(
+        "fork" not in multiprocessing.get_all_start_methods(), reason="requer multiprocessing com fork"
+    )
+    def test_processos_concorrentes_geram_ids_e_numeros_unicos(self, excel_service):
+        """Vários workers gravando na mesma base não repetem ids nem perdem linhas"""
+        # ARRANGE
+        contexto = multiprocessing.get_context("fork")
+        processos = [
+            contexto.Process(target=_criar_orcamentos, args=(excel_service.file_path, excel_service.storage.name, 8))
+            for _ in range(3)
+        ]
+
+        # ACT
+        for processo in processos:
+            processo.start()
+        for processo in processos:
+            processo.join(timeout=120)
+
+        # ASSERT
+        assert all(processo.exitcode == 0 for processo in processos)
+        orcamentos = excel_service.get_all_quotes()
+        assert len(orcamentos) == 24
+        assert len({q.id for q in orcamentos}) == 24
+        assert len({q.quote_number for q in orcamentos}) == 24
+        assert len({c.id for c in excel_service.get_all_clients()}) == 24
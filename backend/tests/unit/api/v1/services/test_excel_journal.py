@@ -0,0 +1,141 @@
+"""
+Testes do journal append-only e da compactação da base .xlsx
+"""
+import os
+import time
+import pytest
+from unittest.mock import patch
+from api.v1.services.excel_service import ExcelService
+from api.v1.services.excel_journal import JOURNAL_SHEET
+from api.v1.models import ClientCreate, QuoteCreate, QuoteItemCreate, QuoteUpdate
+
+
+@pytest.fixture
+def excel_options():
+    """Base do conftest (Ana e Pintura) com o journal ligado"""
+    return {"journal": True}
+
+
+def _novo_orcamento(titulo="Pintura sala"):
+    return QuoteCreate(
+        client_id=1,
+        title=titulo,
+        items=[QuoteItemCreate(service_id=1, quantity=10, unit_price=80.0)]
+    )
+
+
+def _reaberto(service):
+    return ExcelService(file_path=service.file_path, journal=True)
+
+
+@pytest.mark.unit
+class TestWriteAheadJournal:
+    """Testes de gravação e releitura pelo journal"""
+
+    def test_create_acrescenta_ao_journal_sem_reescrever_o_xlsx(self, excel_service):
+        """Uma transação vira uma linha do journal; o .xlsx não é tocado"""
+        # ARRANGE
+        antes = os.stat(excel_service.file_path).st_mtime_ns
+        linhas_antes = open(excel_service.journal.path).read().count("\n")
+
+        # ACT
+        excel_service.create_quote(_novo_orcamento())
+
+        # ASSERT
+        assert os.stat(excel_service.file_path).st_mtime_ns == antes
+        assert open(excel_service.journal.path).read().count("\n") == linhas_antes + 1
+
+    def test_releitura_aplica_journal_sobre_o_arquivo(self, excel_service):
+        """Outra instância enxerga creates, updates e deletes ainda não compactados"""
+        # ARRANGE
+        primeiro = excel_service.create_quote(_novo_orcamento())
+        segundo = excel_service.create_quote(_novo_orcamento("Pós-obra"))
+        excel_service.update_quote(primeiro.id, QuoteUpdate(status="approved", description="Sala e cozinha"))
+        excel_service.delete_quote(segundo.id)
+
+        # ACT
+        relido = _reaberto(excel_service)
+
+        # ASSERT
+        assert relido.get_all_quotes() == excel_service.get_all_quotes()
+        assert relido.get_quote_by_id(primeiro.id).status == "approved"
+        assert relido.get_quote_by_id(segundo.id) is None
+
+    def test_linha_incompleta_no_final_e_ignorada(self, excel_service):
+        """Uma escrita interrompida no meio da linha não impede a leitura"""
+        # ARRANGE
+        with open(excel_service.journal.path, "a") as f:
+            f.write('{"seq": 99, "ops": [{"op": "ins')
+
+        # ACT
+        relido = _reaberto(excel_service)
+
+        # ASSERT
+        assert [c.name for c in relido.get_all_clients()] == ["Ana"]
+
+    def test_escrita_de_outro_processo_aplica_so_o_final_do_journal(self, excel_service):
+        """Quem já tem o snapshot aplica apenas as transações novas"""
+        # ARRANGE
+        excel_service.get_all_clients()
+        outro = _reaberto(excel_service)
+        outro.create_client(ClientCreate(name="Bruno"))
+
+        # ACT
+        with patch.object(excel_service.storage, "read_sheet") as mock_read:
+            clientes = excel_service.get_all_clients()
+
+        # ASSERT
+        mock_read.assert_not_called()
+        assert [c.name for c in clientes] == ["Ana", "Bruno"]
+
+
+@pytest.mark.unit
+class TestJournalCompaction:
+    """Testes da incorporação do journal ao .xlsx"""
+
+    def test_compactacao_incorpora_e_esvazia_o_journal(self, excel_service):
+        """Depois de compactar, o .xlsx sozinho tem os dados e o journal fica vazio"""
+        # ARRANGE
+        orcamento = excel_service.create_quote(_novo_orcamento())
+
+        # ACT
+        compactou = excel_service.compact()
+
+        # ASSERT
+        assert compactou is True
+        assert excel_service.journal.size() == 0
+        assert excel_service.storage.read_sheet(JOURNAL_SHEET)['last_seq'].tolist() == [3]
+        assert ExcelService(file_path=excel_service.file_path, journal=False).get_quote_by_id(orcamento.id) == orcamento
+        assert excel_service.compact() is False
+
+    def test_compactacao_interrompida_nao_duplica_linhas(self, excel_service):
+        """Se o journal não chega a ser truncado, as transações já incorporadas são ignoradas"""
+        # ARRANGE
+        excel_service.create_quote(_novo_orcamento())
+
+        # ACT
+        with patch.object(excel_service.journal, "rewrite", side_effect=OSError("queda de energia")):
+            with pytest.raises(OSError):
+                excel_service.compact()
+        relido = _reaberto(excel_service)
+
+        # ASSERT
+        assert [c.name for c in relido.get_all_clients()] == ["Ana"]
+        assert len(relido.get_all_quotes()) == 1
+        assert len(relido._read_sheet('quote_items')) == 1
+
+    def test_compactador_em_segundo_plano_dispara_ao_passar_do_limite(self, excel_service):
+        """Um journal maior que o limite é incorporado pela thread de compactação"""
+        # ARRANGE
+        excel_service.compactor.max_bytes = 1
+
+        # ACT
+        excel_service.create_client(ClientCreate(name="Bruno"))
+        prazo = time.monotonic() + 10
+        while excel_service.journal.size() and time.monotonic() < prazo:
+            time.sleep(0.05)
+
+        # ASSERT
+        assert excel_service.journal.size() == 0
+        assert [c.name for c in ExcelService(file_path=excel_service.file_path, journal=False).get_all_clients()] == ["Ana", "Bruno"]
+        excel_service.compactor.stop()
@@ -0,0 +1,60 @@
+"""
+Testes da criação em lote de clientes, serviços e orçamentos no ExcelService
+"""
+import pytest
+from unittest.mock import patch
+from api.v1.services.excel_service import ExcelService
+from api.v1.models import ClientCreate, ServiceCreate, QuoteCreate, QuoteItemCreate
+
+
+@pytest.fixture
+def excel_options():
+    """Gravação direta no arquivo, sem journal"""
+    return {"journal": False}
+
+
+@pytest.fixture
+def excel_service(excel_service_vazio):
+    """Base isolada e vazia: os testes importam tudo em lote"""
+    return excel_service_vazio
+
+
+@pytest.mark.unit
+class TestExcelServiceBulk:
+    """Testes de importação com um bloco de ids e uma única gravação"""
+
+    def test_servicos_em_lote_gravam_uma_unica_vez(self, excel_service):
+        """Mil serviços saem numa só escrita, com ids consecutivos"""
+        # ARRANGE
+        servicos = [ServiceCreate(name=f"Serviço {i}", unit_price=float(i), unit="h") for i in range(1000)]
+
+        # ACT
+        with patch.object(excel_service, "_write_sheets", wraps=excel_service._write_sheets) as mock_write:
+            criados = excel_service.create_services(servicos)
+
+        # ASSERT
+        mock_write.assert_called_once()
+        assert [s.id for s in criados] == list(range(1, 1001))
+        assert len(excel_service.get_all_services()) == 1000
+
+    def test_orcamentos_em_lote_recusam_referencias_inexistentes(self, excel_service):
+        """Orçamentos com cliente ou serviço inexistente voltam como recusados"""
+        # ARRANGE
+        excel_service.create_services([ServiceCreate(name="Pintura", unit_price=80.0, unit="m²")])
+        excel_service.create_clients([ClientCreate(name="Ana"), ClientCreate(name="Bruno")])
+        item = QuoteItemCreate(service_id=1, quantity=2, unit_price=80.0)
+
+        # ACT
+        criados, recusados = excel_service.create_quotes([
+            QuoteCreate(client_id=1, title="Sala", items=[item, item]),
+            QuoteCreate(client_id=9, title="Cliente inexistente", items=[item]),
+            QuoteCreate(client_id=2, title="Serviço inexistente", items=[QuoteItemCreate(service_id=5, quantity=1, unit_price=1.0)]),
+            QuoteCreate(client_id=2, title="Quarto", items=[item]),
+        ])
+
+        # ASSERT
+        assert [(q.id, q.title, q.total) for q in criados] == [(1, "Sala", 320.0), (2, "Quarto", 160.0)]
+        assert [i.id for q in criados for i in q.items] == [1, 2, 3]
+        assert len({q.quote_number for q in criados}) == 2
+        assert [indice for indice, _ in recusados] == [1, 2]
+        assert "Cliente 9" in recusados[0][1]
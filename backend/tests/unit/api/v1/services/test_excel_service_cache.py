@@ -0,0 +1,85 @@
+"""
+Testes do snapshot em memória do ExcelService
+"""
+import os
+import pytest
+from unittest.mock import patch
+import pandas as pd
+from api.v1.services.excel_service import ExcelService
+from api.v1.models import ClientCreate, ServiceCreate, QuoteCreate, QuoteItemCreate, QuoteUpdate
+
+
+@pytest.fixture
+def excel_service(excel_service_vazio):
+    """Base isolada e vazia apontando para um arquivo temporário"""
+    return excel_service_vazio
+
+
+@pytest.mark.unit
+class TestExcelServiceCache:
+    """Testes do cache de abas com invalidação por mtime/tamanho"""
+
+    def test_leituras_repetidas_nao_reabrem_o_arquivo(self, excel_service):
+        """Depois da primeira leitura, a aba é servida da memória"""
+        # ARRANGE
+        excel_service.create_client(ClientCreate(name="Ana"))
+        excel_service.get_all_clients()
+
+        # ACT
+        with patch("api.v1.services.excel_service.pd.read_excel", wraps=pd.read_excel) as mock_read:
+            clientes = excel_service.get_all_clients()
+            excel_service.get_all_clients()
+
+        # ASSERT
+        assert [c.name for c in clientes] == ["Ana"]
+        mock_read.assert_not_called()
+
+    def test_escrita_propria_atualiza_snapshot_sem_reler(self, excel_service):
+        """Escritas do próprio serviço atualizam o cache in-place"""
+        # ARRANGE
+        excel_service.create_service(ServiceCreate(name="Limpeza", unit_price=25.0, unit="h"))
+        excel_service.get_all_services()
+
+        # ACT
+        with patch("api.v1.services.excel_service.pd.read_excel", wraps=pd.read_excel) as mock_read:
+            excel_service.create_service(ServiceCreate(name="Pintura", unit_price=80.0, unit="m²"))
+            servicos = excel_service.get_all_services()
+
+        # ASSERT
+        assert [s.name for s in servicos] == ["Limpeza", "Pintura"]
+        mock_read.assert_not_called()
+
+    def test_alteracao_externa_invalida_snapshot(self, excel_service):
+        """Se outro processo altera o arquivo, o snapshot é descartado"""
+        # ARRANGE
+        excel_service.create_client(ClientCreate(name="Ana"))
+        assert len(excel_service.get_all_clients()) == 1
+        outro_processo = ExcelService(file_path=excel_service.file_path)
+
+        # ACT
+        outro_processo.create_client(ClientCreate(name="Bruno"))
+        stat = os.stat(excel_service.file_path)
+        os.utime(excel_service.file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        clientes = excel_service.get_all_clients()
+
+        # ASSERT
+        assert [c.name for c in clientes] == ["Ana", "Bruno"]
+
+    def test_falha_em_update_nao_corrompe_snapshot(self, excel_service):
+        """Se a gravação falha, o snapshot volta ao estado anterior"""
+        # ARRANGE
+        cliente = excel_service.create_client(ClientCreate(name="Ana"))
+        servico = excel_service.create_service(ServiceCreate(name="Pintura", unit_price=80.0))
+        orcamento = excel_service.create_quote(QuoteCreate(
+            client_id=cliente.id,
+            title="Pintura sala",
+            items=[QuoteItemCreate(service_id=servico.id, quantity=2, unit_price=80.0)]
+        ))
+
+        # ACT
+        with patch.object(excel_service.journal, "append", side_effect=OSError("disco cheio")):
+            resultado = excel_service.update_quote(orcamento.id, QuoteUpdate(title="Outro"))
+
+        # ASSERT
+        assert resultado is None
+        assert excel_service.get_quote_by_id(orcamento.id).title == "Pintura sala"
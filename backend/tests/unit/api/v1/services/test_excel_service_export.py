@@ -0,0 +1,50 @@
+"""
+Testes da exportação em blocos de orçamentos com itens do ExcelService
+"""
+import pytest
+from unittest.mock import patch
+from api.v1.services.excel_service import ExcelService, EXPORT_COLUMNS
+from api.v1.models import ClientCreate, QuoteCreate, QuoteItemCreate
+
+
+@pytest.fixture
+def excel_service(excel_service):
+    """Base do conftest com mais um cliente e 5 orçamentos: os pares com dois itens, os ímpares sem itens"""
+    excel_service.create_client(ClientCreate(name="Bruno"))
+    item = QuoteItemCreate(service_id=1, quantity=2, unit_price=80.0)
+    excel_service.create_quotes([
+        QuoteCreate(client_id=(i % 2) + 1, title=f"Orçamento {i}", status="approved" if i % 2 else "draft",
+                    items=[item, item] if i % 2 == 0 else [])
+        for i in range(1, 6)
+    ])
+    return excel_service
+
+
+@pytest.mark.unit
+class TestQuoteExport:
+    """Testes de iter_quote_export"""
+
+    def test_blocos_com_uma_linha_por_item(self, excel_service):
+        """Cada bloco traz até chunk_size orçamentos, com uma linha por item"""
+        # ACT
+        blocos = list(excel_service.iter_quote_export(chunk_size=2))
+
+        # ASSERT
+        linhas = [dict(zip(EXPORT_COLUMNS, linha)) for bloco in blocos for linha in bloco]
+        assert [sorted({linha[0] for linha in bloco}) for bloco in blocos] == [[1, 2], [3, 4], [5]]
+        assert [l['quote_id'] for l in linhas] == [1, 2, 2, 3, 4, 4, 5]
+        assert linhas[0]['item_id'] is None
+        assert linhas[1]['client_name'] == "Ana"
+        assert (linhas[1]['service_name'], linhas[1]['total_price']) == ("Pintura", 160.0)
+
+    def test_filtros_e_sem_montar_modelos(self, excel_service):
+        """Filtros são os mesmos da listagem e nenhum Quote é criado"""
+        # ACT
+        with patch.object(excel_service, "_quotes_with_relations") as mock_relations, \
+                patch.object(excel_service, "_items_by_quote") as mock_items:
+            linhas = [linha for bloco in excel_service.iter_quote_export(status="approved") for linha in bloco]
+
+        # ASSERT
+        mock_relations.assert_not_called()
+        mock_items.assert_not_called()
+        assert [linha[0] for linha in linhas] == [1, 3, 5]
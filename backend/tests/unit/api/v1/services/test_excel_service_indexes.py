@@ -0,0 +1,108 @@
+"""
+Testes dos índices por chave primária e do join de orçamentos do ExcelService
+"""
+import pytest
+from unittest.mock import patch
+from api.v1.services.excel_service import ExcelService
+from api.v1.models import ClientCreate, ServiceCreate, QuoteCreate, QuoteItemCreate, QuoteUpdate
+
+
+@pytest.fixture
+def excel_service(excel_service):
+    """Base do conftest (Ana e Pintura) com mais um cliente, mais um serviço e dois orçamentos"""
+    bruno = excel_service.create_client(ClientCreate(name="Bruno"))
+    limpeza = excel_service.create_service(ServiceCreate(name="Limpeza", unit_price=25.0, unit="h"))
+    excel_service.create_quote(QuoteCreate(
+        client_id=1,
+        title="Pintura sala",
+        items=[QuoteItemCreate(service_id=1, quantity=10, unit_price=80.0)]
+    ))
+    excel_service.create_quote(QuoteCreate(
+        client_id=bruno.id,
+        title="Pós-obra",
+        description="Apartamento",
+        items=[
+            QuoteItemCreate(service_id=limpeza.id, quantity=8, unit_price=25.0),
+            QuoteItemCreate(service_id=1, quantity=2, unit_price=90.0),
+        ]
+    ))
+    return excel_service
+
+
+@pytest.mark.unit
+class TestGetAllQuotesJoin:
+    """Testes do join indexado de get_all_quotes"""
+
+    def test_monta_clientes_e_itens_de_cada_orcamento(self, excel_service):
+        """Cada orçamento recebe seu cliente e seus itens, na ordem do arquivo"""
+        # ACT
+        orcamentos = excel_service.get_all_quotes()
+
+        # ASSERT
+        assert [q.title for q in orcamentos] == ["Pintura sala", "Pós-obra"]
+        assert [q.client.name for q in orcamentos] == ["Ana", "Bruno"]
+        assert [i.service_name for i in orcamentos[1].items] == ["Limpeza", "Pintura"]
+        assert orcamentos[1].items[1].service_unit == "m²"
+        assert orcamentos[0].description is None
+        assert orcamentos[1].total == 8 * 25.0 + 2 * 90.0
+
+    def test_indices_sao_refeitos_quando_servico_muda(self, excel_service):
+        """Alterar a aba de serviços invalida o join que depende dela"""
+        # ARRANGE
+        excel_service.get_all_quotes()
+        services_df = excel_service._read_sheet('services').copy()
+        services_df.loc[services_df['name'] == "Pintura", 'name'] = "Pintura Premium"
+
+        # ACT
+        excel_service._save_sheet(services_df, 'services')
+        orcamentos = excel_service.get_all_quotes()
+
+        # ASSERT
+        assert orcamentos[0].items[0].service_name == "Pintura Premium"
+
+
+@pytest.mark.unit
+class TestGetQuoteById:
+    """Testes da busca de orçamento por chave primária"""
+
+    def test_busca_nao_materializa_todos_os_orcamentos(self, excel_service):
+        """get_quote_by_id não passa por get_all_quotes"""
+        # ACT
+        with patch.object(excel_service, "get_all_quotes") as mock_all:
+            orcamento = excel_service.get_quote_by_id(2)
+
+        # ASSERT
+        mock_all.assert_not_called()
+        assert orcamento.title == "Pós-obra"
+        assert orcamento.client.name == "Bruno"
+        assert len(orcamento.items) == 2
+
+    def test_busca_de_id_inexistente_retorna_none(self, excel_service):
+        """Ids fora do índice retornam None"""
+        assert excel_service.get_quote_by_id(999) is None
+
+    def test_indice_e_estendido_em_appends_sem_reconstrucao(self, excel_service):
+        """Criar um orçamento estende o índice existente em vez de refazê-lo"""
+        # ARRANGE
+        indice = excel_service._positions_by_id('quotes')
+
+        # ACT
+        novo = excel_service.create_quote(QuoteCreate(client_id=1, title="Novo", items=[]))
+
+        # ASSERT
+        assert excel_service._positions_by_id('quotes') is indice
+        assert indice[novo.id] == 2
+        assert excel_service.get_quote_by_id(novo.id).title == "Novo"
+
+    def test_update_e_delete_usam_indice_atualizado(self, excel_service):
+        """Após update e delete, a busca reflete o estado salvo"""
+        # ACT
+        atualizado = excel_service.update_quote(1, QuoteUpdate(status="approved"))
+        removido = excel_service.delete_quote(2)
+
+        # ASSERT
+        assert atualizado.status == "approved"
+        assert removido is True
+        assert excel_service.get_quote_by_id(2) is None
+        assert excel_service.get_quote_by_id(1).status == "approved"
+        assert excel_service.delete_quote(2) is False
@@ -0,0 +1,65 @@
+"""
+Testes da montagem colunar de Client/Service no ExcelService
+"""
+import pytest
+from datetime import datetime, timezone, timedelta
+import pandas as pd
+from api.v1.services.excel_service import ExcelService, _pydatetimes
+from api.v1.models import Client, Service
+
+
+@pytest.fixture
+def excel_service(excel_service_vazio):
+    """Base isolada com clientes e serviços gravados por fora (datas com e sem microssegundos)"""
+    excel_service_vazio.storage.write_sheets({
+        'clients': pd.DataFrame([
+            {'id': 1, 'name': "Ana", 'created_at': "2025-01-01T10:00:00", 'updated_at': "2025-01-02T11:30:00.250000"},
+            {'id': 2, 'name': "Bruno", 'created_at': "2025-03-04T08:15:00", 'updated_at': "2025-03-04T08:15:00"},
+        ]),
+        'services': pd.DataFrame([
+            {'id': 1, 'name': "Pintura", 'unit_price': 80, 'unit': "m²",
+             'created_at': "2025-01-01T10:00:00", 'updated_at': "2025-01-01T10:00:00"},
+        ]),
+    })
+    return excel_service_vazio
+
+
+@pytest.mark.unit
+class TestColumnarModels:
+    """Testes de equivalência com a montagem validada linha a linha"""
+
+    def test_clientes_iguais_aos_validados(self, excel_service):
+        """O caminho colunar produz os mesmos modelos que o construtor validado"""
+        # ACT
+        clientes = excel_service.get_all_clients()
+
+        # ASSERT
+        assert clientes == [
+            Client(id=1, name="Ana", created_at=datetime(2025, 1, 1, 10), updated_at=datetime(2025, 1, 2, 11, 30, 0, 250000)),
+            Client(id=2, name="Bruno", created_at=datetime(2025, 3, 4, 8, 15), updated_at=datetime(2025, 3, 4, 8, 15)),
+        ]
+        assert type(clientes[0].id) is int
+        assert clientes[0].model_dump_json()
+
+    def test_servicos_iguais_aos_validados(self, excel_service):
+        """Preço inteiro na planilha vira float, como na validação"""
+        # ACT
+        servicos = excel_service.get_all_services()
+
+        # ASSERT
+        assert servicos == [Service(
+            id=1, name="Pintura", unit_price=80.0, unit="m²",
+            created_at=datetime(2025, 1, 1, 10), updated_at=datetime(2025, 1, 1, 10)
+        )]
+        assert type(servicos[0].unit_price) is float
+
+    def test_datas_com_fusos_diferentes(self):
+        """Datas com fusos diferentes na mesma coluna mantêm cada fuso"""
+        # ACT
+        datas = _pydatetimes(pd.Series(["2025-01-01T10:00:00+00:00", "2025-01-01T10:00:00-03:00"]))
+
+        # ASSERT
+        assert datas == [
+            datetime(2025, 1, 1, 10, tzinfo=timezone.utc),
+            datetime(2025, 1, 1, 10, tzinfo=timezone(timedelta(hours=-3))),
+        ]
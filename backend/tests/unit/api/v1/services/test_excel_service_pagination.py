@@ -0,0 +1,157 @@
+"""
+Testes da paginação por cursor, filtros e ordenação do ExcelService
+"""
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+import pandas as pd
+from api.v1.services.excel_service import ExcelService
+
+
+def _frames(n_quotes=25):
+    """Abas com 5 clientes, 2 serviços e orçamentos alternando status e cliente"""
+    clients = pd.DataFrame([{
+        'id': i, 'name': f"Cliente {i}",
+        'created_at': f"2025-01-{i:02d}T10:00:00", 'updated_at': f"2025-01-{i:02d}T10:00:00"
+    } for i in range(1, 6)])
+    services = pd.DataFrame([
+        {'id': 1, 'name': "Pintura", 'unit_price': 80.0, 'unit': "m²",
+         'created_at': "2025-01-01T10:00:00", 'updated_at': "2025-01-01T10:00:00"},
+        {'id': 2, 'name': "Limpeza", 'unit_price': 25.0, 'unit': "h",
+         'created_at': "2025-01-02T10:00:00", 'updated_at': "2025-01-02T10:00:00"},
+    ])
+    quotes = pd.DataFrame([{
+        'id': i, 'quote_number': f"ORC202501{i:03d}", 'client_id': (i % 5) + 1,
+        'title': f"Orçamento {i}", 'description': None,
+        'status': "approved" if i % 2 else "draft", 'total': float(i * 10),
+        'created_at': f"2025-02-{i:02d}T09:00:00", 'updated_at': f"2025-02-{i:02d}T09:00:00"
+    } for i in range(1, n_quotes + 1)])
+    items = pd.DataFrame([{
+        'id': i, 'quote_id': i, 'service_id': (i % 2) + 1, 'quantity': 1.0, 'unit_price': float(i * 10),
+        'total_price': float(i * 10), 'service_name': "", 'service_unit': "", 'created_at': "2025-02-01T09:00:00"
+    } for i in range(1, n_quotes + 1)])
+    return {'clients': clients, 'services': services, 'quotes': quotes, 'quote_items': items}
+
+
+@pytest.fixture
+def excel_service(excel_service_vazio):
+    """Base isolada com 25 orçamentos gravados por fora"""
+    excel_service_vazio.storage.write_sheets(_frames())
+    return excel_service_vazio
+
+
+def _todas_as_paginas(listar, **kwargs):
+    paginas, cursor = [], None
+    while True:
+        pagina, cursor = listar(cursor=cursor, **kwargs)
+        paginas.append(pagina)
+        if cursor is None:
+            return paginas
+
+
+@pytest.mark.unit
+class TestKeysetPagination:
+    """Testes de paginação por cursor"""
+
+    def test_paginas_cobrem_todos_os_orcamentos_sem_repetir(self, excel_service):
+        """Páginas consecutivas entregam cada orçamento uma única vez"""
+        # ACT
+        paginas = _todas_as_paginas(excel_service.list_quotes, limit=10)
+
+        # ASSERT
+        assert [len(p) for p in paginas] == [10, 10, 5]
+        assert [q.id for p in paginas for q in p] == list(range(1, 26))
+        assert paginas[0][0].client.name == "Cliente 2"
+        assert paginas[0][0].items[0].service_name == "Limpeza"
+
+    def test_ordenacao_decrescente_por_coluna(self, excel_service):
+        """sort/order ordenam pela coluna e desempatam pelo id"""
+        # ACT
+        paginas = _todas_as_paginas(excel_service.list_quotes, limit=4, sort='status', order='desc')
+
+        # ASSERT
+        orcamentos = [q for p in paginas for q in p]
+        assert [q.status for q in orcamentos] == ["draft"] * 12 + ["approved"] * 13
+        assert [q.id for q in orcamentos[:3]] == [24, 22, 20]
+
+    def test_exclusao_entre_paginas_nao_repete_nem_pula(self, excel_service):
+        """O cursor é a chave da última linha, não um deslocamento"""
+        # ARRANGE
+        primeira, cursor = excel_service.list_quotes(limit=10)
+        excel_service.delete_quote(3)
+
+        # ACT
+        resto = _todas_as_paginas(excel_service.list_quotes, limit=10)
+        segunda, _ = excel_service.list_quotes(limit=10, cursor=cursor)
+
+        # ASSERT
+        assert [q.id for q in segunda] == list(range(11, 21))
+        assert 3 not in [q.id for p in resto for q in p]
+
+    def test_clientes_e_servicos_paginados(self, excel_service):
+        """As listagens de clientes e serviços aceitam o mesmo contrato"""
+        # ACT
+        clientes = _todas_as_paginas(excel_service.list_clients, limit=2, sort='name', order='desc')
+        servicos, cursor = excel_service.list_services(limit=5, sort='unit_price')
+
+        # ASSERT
+        assert [c.name for p in clientes for c in p] == [f"Cliente {i}" for i in range(5, 0, -1)]
+        assert [s.name for s in servicos] == ["Limpeza", "Pintura"]
+        assert cursor is None
+
+
+@pytest.mark.unit
+class TestPaginationFilters:
+    """Testes dos filtros por status, cliente e data de criação"""
+
+    def test_filtros_combinados_em_varias_paginas(self, excel_service):
+        """status e client_id filtram antes de paginar"""
+        # ACT
+        paginas = _todas_as_paginas(excel_service.list_quotes, limit=1, status="approved", client_id=2)
+
+        # ASSERT
+        assert [q.id for p in paginas for q in p] == [1, 11, 21]
+
+    def test_intervalo_de_criacao(self, excel_service):
+        """created_from/created_to são inclusivos, com ou sem ordenação por data"""
+        # ARRANGE
+        inicio, fim = datetime(2025, 2, 5, 9), datetime(2025, 2, 8, 9)
+
+        # ACT
+        por_id, _ = excel_service.list_quotes(created_from=inicio, created_to=fim)
+        por_data, _ = excel_service.list_quotes(limit=2, sort='created_at', order='desc', created_from=inicio, created_to=fim)
+
+        # ASSERT
+        assert [q.id for q in por_id] == [5, 6, 7, 8]
+        assert [q.id for q in por_data] == [8, 7]
+
+    def test_pagina_monta_so_os_orcamentos_dela(self, excel_service):
+        """Uma página não passa pelo join completo de clientes e itens"""
+        # ACT
+        with patch.object(excel_service, "_clients_by_id") as mock_clients, \
+                patch.object(excel_service, "_items_by_quote") as mock_items:
+            pagina, _ = excel_service.list_quotes(limit=3)
+
+        # ASSERT
+        mock_clients.assert_not_called()
+        mock_items.assert_not_called()
+        assert len(pagina) == 3
+
+    @pytest.mark.parametrize("kwargs", [
+        {"sort": "title"},
+        {"order": "up"},
+        {"cursor": "nao-e-um-cursor"},
+    ])
+    def test_parametros_invalidos_geram_erro(self, excel_service, kwargs):
+        """Ordenação ou cursor inválidos falham com ValueError"""
+        with pytest.raises(ValueError):
+            excel_service.list_quotes(limit=5, **kwargs)
+
+    def test_cursor_de_outra_ordenacao_e_rejeitado(self, excel_service):
+        """Um cursor só vale para a ordenação em que foi gerado"""
+        # ARRANGE
+        _, cursor = excel_service.list_quotes(limit=5, sort='total')
+
+        # ACT / ASSERT
+        with pytest.raises(ValueError, match="ordenação"):
+            excel_service.list_quotes(limit=5, cursor=cursor)
@@ -0,0 +1,111 @@
+"""
+Testes dos contadores persistidos de ids e números de orçamento do ExcelService
+"""
+import pytest
+from datetime import datetime
+import pandas as pd
+from api.v1.services.excel_service import ExcelService
+from api.v1.models import ClientCreate, QuoteCreate, QuoteItemCreate, QuoteUpdate
+
+
+def _orcamento(itens=1):
+    return QuoteCreate(
+        client_id=1,
+        title="Pintura",
+        items=[QuoteItemCreate(service_id=1, quantity=i + 1, unit_price=80.0) for i in range(itens)]
+    )
+
+
+@pytest.mark.unit
+class TestIdSequences:
+    """Testes do alocador de ids"""
+
+    def test_id_excluido_nao_e_reutilizado(self, excel_service):
+        """Excluir o último orçamento não devolve o id dele para o próximo"""
+        # ARRANGE
+        excel_service.create_quote(_orcamento())
+        segundo = excel_service.create_quote(_orcamento())
+        excel_service.delete_quote(segundo.id)
+
+        # ACT
+        terceiro = excel_service.create_quote(_orcamento())
+
+        # ASSERT
+        assert terceiro.id == 3
+        assert terceiro.items[0].id == 3
+
+    def test_itens_do_mesmo_orcamento_tem_ids_distintos(self, excel_service):
+        """Os itens recebem um bloco de ids consecutivos"""
+        # ACT
+        criado = excel_service.create_quote(_orcamento(itens=3))
+        atualizado = excel_service.update_quote(criado.id, QuoteUpdate(items=[
+            QuoteItemCreate(service_id=1, quantity=1, unit_price=80.0),
+            QuoteItemCreate(service_id=1, quantity=2, unit_price=80.0),
+        ]))
+
+        # ASSERT
+        assert [item.id for item in criado.items] == [1, 2, 3]
+        assert [item.id for item in atualizado.items] == [4, 5]
+
+    def test_contadores_sobrevivem_a_reinicio(self, excel_service):
+        """Outra instância continua do contador gravado, não do maior id"""
+        # ARRANGE
+        cliente = excel_service.create_client(ClientCreate(name="Bruno"))
+        excel_service._delete_rows('clients', 'id', cliente.id)
+        excel_service.compact()
+
+        # ACT
+        novo = ExcelService(file_path=excel_service.file_path).create_client(ClientCreate(name="Carla"))
+
+        # ASSERT
+        assert novo.id == 3
+
+    def test_arquivo_sem_aba_de_sequencias(self, tmp_path):
+        """Bases antigas sem a aba sequences continuam a partir do maior id"""
+        # ARRANGE
+        service = ExcelService(file_path=str(tmp_path / "legado.xlsx"))
+        service.storage.write_sheets({'clients': pd.DataFrame([{
+            'id': 7, 'name': "Ana", 'created_at': "2025-01-01T10:00:00", 'updated_at': "2025-01-01T10:00:00"
+        }])})
+
+        # ACT
+        cliente = service.create_client(ClientCreate(name="Bruno"))
+
+        # ASSERT
+        assert cliente.id == 8
+        assert service._counters() == {'clients': 8}
+
+
+@pytest.mark.unit
+class TestQuoteNumberSequence:
+    """Testes da sequência mensal de números de orçamento"""
+
+    def test_sequencia_por_mes(self, excel_service):
+        """Cada mês tem sua própria sequência, iniciada pelo maior número já gravado"""
+        # ARRANGE
+        janeiro, fevereiro = datetime(2025, 1, 15), datetime(2025, 2, 3)
+        excel_service._append_rows('quotes', [{'id': 99, 'quote_number': "ORC202501007", 'client_id': 1,
+                                                'title': "Antigo", 'status': "draft", 'total': 0.0}])
+
+        # ACT
+        numeros = [
+            excel_service._generate_quote_number(janeiro),
+            excel_service._generate_quote_number(fevereiro),
+            excel_service._generate_quote_number(janeiro),
+        ]
+
+        # ASSERT
+        assert numeros == ["ORC202501008", "ORC202502001", "ORC202501009"]
+
+    def test_numero_excluido_nao_e_reutilizado(self, excel_service):
+        """Excluir o último orçamento do mês não repete o número dele"""
+        # ARRANGE
+        primeiro = excel_service.create_quote(_orcamento())
+        excel_service.delete_quote(primeiro.id)
+
+        # ACT
+        segundo = excel_service.create_quote(_orcamento())
+
+        # ASSERT
+        assert primeiro.quote_number != segundo.quote_number
+        assert segundo.quote_number.endswith("002")
@@ -0,0 +1,96 @@
+"""
+Testes da leitura das abas do snapshot numa única passada pelo arquivo
+"""
+import pytest
+from unittest.mock import patch
+import pandas as pd
+from api.v1.services.excel_service import ExcelService
+from api.v1.models import ClientCreate, QuoteCreate, QuoteItemCreate
+
+
+@pytest.fixture
+def excel_service(excel_service):
+    """Base do conftest (Ana e Pintura) com um orçamento cadastrado e incorporado ao arquivo"""
+    excel_service.create_quote(QuoteCreate(
+        client_id=1, title="Pintura", items=[QuoteItemCreate(service_id=1, quantity=2, unit_price=80.0)]
+    ))
+    excel_service.compact()
+    return excel_service
+
+
+@pytest.mark.unit
+class TestSnapshotSinglePass:
+    """Testes do carregamento conjunto das abas"""
+
+    def test_leitura_a_frio_abre_o_arquivo_uma_vez(self, excel_service):
+        """get_all_quotes a frio lê orçamentos, clientes, serviços, itens e o controle de uma vez"""
+        # ARRANGE
+        frio = ExcelService(file_path=excel_service.file_path)
+
+        # ACT
+        with patch("api.v1.services.excel_storage.pd.ExcelFile", wraps=pd.ExcelFile) as mock_open:
+            orcamentos = frio.get_all_quotes()
+
+        # ASSERT
+        assert [(q.client.name, len(q.items)) for q in orcamentos] == [("Ana", 1)]
+        assert mock_open.call_count == 1
+
+    def test_colunas_extras_preservadas_apos_gravacao(self, excel_service):
+        """Abas lidas só com as colunas conhecidas são relidas inteiras antes de gravar"""
+        # ARRANGE
+        clientes = excel_service.storage.read_sheet('clients')
+        clientes['email'] = ["ana@exemplo.com"]
+        excel_service.storage.write_sheets({'clients': clientes})
+        frio = ExcelService(file_path=excel_service.file_path)
+        frio.get_all_quotes()
+        assert 'email' not in frio._read_sheet('clients').columns
+
+        # ACT
+        frio.create_client(ClientCreate(name="Bruno"))
+        frio.compact()
+
+        # ASSERT
+        gravado = frio.storage.read_sheet('clients')
+        assert gravado['email'].tolist()[0] == "ana@exemplo.com"
+        assert gravado['name'].tolist() == ["Ana", "Bruno"]
+
+    def test_primeira_gravacao_sem_colunas_extras_nao_rele_o_arquivo(self, excel_service):
+        """Sem colunas além de SHEET_COLUMNS, as abas projetadas já estão completas (nenhuma releitura inteira)"""
+        # ARRANGE
+        frio = ExcelService(file_path=excel_service.file_path)
+        frio.get_all_quotes()
+
+        # ACT
+        with patch.object(frio.storage, "read_sheets", wraps=frio.storage.read_sheets) as mock_read:
+            frio.create_quote(QuoteCreate(
+                client_id=1, title="Nova", items=[QuoteItemCreate(service_id=1, quantity=1, unit_price=50.0)]
+            ))
+
+        # ASSERT
+        assert [c for c in mock_read.call_args_list if c.args[1] is None] == []
+        assert frio._projected == set()
+
+    def test_colunas_extras_relidas_numa_unica_passada(self, excel_service):
+        """Com colunas extras, a primeira gravação completa todas as abas projetadas de uma vez"""
+        # ARRANGE
+        for aba, coluna in (('quotes', 'origem'), ('quote_items', 'obs')):
+            df = excel_service.storage.read_sheet(aba)
+            df[coluna] = ["x"]
+            excel_service.storage.write_sheets({aba: df})
+        frio = ExcelService(file_path=excel_service.file_path)
+        frio.get_all_quotes()
+        assert frio._projected == {'quotes', 'quote_items'}
+
+        # ACT
+        with patch.object(frio.storage, "read_sheets", wraps=frio.storage.read_sheets) as mock_read:
+            frio.create_quote(QuoteCreate(
+                client_id=1, title="Nova", items=[QuoteItemCreate(service_id=1, quantity=1, unit_price=50.0)]
+            ))
+        frio.compact()
+
+        # ASSERT
+        completas = [c.args[0] for c in mock_read.call_args_list if c.args[1] is None]
+        assert len(completas) == 1
+        assert {'quotes', 'quote_items'} <= set(completas[0])
+        assert frio.storage.read_sheet('quotes')['origem'].tolist()[0] == "x"
+        assert frio.storage.read_sheet('quote_items')['obs'].tolist()[0] == "x"
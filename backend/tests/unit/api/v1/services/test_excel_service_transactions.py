@@ -0,0 +1,115 @@
+"""
+Testes da unidade de trabalho (transações) do ExcelService
+"""
+import os
+import pytest
+from unittest.mock import patch
+from api.v1.services.excel_service import ExcelService
+from api.v1.models import ClientCreate, ServiceCreate, QuoteCreate, QuoteItemCreate, QuoteUpdate
+
+
+@pytest.fixture
+def excel_options():
+    """Base do conftest (Ana e Pintura) gravando direto no arquivo, sem journal"""
+    return {"journal": False}
+
+
+def _novo_orcamento(service_id=1):
+    return QuoteCreate(
+        client_id=1,
+        title="Pintura sala",
+        items=[QuoteItemCreate(service_id=service_id, quantity=10, unit_price=80.0)]
+    )
+
+
+@pytest.mark.unit
+class TestExcelServiceTransactions:
+    """Testes de escrita única e atômica por operação lógica"""
+
+    def test_create_quote_grava_o_arquivo_uma_unica_vez(self, excel_service):
+        """Orçamento, itens e contadores saem na mesma escrita"""
+        # ACT
+        with patch.object(excel_service, "_write_sheets", wraps=excel_service._write_sheets) as mock_write:
+            excel_service.create_quote(_novo_orcamento())
+
+        # ASSERT
+        mock_write.assert_called_once()
+        assert set(mock_write.call_args.args[0]) == {"quotes", "quote_items", "sequences"}
+
+    def test_transacao_explicita_agrupa_varias_operacoes(self, excel_service):
+        """Operações dentro de transaction() geram uma só escrita"""
+        # ACT
+        with patch.object(excel_service, "_write_sheets", wraps=excel_service._write_sheets) as mock_write:
+            with excel_service.transaction():
+                servico = excel_service.create_service(ServiceCreate(name="Limpeza", unit_price=25.0))
+                cliente = excel_service.create_client(ClientCreate(name="Bruno"))
+                excel_service.create_quote(QuoteCreate(
+                    client_id=cliente.id,
+                    title="Pós-obra",
+                    items=[QuoteItemCreate(service_id=servico.id, quantity=8, unit_price=25.0)]
+                ))
+
+        # ASSERT
+        mock_write.assert_called_once()
+        relido = ExcelService(file_path=excel_service.file_path, journal=False)
+        assert [q.title for q in relido.get_all_quotes()] == ["Pós-obra"]
+
+    def test_falha_no_meio_nao_grava_orcamento_parcial(self, excel_service):
+        """Item com serviço inexistente desfaz o orçamento já montado"""
+        # ARRANGE
+        antes = os.stat(excel_service.file_path).st_mtime_ns
+
+        # ACT
+        with pytest.raises(ValueError):
+            excel_service.create_quote(_novo_orcamento(service_id=999))
+
+        # ASSERT
+        assert os.stat(excel_service.file_path).st_mtime_ns == antes
+        assert excel_service.get_all_quotes() == []
+        assert ExcelService(file_path=excel_service.file_path, journal=False).get_all_quotes() == []
+
+    def test_update_com_lista_vazia_remove_itens(self, excel_service):
+        """items=[] remove os itens e zera o total"""
+        # ARRANGE
+        orcamento = excel_service.create_quote(_novo_orcamento())
+
+        # ACT
+        atualizado = excel_service.update_quote(orcamento.id, QuoteUpdate(items=[]))
+
+        # ASSERT
+        assert atualizado.items == []
+        assert atualizado.total == 0
+        assert ExcelService(file_path=excel_service.file_path, journal=False).get_quote_by_id(orcamento.id).items == []
+
+    def test_escrita_atomica_nao_deixa_temporarios(self, excel_service, tmp_path):
+        """O arquivo temporário é renomeado sobre o original ou removido"""
+        # ACT
+        excel_service.create_quote(_novo_orcamento())
+        with patch("api.v1.services.excel_storage.os.replace", side_effect=OSError("falha")):
+            with pytest.raises(OSError):
+                excel_service.create_client(ClientCreate(name="Bruno"))
+
+        # ASSERT
+        assert sorted(os.listdir(tmp_path)) == ["quotes_test.xlsx", "quotes_test.xlsx.lock"]
+        assert [c.name for c in excel_service.get_all_clients()] == ["Ana"]
+
+    def test_exclusao_concorrente_antes_da_gravacao(self, excel_service):
+        """Outro worker que exclui o orçamento enquanto a alteração espera o lock não o faz reaparecer"""
+        # ARRANGE
+        orcamento = excel_service.create_quote(_novo_orcamento())
+        outro_worker = ExcelService(file_path=excel_service.file_path, journal=False)
+        adquirir = excel_service._file_lock.acquire
+
+        def excluir_e_adquirir():
+            outro_worker.delete_quote(orcamento.id)
+            adquirir()
+
+        # ACT
+        with patch.object(excel_service._file_lock, "acquire", side_effect=excluir_e_adquirir), \
+                patch.object(excel_service, "_write_sheets", wraps=excel_service._write_sheets) as mock_write:
+            resultado = excel_service.update_quote(orcamento.id, QuoteUpdate(title="Nova"))
+
+        # ASSERT
+        assert resultado is None
+        mock_write.assert_not_called()
+        assert excel_service.get_quote_by_id(orcamento.id) is None
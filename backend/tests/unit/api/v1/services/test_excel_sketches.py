@@ -0,0 +1,182 @@
+"""
+Testes dos sketches de quantis (KLL) e de cardinalidade (HyperLogLog)
+"""
+import os
+import random
+import pytest
+from unittest.mock import patch
+from api.v1.services.excel_service import ExcelService
+from api.v1.services.excel_sketches import HyperLogLog, KLLSketch, QuoteSketches
+from api.v1.models import ClientCreate, QuoteCreate, QuoteItemCreate, QuoteUpdate
+
+
+def _rank(valores_ordenados, valor):
+    """Fração dos valores menores ou iguais a `valor`"""
+    return sum(1 for v in valores_ordenados if v <= valor) / len(valores_ordenados)
+
+
+@pytest.mark.unit
+class TestKLLSketch:
+    """Testes do sketch de quantis"""
+
+    def test_quantis_com_memoria_limitada(self):
+        """p50 e p90 de 100 mil valores com erro de rank abaixo de 2%"""
+        # ARRANGE
+        gerador = random.Random(7)
+        valores = [gerador.lognormvariate(4, 1) for _ in range(100_000)]
+        sketch = KLLSketch()
+
+        # ACT
+        sketch.update_many(valores)
+        p50, p90 = sketch.quantiles([0.5, 0.9])
+
+        # ASSERT
+        ordenados = sorted(valores)
+        assert abs(_rank(ordenados, p50) - 0.5) < 0.02
+        assert abs(_rank(ordenados, p90) - 0.9) < 0.02
+        assert sketch.n == 100_000
+        assert sum(len(c) for c in sketch.compactors) < 1000
+
+    def test_merge_equivale_a_sequencia_inteira(self):
+        """Sketches de dois workers combinados respondem pelos dois conjuntos"""
+        # ARRANGE
+        gerador = random.Random(11)
+        valores = [gerador.uniform(0, 1000) for _ in range(40_000)]
+        worker_a, worker_b = KLLSketch(), KLLSketch()
+        worker_a.update_many(valores[:25_000])
+        worker_b.update_many(valores[25_000:])
+
+        # ACT
+        worker_a.merge(KLLSketch.from_dict(worker_b.to_dict()))
+
+        # ASSERT
+        ordenados = sorted(valores)
+        assert worker_a.n == 40_000
+        for q, valor in zip((0.5, 0.9), worker_a.quantiles([0.5, 0.9])):
+            assert abs(_rank(ordenados, valor) - q) < 0.02
+
+    def test_poucos_valores_sao_exatos(self):
+        """Abaixo da capacidade o sketch guarda os próprios valores"""
+        sketch = KLLSketch()
+        sketch.update_many([30.0, 10.0, float("nan"), 20.0])
+        assert sketch.quantiles([0.5, 1.0]) == [20.0, 30.0]
+        assert KLLSketch().quantiles([0.5]) == [None]
+
+
+@pytest.mark.unit
+class TestHyperLogLog:
+    """Testes do contador de valores distintos"""
+
+    def test_contagem_e_merge(self):
+        """Distintos com repetição e união de dois contadores, com erro abaixo de 5%"""
+        # ARRANGE
+        worker_a, worker_b = HyperLogLog(), HyperLogLog()
+        worker_a.add_many(i % 20_000 for i in range(60_000))
+        worker_b.add_many(range(10_000, 30_000))
+
+        # ACT
+        contagem_a = worker_a.count()
+        worker_a.merge(HyperLogLog.from_dict(worker_b.to_dict()))
+
+        # ASSERT
+        assert abs(contagem_a - 20_000) / 20_000 < 0.05
+        assert abs(worker_a.count() - 30_000) / 30_000 < 0.05
+
+    def test_poucos_valores(self):
+        """Contagem linear para conjuntos pequenos"""
+        contador = HyperLogLog()
+        contador.add_many([1, 2, 3, 2, 1])
+        assert contador.count() == 3
+
+    def test_precisoes_diferentes_nao_combinam(self):
+        with pytest.raises(ValueError):
+            HyperLogLog(p=12).merge(HyperLogLog(p=10))
+
+
+@pytest.fixture
+def excel_options():
+    """Base do conftest (Ana e Pintura) no .xlsx, com journal"""
+    return {"engine": "xlsx", "journal": True}
+
+
+def _orcamento(preco):
+    return QuoteCreate(client_id=1, title="Obra", items=[QuoteItemCreate(service_id=1, quantity=1, unit_price=preco)])
+
+
+@pytest.mark.unit
+class TestQuoteSketches:
+    """Testes dos sketches alimentados pelo ExcelService"""
+
+    def test_gravacoes_alimentam_os_sketches(self, excel_service):
+        """Inserções entram nos sketches sem reconstruí-los"""
+        # ARRANGE
+        excel_service.create_quote(_orcamento(10.0))
+        sketches = excel_service._quote_sketches()
+
+        # ACT
+        excel_service.create_quote(_orcamento(30.0))
+
+        # ASSERT
+        assert excel_service._quote_sketches() is sketches
+        assert sketches.prices[1].n == 2
+        assert sketches.price_quantiles((0.5, 1.0)) == {1: [10.0, 30.0]}
+
+    def test_alteracao_e_exclusao_refazem_os_sketches(self, excel_service):
+        """Preço alterado e orçamento excluído saem dos percentis e da contagem de clientes"""
+        # ARRANGE
+        excel_service.create_client(ClientCreate(name="Bia"))
+        alterado = excel_service.create_quote(_orcamento(1000.0))
+        excluido = excel_service.create_quote(
+            QuoteCreate(client_id=2, title="Obra", items=[QuoteItemCreate(service_id=1, quantity=1, unit_price=500.0)])
+        )
+        excel_service.get_services_analytics()
+        antes = excel_service.get_clients_analytics()["unique_clients_by_month"]
+
+        # ACT
+        excel_service.update_quote(
+            alterado.id, QuoteUpdate(items=[QuoteItemCreate(service_id=1, quantity=1, unit_price=10.0)])
+        )
+        excel_service.delete_quote(excluido.id)
+        servico = excel_service.get_services_analytics()["services"][0]
+        depois = excel_service.get_clients_analytics()["unique_clients_by_month"]
+
+        # ASSERT
+        assert servico["min_price"] == servico["max_price"] == 10.0
+        assert servico["p50_price"] <= servico["p90_price"] <= servico["max_price"]
+        assert sum(mes["unique_clients"] for mes in antes) == 2
+        assert sum(mes["unique_clients"] for mes in depois) == 1
+
+    def test_arquivo_lateral_persiste_entre_instancias(self, excel_service):
+        """A compactação grava os sketches; outra instância parte deles e do journal"""
+        # ARRANGE
+        excel_service.create_quote(_orcamento(10.0))
+        excel_service.create_quote(_orcamento(20.0))
+        excel_service.compact()
+        excel_service.create_quote(_orcamento(40.0))
+
+        # ACT
+        relido = ExcelService(file_path=excel_service.file_path, engine="xlsx", journal=True)
+        with patch.object(QuoteSketches, "from_frames", side_effect=AssertionError("reconstruído")):
+            sketches = relido._quote_sketches()
+
+        # ASSERT
+        assert os.path.exists(f"{excel_service.file_path}.sketches.json")
+        assert sketches.prices[1].n == 3
+        assert sketches.price_quantiles((0.0, 1.0)) == {1: [10.0, 40.0]}
+        assert sum(sketches.unique_clients().values()) == 1
+
+    def test_exclusao_no_journal_descarta_o_arquivo_lateral(self, excel_service):
+        """Uma exclusão posterior à compactação faz a outra instância refazer os sketches"""
+        # ARRANGE
+        excel_service.create_quote(_orcamento(10.0))
+        orcamento = excel_service.create_quote(_orcamento(900.0))
+        excel_service.compact()
+        excel_service.delete_quote(orcamento.id)
+
+        # ACT
+        relido = ExcelService(file_path=excel_service.file_path, engine="xlsx", journal=True)
+        sketches = relido._quote_sketches()
+
+        # ASSERT
+        assert sketches.prices[1].n == 1
+        assert sketches.price_quantiles((1.0,)) == {1: [10.0]}
@@ -0,0 +1,129 @@
+"""
+Testes dos motores de armazenamento da base legada de orçamentos
+"""
+import pytest
+from unittest.mock import patch
+import pandas as pd
+from api.v1.services.excel_service import ExcelService
+from api.v1.services.excel_storage import (
+    SQLiteStorageEngine, XlsxStorageEngine, create_storage_engine, migrate_store
+)
+from api.v1.models import ClientCreate, ServiceCreate, QuoteCreate, QuoteItemCreate
+
+
+@pytest.fixture(params=["sqlite", "xlsx"])
+def excel_options(request):
+    """Cada teste roda nos dois motores de armazenamento"""
+    return {"engine": request.param}
+
+
+@pytest.fixture
+def excel_service(excel_service_vazio):
+    """Base isolada e vazia em cada motor"""
+    return excel_service_vazio
+
+
+@pytest.mark.unit
+class TestStorageEngines:
+    """Testes de comportamento equivalente entre os motores"""
+
+    def test_dados_persistem_entre_instancias(self, excel_service):
+        """O que é gravado por uma instância é lido igual por outra"""
+        # ARRANGE
+        cliente = excel_service.create_client(ClientCreate(name="Ana"))
+        servico = excel_service.create_service(ServiceCreate(name="Pintura", unit_price=80.0, unit="m²"))
+        orcamento = excel_service.create_quote(QuoteCreate(
+            client_id=cliente.id,
+            title="Pintura sala",
+            items=[QuoteItemCreate(service_id=servico.id, quantity=10, unit_price=80.0)]
+        ))
+
+        # ACT
+        relido = ExcelService(file_path=excel_service.file_path, engine=excel_service.storage.name)
+
+        # ASSERT
+        assert relido.get_quote_by_id(orcamento.id) == orcamento
+        assert relido.get_all_clients() == [cliente]
+        assert relido.get_all_services() == [servico]
+
+    def test_leitura_conjunta_de_abas(self, excel_service):
+        """read_sheets devolve só as abas existentes, com as colunas pedidas"""
+        # ARRANGE
+        excel_service.create_client(ClientCreate(name="Ana"))
+        excel_service.compact()
+
+        # ACT
+        frames = excel_service.storage.read_sheets(['clients', 'services', 'inexistente'], {'id', 'name'})
+
+        # ASSERT
+        assert sorted(frames) == ['clients', 'services']
+        assert list(frames['clients'].columns) == ['id', 'name']
+        assert frames['clients']['name'].tolist() == ["Ana"]
+        assert 'created_at' in frames['clients'].attrs['dropped_columns']
+        assert 'unit_price' in frames['services'].attrs['dropped_columns']
+
+    def test_motor_desconhecido_gera_erro(self, tmp_path):
+        """Configuração inválida falha cedo com mensagem clara"""
+        with pytest.raises(ValueError, match="desconhecido"):
+            create_storage_engine("csv", str(tmp_path / "x.csv"))
+
+
+@pytest.mark.unit
+class TestSQLiteStorageEngine:
+    """Testes específicos do motor SQLite"""
+
+    def test_append_insere_apenas_linhas_novas(self, tmp_path):
+        """Criar um cliente não recria a tabela inteira"""
+        # ARRANGE
+        service = ExcelService(file_path=str(tmp_path / "q.sqlite3"), engine="sqlite")
+        service.create_client(ClientCreate(name="Ana"))
+
+        # ACT
+        with patch.object(SQLiteStorageEngine, "_insert", wraps=service.storage._insert) as mock_insert:
+            service.create_client(ClientCreate(name="Bruno"))
+
+        # ASSERT
+        inserts = [c.args for c in mock_insert.call_args_list if c.args[1] == "clients"]
+        assert len(inserts) == 1
+        assert len(inserts[0][2]) == 1
+        assert [c.name for c in service.get_all_clients()] == ["Ana", "Bruno"]
+
+
+@pytest.mark.unit
+class TestMigration:
+    """Testes da migração entre motores e da exportação .xlsx"""
+
+    def test_migracao_preserva_abas_e_colunas_extras(self, tmp_path):
+        """Abas e colunas fora do esquema do ExcelService sobrevivem à migração"""
+        # ARRANGE
+        origem = XlsxStorageEngine(str(tmp_path / "origem.xlsx"))
+        origem.write_sheets({
+            "clients": pd.DataFrame([{
+                "id": 1, "name": "Ana", "email": "ana@email.com",
+                "created_at": "2025-01-01T10:00:00", "updated_at": "2025-01-01T10:00:00"
+            }]),
+            "categories": pd.DataFrame([{"id": 1, "name": "Pintura", "market_avg_price": 100}]),
+        })
+        destino = SQLiteStorageEngine(str(tmp_path / "destino.sqlite3"))
+
+        # ACT
+        totais = migrate_store(origem, destino)
+
+        # ASSERT
+        assert totais == {"clients": 1, "categories": 1}
+        assert destino.sheet_names() == ["clients", "categories"]
+        assert destino.read_sheet("clients")["email"].tolist() == ["ana@email.com"]
+
+    def test_export_xlsx_a_partir_do_sqlite(self, tmp_path):
+        """A base SQLite pode ser exportada sob demanda para .xlsx"""
+        # ARRANGE
+        service = ExcelService(file_path=str(tmp_path / "q.sqlite3"), engine="sqlite")
+        service.create_client(ClientCreate(name="Ana"))
+        destino = str(tmp_path / "export.xlsx")
+
+        # ACT
+        service.export_xlsx(destino)
+
+        # ASSERT
+        exportado = ExcelService(file_path=destino, engine="xlsx")
+        assert [c.name for c in exportado.get_all_clients()] == ["Ana"]
@@ -0,0 +1,60 @@
+"""
+Testes dos analytics do marketplace calculados por SQL agregado (SQLite em memória)
+"""
+import pytest
+from datetime import timedelta
+from api.v1.services.marketplace_analytics_service import obter_analytics_marketplace
+from tests.fixtures.marketplace_db import CRIADA_EM, criar_sessao_marketplace, popular_marketplace
+
+
+@pytest.fixture
+def db():
+    """Sessão SQLAlchemy num SQLite em memória com solicitações e orçamentos"""
+    session = criar_sessao_marketplace()
+    popular_marketplace(session)
+    yield session
+    session.close()
+
+
+@pytest.mark.unit
+class TestMarketplaceAnalyticsSQL:
+    """Testes das consultas agregadas do marketplace"""
+
+    def test_conversao(self, db):
+        """Solicitações com orçamento e com orçamento aceito (aceito ou realizado)"""
+        # ACT
+        analytics = obter_analytics_marketplace(db)
+
+        # ASSERT
+        assert analytics["conversao"] == {
+            "solicitacoes": 3, "com_orcamentos": 2, "com_orcamento_aceito": 2, "taxa_conversao": pytest.approx(2 / 3)
+        }
+
+    def test_categorias_e_medianas(self, db):
+        """Contagens por categoria e medianas do valor proposto e do sugerido pelo ML"""
+        # ACT
+        categorias = obter_analytics_marketplace(db)["categorias"]
+
+        # ASSERT
+        assert categorias[0] == {
+            "categoria": "pintura", "solicitacoes": 2, "orcamentos": 3, "orcamentos_aceitos": 2,
+            "mediana_valor_proposto": 200.0, "mediana_valor_ml_sugerido": 90.0,
+            "razao_proposto_sugerido": pytest.approx(200.0 / 90.0)
+        }
+        assert categorias[1]["categoria"] == "eletrica"
+        assert categorias[1]["orcamentos"] == 0
+        assert categorias[1]["mediana_valor_proposto"] is None
+
+    def test_tempo_ate_aceite_e_periodo(self, db):
+        """Horas entre a solicitação e o aceite; o período filtra pela criação da solicitação"""
+        # ACT
+        todos = obter_analytics_marketplace(db)
+        segundo_dia = obter_analytics_marketplace(db, inicio=CRIADA_EM + timedelta(days=1),
+                                                  fim=CRIADA_EM + timedelta(days=1))
+
+        # ASSERT
+        assert todos["tempo_ate_aceite"]["aceites"] == 2
+        assert todos["tempo_ate_aceite"]["media_horas"] == pytest.approx(4.0, abs=1e-4)
+        assert todos["tempo_ate_aceite"]["mediana_horas"] == pytest.approx(4.0, abs=1e-4)
+        assert segundo_dia["conversao"]["solicitacoes"] == 1
+        assert segundo_dia["tempo_ate_aceite"]["mediana_horas"] == pytest.approx(2.0, abs=1e-4)
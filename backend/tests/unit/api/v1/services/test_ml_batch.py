@@ -0,0 +1,99 @@
+"""
+Testes da predição em lote (ml_service e SklearnMLAdapter)
+"""
+import pytest
+from unittest.mock import MagicMock, patch
+from api.v1.core.adapters import FakeMLAdapter, SklearnMLAdapter
+from api.v1.services import ml_service
+from api.v1.services.ml_cache import PredictionCache
+
+DESCRICOES = [
+    "Pintura de parede residencial",
+    "Instalação de chuveiro elétrico",
+    "pintura  de PAREDE residencial",
+    "Limpeza pós-obra de apartamento",
+]
+
+
+def _registro():
+    registro = MagicMock(version="v1")
+    registro.load.return_value = True
+    registro.get.return_value.transform.side_effect = lambda textos: textos
+    registro.get.return_value.predict.side_effect = lambda X: [float(len(X))] * len(X)
+    return registro
+
+
+@pytest.mark.unit
+class TestPredicaoEmLote:
+    """Testes de predizer_precos, predizer_categorias e predict_batch"""
+
+    def test_um_transform_e_um_predict_por_lote(self):
+        """Textos repetidos (após normalização) e já em cache não voltam ao modelo"""
+        # ARRANGE
+        registro = _registro()
+        cache = PredictionCache()
+
+        # ACT
+        with patch("api.v1.services.ml_service.model_registry", registro), \
+                patch("api.v1.services.ml_service.prediction_cache", cache):
+            ml_service.predizer_preco(DESCRICOES[1])
+            precos = ml_service.predizer_precos(DESCRICOES)
+
+        # ASSERT
+        modelo = registro.get.return_value
+        assert modelo.transform.call_count == 2
+        assert modelo.transform.call_args.args[0] == [DESCRICOES[0], DESCRICOES[3]]
+        assert precos == [2.0, 1.0, 2.0, 2.0]
+
+    def test_lote_igual_as_predicoes_individuais(self):
+        """Com os modelos reais, o lote devolve o mesmo que uma chamada por item"""
+        # ARRANGE
+        cache = PredictionCache()
+        if not ml_service.MODELS_LOADED:
+            pytest.skip("Modelos ML não disponíveis")
+
+        # ACT
+        with patch("api.v1.services.ml_service.prediction_cache", cache):
+            em_lote = (ml_service.predizer_precos(DESCRICOES), ml_service.predizer_categorias(DESCRICOES))
+            cache.clear()
+            individuais = (
+                [ml_service.predizer_preco(d) for d in DESCRICOES],
+                [ml_service.predizer_categoria(d) for d in DESCRICOES],
+            )
+
+        # ASSERT
+        assert em_lote[0] == pytest.approx(individuais[0])
+        assert em_lote[1] == individuais[1]
+
+    def test_predict_batch_equivale_a_predict_price(self):
+        """Categoria informada entra no texto do preço; a ausente é predita"""
+        # ARRANGE
+        itens = [("Pintura de parede", "Pintura"), ("Troca de tomada", None)]
+
+        # ACT
+        with patch("api.v1.services.ml_service.predizer_categorias", return_value=["Elétrica"]) as categorias, \
+                patch("api.v1.services.ml_service.predizer_precos", return_value=[100.0, 50.0]) as precos:
+            resultado = ml_service.ml_service.predict_batch(itens)
+
+        # ASSERT
+        categorias.assert_called_once_with(["Troca de tomada"])
+        precos.assert_called_once_with(["Pintura Pintura de parede", "Troca de tomada"])
+        assert resultado[1] == {
+            "service_name": "Troca de tomada", "category": "Elétrica",
+            "suggested_price": 50.0, "min_price": 40.0, "max_price": 60.0
+        }
+        assert resultado[0]["category"] == "Pintura"
+
+    def test_adapters_em_lote(self):
+        """SklearnMLAdapter faz uma passada por lote; o fake devolve valores fixos"""
+        # ARRANGE
+        adapter = SklearnMLAdapter(registry=_registro())
+
+        # ACT
+        precos = adapter.predict_prices(DESCRICOES)
+        categorias = FakeMLAdapter().predict_categories(DESCRICOES)
+
+        # ASSERT
+        assert precos == [4.0] * 4
+        assert adapter.registry.get.return_value.predict.call_count == 1
+        assert categorias == ["Serviços Gerais"] * 4
@@ -0,0 +1,130 @@
+"""
+Testes do micro-batching das predições de ML
+"""
+import asyncio
+import anyio
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from api.v1.services import ml_service
+from api.v1.services.ml_batcher import Histogram, MicroBatcher
+
+
+@pytest.fixture
+def executor():
+    pool = ThreadPoolExecutor(max_workers=1)
+    yield pool
+    pool.shutdown(wait=True)
+
+
+class Modelo:
+    """predict_many que registra os lotes recebidos"""
+
+    def __init__(self):
+        self.lotes = []
+
+    def __call__(self, itens):
+        self.lotes.append(list(itens))
+        return [item.upper() for item in itens]
+
+
+@pytest.mark.unit
+class TestMicroBatcher:
+    """Testes do agrupamento de chamadas concorrentes"""
+
+    async def test_chamadas_concorrentes_viram_um_lote(self, executor):
+        """Pedidos dentro da janela saem num único predict e cada um recebe o seu resultado"""
+        # ARRANGE
+        modelo = Modelo()
+        batcher = MicroBatcher(modelo, max_batch_size=64, max_wait_ms=20, executor=lambda: executor)
+
+        # ACT
+        resultados = await asyncio.gather(*(batcher.submit(t) for t in ["a", "b", "c"]))
+
+        # ASSERT
+        assert resultados == ["A", "B", "C"]
+        assert modelo.lotes == [["a", "b", "c"]]
+        stats = batcher.stats()
+        assert stats["batch_size"]["count"] == 1
+        assert stats["batch_size"]["buckets"]["2"] == 0
+        assert stats["batch_size"]["buckets"]["4"] == 1
+        assert stats["queue_wait_ms"]["count"] == 3
+
+    async def test_tamanho_maximo_dispara_o_lote(self, executor):
+        """Ao juntar max_batch_size itens o lote sai sem esperar a janela"""
+        # ARRANGE
+        modelo = Modelo()
+        batcher = MicroBatcher(modelo, max_batch_size=2, max_wait_ms=10_000, executor=lambda: executor)
+
+        # ACT
+        resultados = await asyncio.wait_for(asyncio.gather(*(batcher.submit(t) for t in "abcd")), timeout=5)
+
+        # ASSERT
+        assert resultados == ["A", "B", "C", "D"]
+        assert modelo.lotes == [["a", "b"], ["c", "d"]]
+
+    async def test_erro_do_lote_chega_a_todos(self, executor):
+        """Uma falha no predict é repassada a cada chamador do lote"""
+        # ARRANGE
+        def falha(itens):
+            raise ValueError("modelo indisponível")
+        batcher = MicroBatcher(falha, max_wait_ms=1, executor=lambda: executor)
+
+        # ACT
+        resultados = await asyncio.gather(batcher.submit("a"), batcher.submit("b"), return_exceptions=True)
+
+        # ASSERT
+        assert all(isinstance(r, ValueError) for r in resultados)
+
+    def test_histograma_cumulativo(self):
+        histograma = Histogram((1, 5, 10))
+        for valor in (0.5, 3, 3, 20):
+            histograma.observe(valor)
+        assert histograma.snapshot() == {
+            "buckets": {"1": 1, "5": 3, "10": 3, "+Inf": 4}, "count": 4, "sum": 26.5
+        }
+
+
+@pytest.mark.unit
+class TestPonteSincrona:
+    """Testes de calcular_limites_preco_agrupado (rotas `def` do FastAPI)"""
+
+    async def test_rotas_sincronas_usam_o_batcher(self):
+        """Chamadas de threads do anyio são agrupadas no event loop"""
+        # ARRANGE
+        antes = ml_service.batcher_precos.stats()["batch_size"]["count"]
+
+        # ACT
+        with patch("api.v1.services.ml_service.predizer_precos", side_effect=lambda d: [100.0] * len(d)) as precos, \
+                patch("api.v1.services.ml_service.predizer_categorias", side_effect=lambda d: ["Pintura"] * len(d)):
+            resultados = await asyncio.gather(*(
+                anyio.to_thread.run_sync(ml_service.calcular_limites_preco_agrupado, "Pintura", f"Parede {i}", "SP")
+                for i in range(4)
+            ))
+
+        # ASSERT
+        assert resultados[0] == {
+            "valor_minimo": 70.0, "valor_sugerido": 100.0, "valor_maximo": 150.0, "categoria_predita": "Pintura"
+        }
+        assert sum(len(c.args[0]) for c in precos.call_args_list) == 4
+        assert ml_service.batcher_precos.stats()["batch_size"]["count"] > antes
+
+    def test_fora_do_anyio_calcula_direto(self):
+        """Sem event loop (scripts), o cálculo é feito na própria thread"""
+        with patch("api.v1.services.ml_service.calcular_limites_preco", return_value={"valor_sugerido": 1.0}) as direto:
+            resultado = ml_service.calcular_limites_preco_agrupado("Pintura", "Parede", "SP")
+        assert resultado == {"valor_sugerido": 1.0}
+        direto.assert_called_once_with("Pintura", "Parede", "SP")
+
+    async def test_erro_no_event_loop_e_propagado(self):
+        """Uma falha no cálculo agrupado não vira um novo cálculo na thread da rota"""
+        # ARRANGE
+        async def falhar(*args):
+            raise RuntimeError("falha no lote")
+
+        # ACT / ASSERT
+        with patch("api.v1.services.ml_service.calcular_limites_preco_async", side_effect=falhar), \
+                patch("api.v1.services.ml_service.calcular_limites_preco") as direto:
+            with pytest.raises(RuntimeError, match="falha no lote"):
+                await anyio.to_thread.run_sync(ml_service.calcular_limites_preco_agrupado, "Pintura", "Parede", "SP")
+        direto.assert_not_called()
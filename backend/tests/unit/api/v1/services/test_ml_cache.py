@@ -0,0 +1,109 @@
+"""
+Testes do cache LRU/TTL das predições de ML
+"""
+import pytest
+from unittest.mock import MagicMock, patch
+from api.v1.services import ml_service
+from api.v1.services.ml_cache import PredictionCache
+
+
+class Relogio:
+    """Relógio controlado pelo teste"""
+
+    def __init__(self):
+        self.agora = 0.0
+
+    def __call__(self):
+        return self.agora
+
+
+@pytest.mark.unit
+class TestPredictionCache:
+    """Testes do LRU com expiração"""
+
+    def test_texto_normalizado_e_contadores(self):
+        """Maiúsculas e espaços extras caem na mesma entrada"""
+        # ARRANGE
+        cache = PredictionCache(maxsize=10, ttl=60)
+        cache.put("preco", "Pintura  de Parede", "v1", 120.0)
+
+        # ACT
+        valor = cache.get("preco", " pintura de parede ", "v1")
+        ausente = cache.get("categoria", "pintura de parede", "v1")
+
+        # ASSERT
+        assert valor == 120.0
+        assert ausente is None
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_lru_ttl_e_troca_de_versao(self):
+        """Descarta a menos usada, expira pelo TTL e esvazia quando a versão muda"""
+        # ARRANGE
+        relogio = Relogio()
+        cache = PredictionCache(maxsize=2, ttl=10, clock=relogio)
+        cache.put("preco", "a", "v1", 1.0)
+        cache.put("preco", "b", "v1", 2.0)
+        cache.get("preco", "a", "v1")
+
+        # ACT
+        cache.put("preco", "c", "v1", 3.0)
+        depois_do_lru = (cache.get("preco", "a", "v1"), cache.get("preco", "b", "v1"))
+        relogio.agora = 11
+        expirado = cache.get("preco", "a", "v1")
+        cache.put("preco", "d", "v1", 4.0)
+        nova_versao = cache.get("preco", "d", "v2")
+
+        # ASSERT
+        assert depois_do_lru == (1.0, None)
+        assert expirado is None
+        assert nova_versao is None
+        assert cache.stats()["evictions"] == 1
+        assert cache.stats()["models_version"] == "v2"
+
+
+def _registro(versao="v1"):
+    registro = MagicMock(version=versao)
+    registro.load.return_value = True
+    return registro
+
+
+@pytest.mark.unit
+class TestMLServiceCache:
+    """Testes do cache na frente de predizer_preco e predizer_categoria"""
+
+    def test_predicao_repetida_nao_roda_o_modelo(self):
+        """A segunda chamada com o mesmo texto vem do cache"""
+        # ARRANGE
+        registro = _registro()
+        registro.get.return_value.predict.return_value = [321.0]
+        cache = PredictionCache()
+
+        # ACT
+        with patch("api.v1.services.ml_service.model_registry", registro), \
+                patch("api.v1.services.ml_service.prediction_cache", cache):
+            primeiro = ml_service.predizer_preco("Pintura de parede")
+            segundo = ml_service.predizer_preco("PINTURA de parede")
+
+        # ASSERT
+        assert primeiro == segundo == 321.0
+        assert registro.get.return_value.predict.call_count == 1
+
+    def test_valor_padrao_nao_entra_no_cache(self):
+        """Falha na predição devolve o padrão sem guardá-lo"""
+        # ARRANGE
+        registro = _registro()
+        registro.get.return_value.transform.side_effect = [Exception("falha"), "X"]
+        registro.get.return_value.predict.return_value = ["Pintura"]
+        cache = PredictionCache()
+
+        # ACT
+        with patch("api.v1.services.ml_service.model_registry", registro), \
+                patch("api.v1.services.ml_service.prediction_cache", cache):
+            padrao = ml_service.predizer_categoria("Pintura de parede")
+            predita = ml_service.predizer_categoria("Pintura de parede")
+
+        # ASSERT
+        assert padrao == "Serviços Gerais"
+        assert predita == "Pintura"
+        assert cache.stats()["size"] == 1
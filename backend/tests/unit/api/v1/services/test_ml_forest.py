@@ -0,0 +1,175 @@
+"""
+Testes da avaliação compilada das florestas (ml_forest)
+"""
+import pickle
+import numpy as np
+import pytest
+from sklearn.ensemble import (
+    ExtraTreesClassifier, ExtraTreesRegressor, RandomForestClassifier, RandomForestRegressor
+)
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.tree import DecisionTreeRegressor
+from api.v1.core.config import ML_MODELS_DIR
+from api.v1.services import ml_forest
+from api.v1.services.ml_forest import CompiledForest, compile_forest
+from api.v1.services.ml_registry import MODEL_FILES, ModelRegistry
+
+PALAVRAS = ["pintura", "parede", "chuveiro", "tomada", "torneira", "piso", "telhado", "portão", "elétrica", "limpeza"]
+
+
+def _textos(n, seed):
+    rnd = np.random.default_rng(seed)
+    return [" ".join(rnd.choice(PALAVRAS, size=rnd.integers(1, 6))) for _ in range(n)]
+
+
+def _identicos(a, b):
+    """Igualdade bit a bit (não só numérica) de dois arrays float64"""
+    return a.shape == b.shape and np.array_equal(a.view(np.int64), b.view(np.int64))
+
+
+@pytest.fixture(scope="module")
+def dados():
+    """TF-IDF esparso com preços e categorias sintéticos"""
+    textos = _textos(400, seed=0)
+    vetorizador = TfidfVectorizer(ngram_range=(1, 2)).fit(textos)
+    X = vetorizador.transform(textos)
+    precos = np.array([len(t) * 13.7 + t.count("a") * 41.3 for t in textos])
+    categorias = np.array([t.split()[0].capitalize() for t in textos])
+    return vetorizador, X, precos, categorias
+
+
+@pytest.mark.unit
+class TestCompiledForest:
+    """O resultado compilado é o mesmo do scikit-learn, bit a bit"""
+
+    @pytest.mark.parametrize("classe", [RandomForestRegressor, ExtraTreesRegressor])
+    def test_regressor_identico_ao_sklearn(self, dados, classe):
+        # ARRANGE
+        vetorizador, X, precos, _ = dados
+        modelo = classe(n_estimators=30, random_state=0).fit(X, precos)
+        compilado = compile_forest(modelo)
+        X_novo = vetorizador.transform(_textos(300, seed=1))
+
+        # ACT
+        esperado = modelo.predict(X_novo)
+        obtido = compilado.predict(X_novo)
+
+        # ASSERT
+        assert isinstance(compilado, CompiledForest)
+        assert _identicos(obtido, esperado)
+        assert _identicos(compilado.predict(X_novo[:1]), esperado[:1])
+
+    @pytest.mark.parametrize("classe", [RandomForestClassifier, ExtraTreesClassifier])
+    def test_classificador_identico_ao_sklearn(self, dados, classe):
+        # ARRANGE
+        vetorizador, X, _, categorias = dados
+        modelo = classe(n_estimators=30, random_state=0).fit(X, categorias)
+        compilado = compile_forest(modelo)
+        X_novo = vetorizador.transform(_textos(500, seed=2))
+
+        # ACT / ASSERT
+        assert _identicos(compilado.predict_proba(X_novo), modelo.predict_proba(X_novo))
+        assert list(compilado.predict(X_novo)) == list(modelo.predict(X_novo))
+        assert list(compilado.predict(X_novo.toarray())) == list(modelo.predict(X_novo))
+
+    def test_lote_vazio_e_numero_de_features(self, dados):
+        """Lote vazio devolve vazio; número errado de features é recusado como no sklearn"""
+        # ARRANGE
+        _, X, precos, _ = dados
+        compilado = compile_forest(RandomForestRegressor(n_estimators=5, random_state=0).fit(X, precos))
+
+        # ACT / ASSERT
+        assert compilado.predict(X[:0]).shape == (0,)
+        with pytest.raises(ValueError, match="features"):
+            compilado.predict(np.zeros((1, X.shape[1] + 1)))
+
+    def test_nan_usa_o_sklearn(self):
+        """Valores ausentes seguem a regra de cada nó, delegada ao estimador original"""
+        # ARRANGE
+        rnd = np.random.default_rng(3)
+        X = rnd.random((200, 4))
+        X[rnd.random(X.shape) < 0.2] = np.nan
+        y = np.nan_to_num(X[:, 0], nan=5.0) * 10
+        modelo = RandomForestRegressor(n_estimators=10, random_state=0).fit(X, y)
+        compilado = compile_forest(modelo)
+
+        # ACT / ASSERT
+        assert _identicos(compilado.predict(X), modelo.predict(X))
+
+    def test_lote_grande_usa_o_sklearn(self, dados, monkeypatch):
+        """Acima de MAX_COMPILED_ROWS o predict é o do próprio estimador"""
+        # ARRANGE
+        _, X, precos, _ = dados
+        compilado = compile_forest(RandomForestRegressor(n_estimators=5, random_state=0).fit(X, precos))
+        monkeypatch.setattr(ml_forest, "MAX_COMPILED_ROWS", 10)
+        monkeypatch.setattr(compilado, "_accumulate", None)
+
+        # ACT / ASSERT
+        assert _identicos(compilado.predict(X[:11]), compilado.estimator.predict(X[:11]))
+
+    def test_modelos_nao_suportados_ficam_como_estao(self, dados):
+        """Árvore isolada e objetos quaisquer passam sem compilação"""
+        # ARRANGE
+        _, X, precos, _ = dados
+        arvore = DecisionTreeRegressor(random_state=0).fit(X, precos)
+
+        # ACT / ASSERT
+        assert compile_forest(arvore) is arvore
+        assert compile_forest({"modelo": "price_model"}) == {"modelo": "price_model"}
+
+
+@pytest.mark.unit
+class TestRegistroCompilado:
+    """Compilação na carga do registro e chave ML_COMPILED_FORESTS"""
+
+    @pytest.fixture
+    def models_dir(self, tmp_path, dados):
+        vetorizador, X, precos, categorias = dados
+        modelos = {
+            "price_model": RandomForestRegressor(n_estimators=10, random_state=0).fit(X, precos),
+            "price_vectorizer": vetorizador,
+            "category_model": RandomForestClassifier(n_estimators=10, random_state=0).fit(X, categorias),
+            "category_vectorizer": vetorizador,
+        }
+        for name, file_name in MODEL_FILES.items():
+            with open(tmp_path / file_name, "wb") as f:
+                pickle.dump(modelos[name], f)
+        return str(tmp_path)
+
+    def test_florestas_compiladas_na_carga(self, models_dir):
+        # ACT
+        registry = ModelRegistry(models_dir, compile_forests=True)
+
+        # ASSERT
+        assert isinstance(registry.get("price_model"), CompiledForest)
+        assert isinstance(registry.get("category_model"), CompiledForest)
+        assert registry.status()["compiled"] == ["category_model", "price_model"]
+
+    def test_chave_desligada_usa_o_sklearn(self, models_dir):
+        # ACT
+        registry = ModelRegistry(models_dir, compile_forests=False)
+
+        # ASSERT
+        assert isinstance(registry.get("price_model"), RandomForestRegressor)
+        assert registry.status()["compiled"] == []
+
+    def test_modelos_do_projeto_identicos(self):
+        """Os .pkl de backend/models dão as mesmas predições compiladas e no sklearn"""
+        # ARRANGE
+        original = ModelRegistry(ML_MODELS_DIR, compile_forests=False)
+        if not original.load():
+            pytest.skip("Modelos de backend/models não disponíveis")
+        compilado = ModelRegistry(ML_MODELS_DIR, compile_forests=True)
+        for name in ("price_model", "category_model"):
+            # n_jobs=1: com várias threads o sklearn soma as árvores em ordem variável
+            original.get(name).n_jobs = 1
+        textos = _textos(200, seed=4) + ["Pintura de parede em São Paulo", "instalar chuveiro elétrico", ""]
+
+        # ACT
+        X_preco = original.get("price_vectorizer").transform(textos)
+        X_categoria = original.get("category_vectorizer").transform(textos)
+
+        # ASSERT
+        assert _identicos(compilado.get("price_model").predict(X_preco), original.get("price_model").predict(X_preco))
+        assert list(compilado.get("category_model").predict(X_categoria)) == \
+            list(original.get("category_model").predict(X_categoria))
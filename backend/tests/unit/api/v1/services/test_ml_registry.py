@@ -0,0 +1,98 @@
+"""
+Testes do registro compartilhado dos modelos de ML
+"""
+import pickle
+import threading
+import pytest
+from unittest.mock import patch
+from api.v1.core.adapters import SklearnMLAdapter
+from api.v1.services import ml_service
+from api.v1.services.ml_registry import MODEL_FILES, ModelRegistry, models_fingerprint
+
+
+@pytest.fixture
+def models_dir(tmp_path):
+    """Diretório com os quatro .pkl (objetos simples no lugar dos modelos)"""
+    for name, file_name in MODEL_FILES.items():
+        with open(tmp_path / file_name, "wb") as f:
+            pickle.dump({"modelo": name}, f)
+    return str(tmp_path)
+
+
+@pytest.mark.unit
+class TestModelRegistry:
+    """Testes da carga preguiçosa e do estado do registro"""
+
+    def test_carga_sob_demanda_e_unica(self, models_dir):
+        """Nada é lido na criação; várias threads disparam uma única carga"""
+        # ARRANGE
+        registry = ModelRegistry(models_dir)
+        assert registry.status()["state"] == "not_loaded"
+
+        # ACT
+        with patch("api.v1.services.ml_registry.pickle.load", wraps=pickle.load) as mock_load:
+            threads = [threading.Thread(target=registry.load) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            modelo = registry.get("price_model")
+
+        # ASSERT
+        assert mock_load.call_count == len(MODEL_FILES)
+        assert modelo == {"modelo": "price_model"}
+        status = registry.status()
+        assert status["ready"] is True
+        assert status["models"] == sorted(MODEL_FILES)
+        assert status["load_seconds"] >= 0
+
+    def test_falha_registrada_sem_nova_tentativa(self, tmp_path, models_dir):
+        """Sem os arquivos a carga falha uma vez; reload() tenta de novo"""
+        # ARRANGE
+        registry = ModelRegistry(str(tmp_path / "inexistente"))
+
+        # ACT
+        carregou = registry.load()
+        with patch("api.v1.services.ml_registry.pickle.load") as mock_load:
+            registry.get("price_model")
+        registry.models_dir = models_dir
+
+        # ASSERT
+        assert carregou is False
+        assert registry.status()["state"] == "failed"
+        assert registry.status()["error"]
+        mock_load.assert_not_called()
+        assert registry.reload() is True
+
+    def test_ml_service_e_adapter_compartilham_modelos(self, models_dir):
+        """ml_service e SklearnMLAdapter usam os mesmos objetos carregados"""
+        # ARRANGE
+        registry = ModelRegistry(models_dir)
+
+        # ACT
+        with patch("api.v1.services.ml_service.model_registry", registry), \
+                patch("api.v1.services.ml_registry.model_registry", registry):
+            adapter = SklearnMLAdapter()
+            modelos = (ml_service.price_model, ml_service.category_vectorizer, ml_service.MODELS_LOADED)
+
+        # ASSERT
+        assert modelos[0] is adapter.price_model
+        assert modelos[1] is adapter.category_vectorizer
+        assert modelos[2] is True and adapter.models_loaded is True
+
+    def test_fingerprint_dos_arquivos(self, models_dir, tmp_path):
+        """A versão vem só do tamanho e mtime dos .pkl, sem carregá-los"""
+        # ARRANGE
+        registry = ModelRegistry(models_dir)
+        antes = models_fingerprint(models_dir)
+
+        # ACT
+        with open(tmp_path / MODEL_FILES["price_model"], "ab") as f:
+            f.write(b"retreino")
+        depois = models_fingerprint(models_dir)
+
+        # ASSERT
+        assert antes is not None and depois != antes
+        assert registry.fingerprint() == depois
+        assert registry.status()["state"] == "not_loaded"
+        assert models_fingerprint(str(tmp_path / "inexistente")) is None
@@ -10,6 +10,7 @@ from api.v1.services.ml_service import (
     calcular_limites_preco,
     MODELS_LOADED
 )
+from api.v1.services.ml_registry import ModelRegistry
 
 
 @pytest.mark.unit
@@ -37,7 +38,7 @@ class TestMLServiceCharacterization:
         descricao = "Qualquer descrição"
         
         # ACT
-        with patch('api.v1.services.ml_service.MODELS_LOADED', False):
+        with patch('api.v1.services.ml_service.model_registry', ModelRegistry('/inexistente')):
             resultado = predizer_preco(descricao)
         
         # ASSERT
@@ -49,8 +50,9 @@ class TestMLServiceCharacterization:
         descricao = "Descrição que causa erro"
         
         # ACT
-        with patch('api.v1.services.ml_service.price_vectorizer') as mock_vec:
-            mock_vec.transform.side_effect = Exception("Erro simulado")
+        registro = MagicMock()
+        registro.get.return_value.transform.side_effect = Exception("Erro simulado")
+        with patch('api.v1.services.ml_service.model_registry', registro):
             resultado = predizer_preco(descricao)
         
         # ASSERT
@@ -77,7 +79,7 @@ class TestMLServiceCharacterization:
         descricao = "Qualquer descrição"
         
         # ACT
-        with patch('api.v1.services.ml_service.MODELS_LOADED', False):
+        with patch('api.v1.services.ml_service.model_registry', ModelRegistry('/inexistente')):
             resultado = predizer_categoria(descricao)
         
         # ASSERT
@@ -0,0 +1,189 @@
+"""
+Testes da inferência de ML em processos separados (ML_INFERENCE_MODE=process)
+"""
+import os
+import pickle
+import subprocess
+import sys
+import pytest
+from pathlib import Path
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.tree import DecisionTreeClassifier, DecisionTreeRegressor
+from api.v1.core.adapters import SklearnMLAdapter
+from api.v1.services import ml_registry, ml_service, ml_workers
+from api.v1.services.ml_cache import PredictionCache
+from api.v1.services.ml_registry import MODEL_FILES, ModelRegistry, models_fingerprint
+
+TEXTOS = ["pintura de parede", "troca de chuveiro", "conserto de torneira", "limpeza de piso"]
+PRECOS = [300.0, 150.0, 120.0, 200.0]
+CATEGORIAS = ["Pintura", "Elétrica", "Hidráulica", "Limpeza"]
+
+
+@pytest.fixture(scope="module")
+def models_dir(tmp_path_factory):
+    """Modelos sklearn pequenos, treinados nos quatro textos acima"""
+    pasta = tmp_path_factory.mktemp("modelos")
+    vetorizador = TfidfVectorizer().fit(TEXTOS)
+    X = vetorizador.transform(TEXTOS)
+    modelos = {
+        "price_model": DecisionTreeRegressor(random_state=0).fit(X, PRECOS),
+        "price_vectorizer": vetorizador,
+        "category_model": DecisionTreeClassifier(random_state=0).fit(X, CATEGORIAS),
+        "category_vectorizer": vetorizador,
+    }
+    for name, file_name in MODEL_FILES.items():
+        with open(pasta / file_name, "wb") as f:
+            pickle.dump(modelos[name], f)
+    return str(pasta)
+
+
+@pytest.fixture(scope="module")
+def pool(models_dir):
+    """Pool com dois processos de inferência, compartilhado pelos testes do módulo"""
+    pool = ml_workers.ProcessInference(workers=2, models_dir=models_dir)
+    yield pool
+    pool.shutdown()
+
+
+@pytest.mark.unit
+class TestProcessInference:
+    """Testes do pool de processos que mantém os modelos"""
+
+    def test_processos_carregam_os_modelos(self, pool, models_dir):
+        """warm_up sobe os processos, cada um com os modelos já lidos"""
+        # ACT
+        workers = pool.warm_up()
+
+        # ASSERT
+        assert len(workers) == 2
+        assert all(worker["ready"] for worker in workers)
+        assert pool.status()["started"] is True
+        assert pool.models_version() == models_fingerprint(models_dir)
+
+    def test_predicao_igual_a_do_proprio_processo(self, pool, models_dir):
+        """Lotes grandes são divididos entre os processos sem mudar ordem nem valores"""
+        # ARRANGE
+        registry = ModelRegistry(models_dir)
+        textos = TEXTOS * 50
+        esperado = registry.get("price_model").predict(registry.get("price_vectorizer").transform(textos)).tolist()
+
+        # ACT
+        precos = pool.predict("price_vectorizer", "price_model", textos)
+        categorias = pool.predict("category_vectorizer", "category_model", TEXTOS)
+
+        # ASSERT
+        assert precos == esperado
+        assert categorias == CATEGORIAS
+        assert pool.predict("price_vectorizer", "price_model", []) == []
+
+    def test_modelos_ausentes_geram_erro(self, tmp_path):
+        """Sem os .pkl os processos sobem, mas cada predição falha com a mensagem de erro"""
+        # ARRANGE
+        pool = ml_workers.ProcessInference(workers=1, models_dir=str(tmp_path))
+
+        # ACT / ASSERT
+        try:
+            assert pool.models_version() is None
+            with pytest.raises(RuntimeError, match="Modelos não carregados"):
+                pool.predict("price_vectorizer", "price_model", TEXTOS)
+        finally:
+            pool.shutdown()
+
+
+@pytest.mark.unit
+class TestMlServiceModoProcesso:
+    """Testes do ml_service com o pool de processos ligado"""
+
+    def test_predicoes_passam_pelo_pool_e_pelo_cache(self, pool, monkeypatch):
+        """Só os textos fora do cache vão aos processos; este processo não carrega modelos"""
+        # ARRANGE
+        registry = ModelRegistry("/inexistente")
+        monkeypatch.setattr(ml_workers, "process_inference", pool)
+        monkeypatch.setattr(ml_service, "model_registry", registry)
+        monkeypatch.setattr(ml_service, "prediction_cache", PredictionCache(maxsize=16))
+
+        # ACT
+        primeira = ml_service.predizer_categorias(TEXTOS)
+        segunda = ml_service.predizer_categorias(TEXTOS)
+        preco = ml_service.predizer_preco("PINTURA  de parede")
+
+        # ASSERT
+        assert primeira == segunda == CATEGORIAS
+        assert preco == 300.0
+        assert ml_service.prediction_cache.stats()["hits"] == len(TEXTOS)
+        assert registry.status()["state"] == "not_loaded"
+
+    def test_falha_nos_processos_usa_valor_padrao(self, tmp_path, monkeypatch):
+        """Se os processos não têm modelos, o lote recebe o padrão (fora do cache)"""
+        # ARRANGE
+        pool = ml_workers.ProcessInference(workers=1, models_dir=str(tmp_path))
+        monkeypatch.setattr(ml_workers, "process_inference", pool)
+        monkeypatch.setattr(ml_service, "prediction_cache", PredictionCache(maxsize=16))
+
+        # ACT
+        try:
+            precos = ml_service.predizer_precos(TEXTOS[:2])
+        finally:
+            pool.shutdown()
+
+        # ASSERT
+        assert precos == [500.0, 500.0]
+        assert ml_service.prediction_cache.stats()["size"] == 0
+
+    def test_adapter_e_models_loaded_usam_o_pool(self, pool, monkeypatch):
+        """SklearnMLAdapter e MODELS_LOADED não carregam os modelos no processo da API"""
+        # ARRANGE
+        registry = ModelRegistry("/inexistente")
+        monkeypatch.setattr(ml_workers, "process_inference", pool)
+        monkeypatch.setattr(ml_service, "model_registry", registry)
+        monkeypatch.setattr(ml_registry, "model_registry", registry)
+        adapter = SklearnMLAdapter()
+
+        # ACT
+        carregados = (adapter.models_loaded, ml_service.MODELS_LOADED)
+        categorias = adapter.predict_categories(TEXTOS)
+        preco = adapter.predict_price(TEXTOS[0])
+
+        # ASSERT
+        assert carregados == (True, True)
+        assert categorias == CATEGORIAS
+        assert preco == PRECOS[0]
+        assert registry.status()["state"] == "not_loaded"
+
+    def test_sem_pool_usa_o_registro_deste_processo(self, models_dir, monkeypatch):
+        """No modo "thread" (sem pool configurado) os modelos são carregados e avaliados aqui"""
+        # ARRANGE
+        registry = ModelRegistry(models_dir)
+        monkeypatch.setattr(ml_workers, "process_inference", None)
+        monkeypatch.setattr(ml_service, "model_registry", registry)
+        monkeypatch.setattr(ml_service, "prediction_cache", PredictionCache(maxsize=16))
+
+        # ACT
+        categorias = ml_service.predizer_categorias(TEXTOS)
+
+        # ASSERT
+        assert categorias == CATEGORIAS
+        assert registry.status()["state"] == "ready"
+
+
+@pytest.mark.unit
+def test_modo_invalido_volta_para_thread():
+    """ML_INFERENCE_MODE inválido não impede o import: a inferência fica neste processo"""
+    # ARRANGE
+    backend_dir = Path(__file__).resolve().parents[5]
+    codigo = (
+        "from api.v1.core.config import ML_INFERENCE_MODE\n"
+        "from api.v1.services import ml_workers\n"
+        "print(ML_INFERENCE_MODE, ml_workers.process_inference)"
+    )
+
+    # ACT
+    resultado = subprocess.run(
+        [sys.executable, "-c", codigo], cwd=backend_dir, capture_output=True, text=True,
+        env={**os.environ, "ML_INFERENCE_MODE": "gpu"}, timeout=120
+    )
+
+    # ASSERT
+    assert resultado.returncode == 0, resultado.stderr
+    assert resultado.stdout.strip().splitlines()[-1] == "thread None"
+    assert "ML_INFERENCE_MODE='gpu'" in resultado.stdout